@@ -2,97 +2,733 @@ import requests
 import os
 import time
 import json
-import hashlib
 import re
+import heapq
+import itertools
+import random
+import threading
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, Callable, List
 from functools import wraps
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QThread
+from urllib.parse import urlsplit
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer
+from urllib3.exceptions import NewConnectionError
 import logging
 from datetime import datetime, timedelta
+from controllers.circuit_breaker import CircuitBreaker
+from controllers.disk_cache import DiskCache, default_cache_dir
+from controllers import json_codec
+from controllers.entity_store import EntityStore
+from controllers.jwt_utils import jwt_expiry
+from controllers.image_loader import ImageLoader
+from controllers.sync_state import SyncState, max_cursor
+from controllers.write_queue import WriteJournal
 
 # OPTIMIZACIÓN EXTREMA: Reducir logging al mínimo
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
 
 
-def retry_on_failure(max_retries=0, delay=0.1):
-    """Decorador para reintentar peticiones fallidas - OPTIMIZADO: sin reintentos"""
+# Métodos que se pueden repetir sin efectos secundarios
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Respuestas de un backend o proxy caído momentáneamente
+RETRYABLE_STATUS = {502, 503, 504}
+
+
+def retry_on_failure(max_retries=0, delay=0.1, max_delay=2.0):
+    """
+    Decorador para reintentar peticiones con backoff exponencial y jitter.
+
+    Solo repite los resultados marcados como "retryable" (fallos transitorios
+    de métodos idempotentes). Espera un tiempo aleatorio entre 0 y
+    min(max_delay, delay * 2^intento) para que los workers no reintenten a
+    la vez. En el hilo de la GUI no reintenta: la interfaz nunca duerme.
+    """
 
     def decorator(func):
         @wraps(func)
         def wrapper(self, *args, **kwargs):
-            try:
-                return func(self, *args, **kwargs)
-            except Exception as e:
-                raise
+            retries = max_retries
+            if threading.current_thread() is threading.main_thread():
+                retries = 0
+
+            attempt = 0
+            while True:
+                result = func(self, *args, **kwargs)
+                if not result.pop("retryable", False) or attempt >= retries:
+                    return result
+                time.sleep(random.uniform(0, min(max_delay, delay * 2**attempt)))
+                attempt += 1
 
         return wrapper
 
     return decorator
 
 
+# Parámetros con los que un listado es solo una parte de la colección
+PARTIAL_LISTING_PARAMS = ("page", "per_page", "search", "rol", "updated_since")
+
+
+# Tipos de caché derivados de otro: se invalidan con él sin notificar aparte
+DEPENDENT_CACHE_TYPES = {"usuarios": ("usuarios_busqueda",)}
+
+
+# Segmentos de ruta que identifican entidades: "/modulos/5" -> ("modulo", 5)
+ENTITY_SEGMENTS = {
+    "usuarios": "usuario",
+    "modulos": "modulo",
+    "lecciones": "leccion",
+    "ejercicios": "ejercicio",
+    "evaluacion": "evaluacion",
+    "preguntas": "pregunta",
+}
+
+
+def parse_entity_path(endpoint: str):
+    """
+    Extraer las entidades que toca un endpoint.
+
+    Returns:
+        (entidades, es_listado): lista ordenada de tuplas (tipo, id) y un bool
+        que indica si la ruta termina en una colección en lugar de un id.
+    """
+    segments = [s for s in endpoint.split("?", 1)[0].split("/") if s]
+    entities = []
+    listing = True
+    for i, segment in enumerate(segments):
+        if segment.isdigit():
+            kind = ENTITY_SEGMENTS.get(segments[i - 1]) if i else None
+            if kind:
+                entities.append((kind, int(segment)))
+            listing = False
+        else:
+            listing = True
+    return entities, listing
+
+
+def estimate_size(obj) -> int:
+    """Tamaño aproximado en bytes de un payload JSON ya decodificado"""
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            total += 64 + 16 * len(item)
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            total += 56 + 8 * len(item)
+            stack.extend(item)
+        elif isinstance(item, str):
+            total += 49 + len(item)
+        else:
+            total += 28
+    return total
+
+
+# Campos de paginación de Laravel cuando el paginador llega sin "meta"
+PAGINATION_FIELDS = ("current_page", "last_page", "per_page", "total")
+
+
+def wrap_payload(data, status_code: int) -> Dict[str, Any]:
+    """Dar a un cuerpo JSON exitoso la forma de resultado del cliente"""
+    if isinstance(data, dict) and "data" in data:
+        meta = data.get("meta")
+        if meta is None and "last_page" in data:
+            meta = {k: data[k] for k in PAGINATION_FIELDS if k in data}
+        return {
+            "success": True,
+            "data": data["data"],
+            "meta": meta,
+            "status_code": status_code,
+        }
+    return {"success": True, "data": data, "status_code": status_code}
+
+
+def split_page(result: Dict[str, Any]):
+    """Separar las filas y la metadata de paginación de un resultado"""
+    data = result.get("data")
+    meta = result.get("meta") or {}
+    if isinstance(data, dict):
+        # Paginador anidado: {"data": {"data": [...], "last_page": ...}}
+        meta = meta or {k: data[k] for k in PAGINATION_FIELDS if k in data}
+        data = data.get("data", [])
+    return (data if isinstance(data, list) else []), meta
+
+
+def request_not_sent(error: requests.RequestException) -> bool:
+    """
+    True solo si la petición seguro que no salió del cliente.
+
+    Es así cuando no se llegó a abrir la conexión (rechazada, DNS o tiempo
+    agotado al conectar). Un corte o un tiempo agotado esperando la
+    respuesta pueden ocurrir con la petición ya procesada en el servidor.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    # requests envuelve el MaxRetryError de urllib3, que guarda la causa
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, NewConnectionError)
+
+
 class CacheEntry:
     """Entrada de caché ULTRA RÁPIDA"""
 
-    __slots__ = ("data", "timestamp", "timeout")
-
-    def __init__(self, data, timeout=300):
+    __slots__ = (
+        "data",
+        "timestamp",
+        "timeout",
+        "cache_type",
+        "tags",
+        "size",
+        "etag",
+        "last_modified",
+    )
+
+    def __init__(
+        self,
+        data,
+        timeout=300,
+        cache_type=None,
+        tags=(),
+        size=0,
+        etag=None,
+        last_modified=None,
+    ):
         self.data = data
         self.timestamp = time.time()
         self.timeout = timeout
+        self.cache_type = cache_type
+        self.tags = tags
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
 
     def is_expired(self):
         return time.time() - self.timestamp > self.timeout
 
+    def has_validators(self):
+        return bool(self.etag or self.last_modified)
 
-class RequestWorker(QThread):
-    """Worker para peticiones asíncronas"""
+    def is_dead(self, grace: float = 0):
+        """Expirada y fuera del margen en que aún sirve (revalidar o stale)"""
+        return time.time() - self.timestamp > self.timeout + grace
 
-    finished = pyqtSignal(object)
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
 
-    def __init__(self, func, *args, **kwargs):
-        super().__init__()
-        self.func = func
-        self.args = args
-        self.kwargs = kwargs
 
-    def run(self):
+class InFlightRequest:
+    """Petición GET en vuelo compartida por todos los que piden la misma clave"""
+
+    __slots__ = ("event", "result", "generation", "waiters")
+
+    def __init__(self, generation: int):
+        self.event = threading.Event()
+        self.result = None
+        self.generation = generation
+        self.waiters = 0
+
+
+class Priority:
+    """Clases de prioridad del planificador (menor número = antes)"""
+
+    INTERACTIVE = 0  # Acción directa del usuario: clic, selección en un combo
+    VISIBLE = 1  # Datos de la vista que se está mostrando
+    PREFETCH = 2  # Precarga especulativa
+    BACKGROUND = 3  # Refrescos periódicos, revalidaciones y limpieza
+
+
+def cancelled_result() -> Dict[str, Any]:
+    return {"success": False, "error": "Cancelada", "cancelled": True}
+
+
+class CancellationToken:
+    """
+    Marca compartida por las peticiones de una misma selección.
+
+    Una petición con el token cancelado no llega a enviarse si aún está en
+    cola, y si ya estaba en vuelo su respuesta se descarta antes de tocar
+    la GUI.
+    """
+
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self, *args):
+        self.cancelled = True
+
+
+class CancellationScope:
+    """
+    Emite tokens para un widget o una selección: cada renew() cancela el
+    token anterior, de modo que solo la última carga llega a la GUI. Si se
+    liga a un widget, el token vigente se cancela al destruirlo.
+    """
+
+    def __init__(self, owner: QObject = None):
+        self.token = CancellationToken()
+        if owner is not None:
+            owner.destroyed.connect(self.cancel)
+
+    def renew(self) -> CancellationToken:
+        self.token.cancel()
+        self.token = CancellationToken()
+        return self.token
+
+    def cancel(self, *args):
+        self.token.cancel()
+
+
+class RequestFuture:
+    """
+    Resultado pendiente de una petición enviada al planificador.
+
+    Se puede esperar con result() desde un hilo que no sea el de la GUI, o
+    cancelar: si aún no arrancó no llega a ejecutarse y, en cualquier caso,
+    su callback ya no se entrega.
+    """
+
+    __slots__ = ("priority", "token", "cancelled", "started", "_event", "_result")
+
+    def __init__(self, priority: int, token: CancellationToken = None):
+        self.priority = priority
+        self.token = token
+        self.cancelled = False
+        self.started = False
+        self._event = threading.Event()
+        self._result = None
+
+    def cancel(self) -> bool:
+        """Cancelar; devuelve True si la petición no llegó a enviarse"""
+        self.cancelled = True
+        return not self.started
+
+    def is_cancelled(self) -> bool:
+        return self.cancelled or (self.token is not None and self.token.cancelled)
+
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    def result(self, timeout: float = None):
+        if not self._event.wait(timeout):
+            raise TimeoutError("La petición no terminó a tiempo")
+        return self._result
+
+    def _finish(self, result):
+        self._result = result
+        self._event.set()
+
+
+class RequestExecutor(QObject):
+    """
+    Planificador por prioridades sobre un pool acotado de hilos.
+
+    Las tareas esperan en un heap ordenado por Priority y se pasan al pool
+    solo cuando hay un hilo libre, así lo interactivo adelanta a lo que ya
+    estaba en cola. Las clases PREFETCH y BACKGROUND nunca ocupan más de
+    low_priority_slots hilos, de modo que siempre queda hueco para el
+    usuario. Las tareas canceladas se descartan antes de enviarse y sus
+    respuestas no se entregan. Los callbacks llegan al hilo de la GUI
+    mediante una señal encolada.
+    """
+
+    _delivered = pyqtSignal(object, object, object)  # handle, callback, result
+
+    def __init__(self, max_workers: int = 8, parent=None):
+        super().__init__(parent)
+        self.max_workers = max_workers
+        self.low_priority_slots = max(1, max_workers // 2)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="api-worker"
+        )
+        self._lock = threading.Lock()
+        self._queue = []  # heap de (prioridad, secuencia, handle, job)
+        self._sequence = itertools.count()
+        self._running = 0
+        self._running_low = 0
+        self._closed = False
+        self.stats = {"submitted": 0, "dropped": 0, "discarded": 0}
+        self._delivered.connect(self._deliver)
+
+    def submit(
+        self,
+        func: Callable,
+        *args,
+        callback: Callable = None,
+        priority: int = Priority.VISIBLE,
+        token: CancellationToken = None,
+        **kwargs,
+    ) -> RequestFuture:
+        handle = RequestFuture(priority, token)
+        with self._lock:
+            if self._closed:
+                handle.cancelled = True
+                handle._finish(cancelled_result())
+                return handle
+            self.stats["submitted"] += 1
+            heapq.heappush(
+                self._queue,
+                (priority, next(self._sequence), handle, (func, args, kwargs, callback)),
+            )
+        self._dispatch()
+        return handle
+
+    def _dispatch(self):
+        """Pasar al pool las tareas más prioritarias mientras haya hilos libres"""
+        ready = []
+        with self._lock:
+            while (
+                self._queue and not self._closed and self._running < self.max_workers
+            ):
+                priority, _, handle, job = self._queue[0]
+                if handle.is_cancelled():
+                    heapq.heappop(self._queue)
+                    self.stats["dropped"] += 1
+                    handle._finish(cancelled_result())
+                    continue
+                low = priority >= Priority.PREFETCH
+                if low and self._running_low >= self.low_priority_slots:
+                    # Todo lo que queda en el heap es igual o menos prioritario
+                    break
+                heapq.heappop(self._queue)
+                self._running += 1
+                if low:
+                    self._running_low += 1
+                handle.started = True
+                ready.append((handle, job))
+
+        for handle, job in ready:
+            self._pool.submit(self._run, handle, *job)
+
+    def _run(self, handle: RequestFuture, func, args, kwargs, callback):
+        try:
+            if handle.is_cancelled():
+                # Cancelada entre el dispatch y el arranque del hilo
+                self.stats["dropped"] += 1
+                handle._finish(cancelled_result())
+                return
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            handle._finish(result)
+            if callback is None:
+                return
+            if handle.is_cancelled():
+                self.stats["discarded"] += 1
+                return
+            self._delivered.emit(handle, callback, result)
+        finally:
+            with self._lock:
+                self._running -= 1
+                if handle.priority >= Priority.PREFETCH:
+                    self._running_low -= 1
+            self._dispatch()
+
+    def deliver(self, handle: RequestFuture, callback: Callable, result):
+        """Entregar un resultado intermedio en el hilo de la GUI"""
+        self._delivered.emit(handle, callback, result)
+
+    def _deliver(self, handle: RequestFuture, callback: Callable, result):
+        if handle.is_cancelled():
+            self.stats["discarded"] += 1
+            return
         try:
-            result = self.func(*self.args, **self.kwargs)
-            self.finished.emit(result)
+            callback(result)
         except Exception as e:
-            self.finished.emit({"success": False, "error": str(e)})
+            logger.error(f"Error en callback asíncrono: {e}")
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            self._closed = True
+            queued, self._queue = self._queue, []
+        for _, _, handle, _ in queued:
+            handle.cancelled = True
+            handle._finish(cancelled_result())
+        self._pool.shutdown(wait=wait, cancel_futures=True)
 
 
 class BatchRequestManager:
-    """Agrupa múltiples peticiones - OPTIMIZADO"""
+    """
+    Agrupa las peticiones GET encoladas en una ventana de 20 ms en un lote.
+
+    El lote se deduplica por clave de caché y se resuelve de forma concurrente
+    en el pool de workers (o con una sola llamada al endpoint de lotes si el
+    servidor lo ofrece). Cada petición conserva su callback y, cuando el lote
+    entero termina, los callbacks agregados reciben {request_id: resultado}.
+    Todos los callbacks se ejecutan en el hilo de la GUI.
+
+    Cada petición puede llevar su prioridad y su CancellationToken; un grupo
+    deduplicado hereda la prioridad más alta de sus peticiones.
+    """
 
-    def __init__(self, api_client):
+    def __init__(self, api_client, window_ms: int = 20):
         self.api_client = api_client
+        self.window_ms = window_ms
         self.pending_requests = {}
+        self._batch_callbacks = []
         self.batch_timer = QTimer()
         self.batch_timer.timeout.connect(self.execute_batch)
         self.batch_timer.setSingleShot(True)
 
-    def add_request(self, request_id, endpoint, callback, params=None):
+    def add_request(
+        self,
+        request_id,
+        endpoint,
+        callback=None,
+        params=None,
+        cache_type=None,
+        force_refresh=False,
+        priority=Priority.VISIBLE,
+        token=None,
+    ):
         self.pending_requests[request_id] = {
             "endpoint": endpoint,
             "callback": callback,
             "params": params,
+            "cache_type": cache_type,
+            "force_refresh": force_refresh,
+            "priority": priority,
+            "token": token,
         }
+        self._schedule()
+
+    def on_batch_complete(self, callback: Callable):
+        """Registrar un callback agregado para el lote que se está formando"""
+        self._batch_callbacks.append(callback)
+        self._schedule()
+
+    def execute(
+        self,
+        requests: Dict[str, Dict],
+        callback: Callable = None,
+        priority: int = Priority.VISIBLE,
+        token: CancellationToken = None,
+    ):
+        """
+        Lanzar ya un lote completo.
+
+        Args:
+            requests: request_id -> {"endpoint", "params", "cache_type", ...}
+            callback: recibe {request_id: resultado} cuando todo termina
+            priority: prioridad por defecto de las peticiones del lote
+            token: si se cancela, el lote entero se descarta
+        """
+        for request_id, spec in requests.items():
+            spec = {"priority": priority, "token": token, **spec}
+            self.add_request(request_id, **spec)
+        if callback:
+            self._batch_callbacks.append(callback)
+        self.execute_batch()
+
+    def _schedule(self):
         if not self.batch_timer.isActive():
-            self.batch_timer.start(20)  # REDUCIDO: 20ms para agrupar rápidamente
+            self.batch_timer.start(self.window_ms)
 
     def execute_batch(self):
-        if not self.pending_requests:
+        self.batch_timer.stop()
+        requests, callbacks = self.pending_requests, self._batch_callbacks
+        self.pending_requests, self._batch_callbacks = {}, []
+        if not requests:
+            for callback in callbacks:
+                self._safe_call(callback, {})
             return
 
-        for req_id, req in self.pending_requests.items():
-            result = self.api_client.get(req["endpoint"], params=req["params"])
-            if req["callback"]:
-                req["callback"](result)
+        # Deduplicar: varios request_id pueden compartir la misma clave
+        groups: Dict[str, List] = {}
+        specs: Dict[str, Dict] = {}
+        for request_id, req in requests.items():
+            key = self.api_client._get_cache_key(req["endpoint"], req["params"])
+            groups.setdefault(key, []).append(request_id)
+            spec = specs.setdefault(key, dict(req))
+            spec["priority"] = min(spec["priority"], req["priority"])
+
+        # Un token solo viaja al planificador si lo comparte todo el lote;
+        # si no, cada petición se filtra por su token al entregar
+        tokens = {id(req["token"]): req["token"] for req in requests.values()}
+        batch_token = next(iter(tokens.values())) if len(tokens) == 1 else None
+
+        results = {}
+        remaining = [len(groups)]
+
+        def resolve(key, result):
+            for request_id in groups[key]:
+                results[request_id] = result
+                req = requests[request_id]
+                if req["callback"] and not (req["token"] and req["token"].cancelled):
+                    self._safe_call(req["callback"], result)
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                for callback in callbacks:
+                    self._safe_call(callback, results)
+
+        if self.api_client.batch_endpoint:
+            self.api_client.submit_async(
+                self.api_client.get_many,
+                specs,
+                callback=lambda by_key: [
+                    resolve(key, by_key.get(key, {"success": False, "error": "Sin respuesta"}))
+                    for key in groups
+                ],
+                priority=min(spec["priority"] for spec in specs.values()),
+                token=batch_token,
+            )
+            return
+
+        for key, req in specs.items():
+            self.api_client.get_async(
+                req["endpoint"],
+                lambda result, k=key: resolve(k, result),
+                cache_type=req["cache_type"],
+                force_refresh=req["force_refresh"],
+                priority=req["priority"],
+                token=batch_token,
+                params=req["params"],
+            )
+
+    @staticmethod
+    def _safe_call(callback: Callable, value):
+        try:
+            callback(value)
+        except Exception as e:
+            logger.error(f"Error en callback de lote: {e}")
+
+
+class BulkMutation:
+    """
+    Operación masiva en curso, coordinada desde el hilo de la GUI.
+
+    Cada bloque para el endpoint de lotes, o cada mutación suelta, es una
+    tarea del planificador compartido y como mucho bulk_concurrency están
+    en vuelo a la vez, así que una acción masiva no acapara los workers.
+    Las tareas miran el token al arrancar: con la operación cancelada no
+    envían nada. Los resultados se recogen en la GUI y allí se invalidan las
+    cachés y se avisa a las vistas al terminar.
+    """
+
+    def __init__(
+        self, api_client, operations, cache_types, on_progress, on_done, token
+    ):
+        self.api_client = api_client
+        self.operations = {op["id"]: op for op in operations}
+        self.pending = dict(self.operations)
+        self.total = len(self.pending)
+        self.cache_types = cache_types
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.handle = RequestFuture(Priority.VISIBLE, token)
+        self.max_parallel = max(1, api_client.bulk_concurrency)
+        self.succeeded: List = []
+        self.failed: Dict = {}
+        self._jobs = deque()
+        self._running = 0
+
+    def start(self) -> RequestFuture:
+        self.handle.started = True
+        ops = list(self.pending.values())
+        chunk_size = self.api_client.bulk_chunk_size
+        if self.api_client.batch_endpoint:
+            for start in range(0, len(ops), chunk_size):
+                self._jobs.append(("batch", ops[start : start + chunk_size]))
+        else:
+            self._jobs.extend(("single", op) for op in ops)
+        self._pump()
+        return self.handle
+
+    def _pump(self):
+        while (
+            self._jobs
+            and self._running < self.max_parallel
+            and not self.handle.is_cancelled()
+        ):
+            kind, payload = self._jobs.popleft()
+            self._running += 1
+            self.api_client.submit_async(
+                self._run_job,
+                kind,
+                payload,
+                callback=lambda result, kind=kind, payload=payload: self._on_job(
+                    kind, payload, result
+                ),
+                priority=Priority.VISIBLE,
+            )
+        if self._running == 0 and not self.handle.done():
+            self._finish()
+
+    def _run_job(self, kind: str, payload) -> Dict[str, Any]:
+        """Enviar un bloque o una mutación (en un worker)"""
+        if self.handle.is_cancelled():
+            return cancelled_result()
+        if kind == "batch":
+            return {"success": True, "data": self.api_client._bulk_via_batch(payload)}
+        return self.api_client._request(
+            payload["method"], payload["endpoint"], json=payload.get("json")
+        )
+
+    def _on_job(self, kind: str, payload, result: Dict[str, Any]):
+        self._running -= 1
+        if kind == "batch":
+            for op_id, op_result in (result.get("data") or {}).items():
+                self._record(op_id, op_result)
+            if not result.get("cancelled"):
+                # Lo que el lote no resolvió va una a una
+                self._jobs.extend(
+                    ("single", op) for op in payload if op["id"] in self.pending
+                )
+        elif not result.get("cancelled"):
+            self._record(payload["id"], result)
+        self._pump()
+
+    def _record(self, op_id, result: Dict[str, Any]):
+        if self.pending.pop(op_id, None) is None:
+            return
+        if result.get("success"):
+            self.succeeded.append(op_id)
+        else:
+            self.failed[op_id] = result.get("error", "Error")
+        if self.on_progress is not None:
+            progress = {
+                "done": len(self.succeeded) + len(self.failed),
+                "total": self.total,
+                "failed": len(self.failed),
+            }
+            self.api_client.executor.deliver(self.handle, self.on_progress, progress)
+
+    def _finish(self):
+        if self.succeeded:
+            self.api_client._invalidate_mutations(
+                [
+                    (self.operations[i]["method"], self.operations[i]["endpoint"])
+                    for i in self.succeeded
+                ],
+                self.cache_types,
+            )
 
-        self.pending_requests.clear()
+        result = {
+            "success": not self.failed and not self.pending,
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "cancelled": bool(self.pending),
+        }
+        if self.failed:
+            result["error"] = f"{len(self.failed)} de {self.total} operaciones fallaron"
+        elif self.pending:
+            result["error"] = "Operación cancelada"
+        self.handle._finish(result)
+        if self.on_done is not None:
+            self.api_client.executor.deliver(self.handle, self.on_done, result)
 
 
 class APIClient(QObject):
@@ -101,9 +737,17 @@ class APIClient(QObject):
     error_occurred = pyqtSignal(str)
     token_refreshed = pyqtSignal()
     session_expired = pyqtSignal()
+    connectivity_changed = pyqtSignal(bool)  # True = backend accesible
+    pending_writes_changed = pyqtSignal()  # cambió la cola de escrituras sin conexión
+    _token_changed = pyqtSignal()  # reprograma la renovación en el hilo de la GUI
+    _logged_in = pyqtSignal()  # detiene el keep-alive en el hilo de la GUI
 
     # ============= SEÑALES PARA ACTUALIZACIÓN EN TIEMPO REAL =============
     data_changed = pyqtSignal(str)
+    # Interna: pide desde cualquier hilo una revalidación en el hilo de la GUI
+    _revalidate_requested = pyqtSignal(str, object, str)
+    # Interna: pide desde cualquier hilo reintentar la cola de escrituras
+    _replay_requested = pyqtSignal()
     usuarios_changed = pyqtSignal()
     modulos_changed = pyqtSignal()
     lecciones_changed = pyqtSignal()
@@ -130,6 +774,13 @@ class APIClient(QObject):
         )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        self._adapter = adapter
+
+        # Pre-calentamiento: conexiones abiertas (DNS, TCP y TLS) desde la
+        # pantalla de login y mantenidas vivas hasta el primer uso real
+        self.warmup_connections = int(os.getenv("API_WARMUP_CONNECTIONS", "3"))
+        self.keepalive_interval = 20000  # ms, por debajo del keep-alive habitual
+        self.warmup_stats = {"runs": 0, "last_ms": None, "failures": 0}
 
         # Headers ULTRA OPTIMIZADOS
         self.session.headers.update(
@@ -139,48 +790,195 @@ class APIClient(QObject):
                 "Accept": "application/json",
                 "Content-Type": "application/json",
                 "User-Agent": "Varchate-Admin/1.0",
-                "Cache-Control": "no-cache",
             }
         )
 
-        # ============= CACHÉ EN MEMORIA ULTRA RÁPIDO =============
-        self.cache = {}
+        # Renovación del token: una sola a la vez y antes de que caduque
+        self._refresh_lock = threading.Lock()
+        self._token_exp: Optional[float] = None
+        self._refresh_backoff_until = 0.0
+        self.token_renew_margin = 60  # segundos antes de exp
+        self.renew_timer = QTimer(self)
+        self.renew_timer.setSingleShot(True)
+        self.renew_timer.timeout.connect(self._renew_token_in_background)
+        self._token_changed.connect(self._schedule_token_renewal)
+
+        # Decodificación JSON (orjson si está instalado) y tiempos por endpoint
+        self.json_backend = json_codec.JSON_BACKEND
+        self.slow_decode_ms = 50
+        self.decode_stats: Dict[str, Dict[str, Any]] = {}
+        self._decode_stats_lock = threading.Lock()
+
+        # Disyuntor por host: con el backend caído se falla al instante en
+        # lugar de pagar el timeout de conexión en cada petición
+        self.breaker_threshold = int(os.getenv("API_BREAKER_THRESHOLD", "3"))
+        self.breaker_cooldown = float(os.getenv("API_BREAKER_COOLDOWN", "15"))
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self.online = True
+
+        # Pool de hilos compartido para peticiones asíncronas; por debajo del
+        # pool de 50 conexiones para que nunca bloquee esperando un socket
+        self.max_workers = int(os.getenv("API_MAX_WORKERS", "8"))
+        self.executor = RequestExecutor(self.max_workers, self)
 
-        # Timeouts MÁS LARGOS para mejor caché
+        # ============= CACHÉ EN MEMORIA ULTRA RÁPIDO =============
+        # LRU global: el orden de inserción/acceso decide qué se expulsa
+        self.cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # LRU por tipo para respetar las cuotas sin recorrer toda la caché
+        self._cache_lru_by_type: Dict[str, OrderedDict] = {}
+        self._cache_bytes_by_type: Dict[str, int] = {}
+        self.cache_bytes = 0
+        self.cache_max_bytes = 32 * 1024 * 1024  # 32 MB en total
+        # Índice etiqueta -> claves: tipo de caché, entidades y listados
+        self._cache_index: Dict[Any, set] = {}
+        # Los workers leen y escriben la caché desde otros hilos
+        self._cache_lock = threading.RLock()
+        self.cache_stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "evictions": 0,
+            "expired": 0,
+            "revalidated": 0,
+            "coalesced": 0,
+        }
+        # Single-flight: clave -> InFlightRequest. La generación cambia con
+        # cada invalidación para no reutilizar peticiones ya obsoletas
+        self._inflight: Dict[str, InFlightRequest] = {}
+        self._inflight_lock = threading.Lock()
+        self._cache_generation = 0
+        self.inflight_wait_timeout = 30
+        # Claves con una revalidación stale-while-revalidate en curso
+        self._revalidating = set()
+        self._revalidate_requested.connect(self._schedule_revalidation)
+        # Tiempo extra que se conserva una entrada expirada con ETag o
+        # Last-Modified (o de un tipo stale_while_revalidate) para poder
+        # revalidarla o servirla mientras se refresca
+        self.revalidate_grace = 1800  # 30 minutos
+
+        # Timeouts MÁS LARGOS para mejor caché; max_bytes es la cuota del tipo
         self.cache_config = {
-            "modulos": {"timeout": 300, "enabled": True, "preload": True},  # 5 minutos
+            "modulos": {
+                "timeout": 300,
+                "enabled": True,
+                "stale_while_revalidate": True,
+                "preload": True,
+                "max_bytes": 2 * 1024 * 1024,
+                "persist": True,
+                "disk_ttl": 86400,
+            },  # 5 minutos
             "usuarios": {
                 "timeout": 180,
                 "enabled": True,
+                "stale_while_revalidate": True,
                 "preload": False,
+                "max_bytes": 8 * 1024 * 1024,
             },  # 3 minutos
+            "usuarios_busqueda": {
+                "timeout": 60,
+                "enabled": True,
+                "stale_while_revalidate": False,
+                "preload": False,
+                "max_bytes": 1024 * 1024,
+            },  # 1 minuto; LRU pequeño de consultas recientes
             "lecciones": {
                 "timeout": 300,
                 "enabled": True,
+                "stale_while_revalidate": True,
                 "preload": True,
+                "max_bytes": 12 * 1024 * 1024,
+                "persist": True,
+                "disk_ttl": 86400,
+            },  # 5 minutos
+            "ejercicios": {
+                "timeout": 300,
+                "enabled": True,
+                "stale_while_revalidate": True,
+                "preload": False,
+                "max_bytes": 4 * 1024 * 1024,
             },  # 5 minutos
             "dashboard": {
                 "timeout": 120,
                 "enabled": True,
+                "stale_while_revalidate": True,
                 "preload": True,
+                "max_bytes": 1024 * 1024,
+                "persist": True,
+                "disk_ttl": 3600,
             },  # 2 minutos
             "evaluaciones": {
                 "timeout": 300,
                 "enabled": True,
+                "stale_while_revalidate": True,
                 "preload": False,
+                "max_bytes": 4 * 1024 * 1024,
+                "persist": True,
+                "disk_ttl": 86400,
             },  # 5 minutos
+            "avatars": {
+                "timeout": 3600,
+                "enabled": True,
+                "stale_while_revalidate": True,
+                "preload": False,
+                "max_bytes": 1024 * 1024,
+                "persist": True,
+                "disk_ttl": 7 * 86400,
+            },  # 1 hora
         }
 
-        # Caché en disco (solo para datos estáticos)
-        self.disk_cache_enabled = False  # DESACTIVADO: más rápido sin disco
-
+        # Barrido periódico de entradas expiradas fuera del hilo de la GUI
+        self.cache_sweep_interval = 60000  # 1 minuto
+        self._sweep_future = None
+        self.sweep_timer = QTimer(self)
+        self.sweep_timer.timeout.connect(self._start_cache_sweep)
+        self.sweep_timer.start(self.cache_sweep_interval)
+
+        self.keepalive_timer = QTimer(self)
+        self.keepalive_timer.timeout.connect(self.warm_up)
+        # login() corre en un worker: el temporizador se para en su hilo
+        self._logged_in.connect(self._on_logged_in)
+
+        # Sin conexión: sondear el backend tras cada enfriamiento del disyuntor
+        self.probe_timer = QTimer(self)
+        self.probe_timer.timeout.connect(self._probe_backend)
+        self.connectivity_changed.connect(self._on_connectivity_changed)
+
+        # Caché en disco para arranques en caliente (se abre tras el login)
+        self.disk_cache_enabled = True
+        self.disk_cache: Optional[DiskCache] = None
+
+        # Diario de escrituras hechas sin conexión (se abre tras el login)
+        self.write_queue: Optional[WriteJournal] = None
+        self._replay_lock = threading.Lock()
+        self.replay_timer = QTimer(self)
+        self.replay_timer.setSingleShot(True)
+        self.replay_timer.timeout.connect(self._schedule_write_replay)
+        self._replay_requested.connect(
+            lambda: self.replay_timer.start(int(self.breaker_cooldown * 1000))
+        )
+        # Respuestas servidas desde disco que aún no se han revalidado
+        self._warm_entries: Dict[str, Any] = {}
+
+        # Almacén normalizado de entidades que comparten todas las vistas
+        self.store = EntityStore(self)
+        # Imágenes remotas (avatares) con caché en memoria y en disco
+        self.images = ImageLoader(self)
+
+        # Sincronización incremental de colecciones (updated_since)
+        self._sync_states: Dict[str, SyncState] = {}
+        self._sync_lock = threading.Lock()
+        self.full_resync_interval = 1800  # reconciliar bajas cada 30 min
+        self.delta_page_size = 500
+
+        # Endpoint de lotes del servidor (opcional), p. ej. "/admin/batch"
+        self.batch_endpoint = os.getenv("API_BATCH_ENDPOINT") or None
         self.batch_manager = BatchRequestManager(self)
-        self.pending_workers = []
 
-        # Cache de avatares en memoria
-        self.avatars_cache = None
-        self.avatars_cache_time = 0
-        self.avatars_timeout = 3600  # 1 hora
+        # Operaciones masivas: peticiones simultáneas sin endpoint de lotes
+        # y operaciones por llamada cuando lo hay
+        self.bulk_concurrency = int(os.getenv("API_BULK_CONCURRENCY", "4"))
+        self.bulk_chunk_size = 100
 
         # ============= REGISTRO DE OBSERVADORES =============
         self.observers = {}
@@ -193,36 +991,352 @@ class APIClient(QObject):
         """Generar clave ULTRA RÁPIDA"""
         if params:
             # Usar repr() que es más rápido que json.dumps
-            params_str = repr(sorted(params.items())) if params else ""
-        else:
-            params_str = ""
-        key_str = f"{endpoint}:{params_str}"
-        return hashlib.md5(key_str.encode()).hexdigest()
+            return f"{endpoint}:{repr(sorted(params.items()))}"
+        return f"{endpoint}:"
+
+    def _cache_tags(self, endpoint: str, cache_type: str) -> tuple:
+        """
+        Etiquetas de índice para una entrada GET.
+
+        - cache_type: todas las entradas del tipo
+        - (tipo, id): todo lo que toca la entidad, sea cual sea el tipo
+        - (cache_type, (tipo, id)): entradas del tipo que tocan la entidad
+        - ("scope", cache_type, padre): listados del tipo bajo un padre
+        """
+        entities, listing = parse_entity_path(endpoint)
+        tags = [cache_type]
+        for entity in entities:
+            tags.append(entity)
+            tags.append((cache_type, entity))
+        if listing:
+            parent = entities[-1] if entities else None
+            tags.append(("scope", cache_type, parent))
+        return tuple(tags)
+
+    def _get_cache_entry(self, key: str) -> Optional[CacheEntry]:
+        """Obtener la entrada aunque haya expirado, si aún sirve para revalidar"""
+        with self._cache_lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+            if entry.is_dead(self._entry_grace(entry)):
+                self._drop_cache_keys((key,))
+                self.cache_stats["expired"] += 1
+                return None
+            self._touch_cache_key(key, entry)
+            return entry
+
+    def _entry_grace(self, entry: CacheEntry) -> float:
+        """Margen tras expirar en que la entrada aún es útil"""
+        if entry.has_validators() or self.cache_config.get(
+            entry.cache_type, {}
+        ).get("stale_while_revalidate"):
+            return self.revalidate_grace
+        return 0
 
     def _get_from_cache(self, key: str, cache_type: str = None) -> Optional[Any]:
         """Obtener de caché - ULTRA RÁPIDO"""
-        if key in self.cache:
-            entry = self.cache[key]
-            if not entry.is_expired():
+        entry = self._get_cache_entry(key)
+        with self._cache_lock:
+            if entry is not None and not entry.is_expired():
+                self.cache_stats["hits"] += 1
                 return entry.data
-            else:
-                del self.cache[key]
+            self.cache_stats["misses"] += 1
         return None
 
-    def _save_to_cache(self, key: str, data: Any, cache_type: str = None):
-        """Guardar en caché - ULTRA RÁPIDO"""
-        timeout = self.cache_config.get(cache_type, {}).get("timeout", 300)
-        self.cache[key] = CacheEntry(data, timeout)
+    def _revalidate_cache_entry(self, key: str, entry: CacheEntry):
+        """Un 304 confirma la entrada: reiniciar su TTL sin tocar los datos"""
+        with self._cache_lock:
+            entry.timestamp = time.time()
+            self.cache_stats["revalidated"] += 1
+        if self.disk_cache and self.cache_config.get(entry.cache_type, {}).get(
+            "persist"
+        ):
+            self.disk_cache.touch(key)
+
+    def _save_to_cache(
+        self,
+        key: str,
+        data: Any,
+        cache_type: str = None,
+        endpoint: str = None,
+        persist: bool = True,
+        validators: Dict[str, str] = None,
+    ):
+        """Guardar en caché, indexar, aplicar cuotas LRU y persistir en disco"""
+        config = self.cache_config.get(cache_type, {})
+        timeout = config.get("timeout", 300)
+        quota = config.get("max_bytes", self.cache_max_bytes)
+        size = estimate_size(data)
+        if size > quota or size > self.cache_max_bytes:
+            # Nunca desplazar toda la caché por una sola respuesta enorme, pero
+            # tampoco dejar servida la versión anterior de esta clave
+            with self._cache_lock:
+                if key in self.cache:
+                    self._drop_cache_keys((key,))
+            if self.disk_cache:
+                self.disk_cache.delete(key)
+            return
+
+        validators = validators or {}
+        tags = self._cache_tags(endpoint or key.split(":", 1)[0], cache_type)
+        with self._cache_lock:
+            if key in self.cache:
+                self._drop_cache_keys((key,))
+            self.cache[key] = CacheEntry(
+                data,
+                timeout,
+                cache_type,
+                tags,
+                size,
+                validators.get("etag"),
+                validators.get("last_modified"),
+            )
+            self._cache_lru_by_type.setdefault(cache_type, OrderedDict())[key] = None
+            self._cache_bytes_by_type[cache_type] = (
+                self._cache_bytes_by_type.get(cache_type, 0) + size
+            )
+            self.cache_bytes += size
+            for tag in tags:
+                self._cache_index.setdefault(tag, set()).add(key)
+            self._enforce_cache_limits(cache_type, quota)
+
+        if persist and self.disk_cache and config.get("persist"):
+            self.disk_cache.put(
+                key, cache_type, data, config["disk_ttl"], tags, validators
+            )
+
+    def _touch_cache_key(self, key: str, entry: CacheEntry):
+        """Marcar una entrada como usada recientemente (llamar con el lock)"""
+        self.cache.move_to_end(key)
+        lru = self._cache_lru_by_type.get(entry.cache_type)
+        if lru is not None and key in lru:
+            lru.move_to_end(key)
+
+    def _enforce_cache_limits(self, cache_type: str, quota: int):
+        """Expulsar las entradas menos usadas hasta cumplir cuota y presupuesto"""
+        lru = self._cache_lru_by_type.get(cache_type)
+        while lru and self._cache_bytes_by_type.get(cache_type, 0) > quota:
+            self._drop_cache_keys((next(iter(lru)),))
+            self.cache_stats["evictions"] += 1
+        while self.cache and self.cache_bytes > self.cache_max_bytes:
+            self._drop_cache_keys((next(iter(self.cache)),))
+            self.cache_stats["evictions"] += 1
+
+    def _drop_cache_keys(self, keys) -> int:
+        """Eliminar claves de la caché y del índice (llamar con el lock)"""
+        removed = 0
+        for key in list(keys):
+            entry = self.cache.pop(key, None)
+            if entry is None:
+                continue
+            removed += 1
+            self.cache_bytes -= entry.size
+            self._cache_bytes_by_type[entry.cache_type] = (
+                self._cache_bytes_by_type.get(entry.cache_type, 0) - entry.size
+            )
+            lru = self._cache_lru_by_type.get(entry.cache_type)
+            if lru is not None:
+                lru.pop(key, None)
+            for tag in entry.tags:
+                bucket = self._cache_index.get(tag)
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self._cache_index[tag]
+        return removed
+
+    def _drop_cache_tags(self, tags) -> int:
+        """Eliminar todas las entradas asociadas a alguna de las etiquetas"""
+        if self.disk_cache:
+            self.disk_cache.delete_tags(tags)
+        with self._cache_lock:
+            self._cache_generation += 1
+            keys = set()
+            for tag in tags:
+                keys.update(self._cache_index.get(tag, ()))
+            return self._drop_cache_keys(keys)
+
+    def _start_cache_sweep(self):
+        """Lanzar el barrido de expirados en un worker si no hay uno activo"""
+        if self._sweep_future is not None or not self.cache:
+            return
+        self._sweep_future = self.executor.submit(
+            self.sweep_expired_cache,
+            callback=self._on_cache_sweep_finished,
+            priority=Priority.BACKGROUND,
+        )
+
+    def _on_cache_sweep_finished(self, removed):
+        self._sweep_future = None
+
+    def sweep_expired_cache(self, chunk_size: int = 200) -> int:
+        """
+        Eliminar entradas expiradas por bloques.
+
+        El lock se suelta entre bloques para que las lecturas del hilo de la
+        GUI nunca esperen a un barrido completo.
+        """
+        with self._cache_lock:
+            keys = list(self.cache.keys())
+
+        removed = 0
+        for start in range(0, len(keys), chunk_size):
+            with self._cache_lock:
+                expired = [
+                    key
+                    for key in keys[start : start + chunk_size]
+                    if key in self.cache
+                    and self.cache[key].is_dead(self._entry_grace(self.cache[key]))
+                ]
+                removed += self._drop_cache_keys(expired)
+                self.cache_stats["expired"] += len(expired)
+        return removed
 
     def clear_cache(self, cache_type: str = None):
-        """Limpiar caché - ULTRA RÁPIDO"""
+        """Limpiar caché en memoria y en disco - ULTRA RÁPIDO"""
         if cache_type:
-            # Limpiar solo las claves que coinciden
-            keys_to_delete = [k for k in self.cache.keys() if cache_type in k]
-            for key in keys_to_delete:
-                del self.cache[key]
+            self._drop_cache_tags((cache_type,))
         else:
+            if self.disk_cache:
+                self.disk_cache.clear()
+            self._reset_memory_cache()
+
+    def _reset_memory_cache(self):
+        """Vaciar solo la caché en memoria"""
+        with self._cache_lock:
+            self._cache_generation += 1
             self.cache.clear()
+            self._cache_index.clear()
+            self._cache_lru_by_type.clear()
+            self._cache_bytes_by_type.clear()
+            self.cache_bytes = 0
+        self._warm_entries.clear()
+        self.store.clear()
+
+    # ============= CACHÉ EN DISCO =============
+    def _open_disk_cache(self):
+        """Abrir la caché persistente del backend y usuario actuales"""
+        if not self.disk_cache_enabled or not self.user:
+            return
+        self._close_disk_cache()
+        namespace = f"{self.base_url}|{self.user.get('id')}"
+        path = os.path.join(default_cache_dir(), "responses.sqlite3")
+        try:
+            self.disk_cache = DiskCache(path, namespace)
+            self.disk_cache.purge_expired()
+        except Exception as e:
+            logger.error(f"Caché en disco no disponible: {e}")
+            self.disk_cache = None
+
+    def _close_disk_cache(self):
+        if self.disk_cache:
+            try:
+                self.disk_cache.close()
+            except Exception as e:
+                logger.error(f"Error cerrando caché en disco: {e}")
+            self.disk_cache = None
+
+    def _warm_from_disk(self) -> int:
+        """
+        Cargar en memoria las respuestas persistidas de sesiones anteriores.
+
+        Las vistas las pintan al instante; preload_cache las revalida y
+        notifica si el servidor devuelve algo distinto.
+        """
+        if not self.disk_cache:
+            return 0
+        persisted = [t for t, c in self.cache_config.items() if c.get("persist")]
+        try:
+            entries = self.disk_cache.load(persisted)
+        except Exception as e:
+            logger.error(f"Error leyendo caché en disco: {e}")
+            return 0
+
+        for entry in entries:
+            self._save_to_cache(
+                entry["key"],
+                entry["data"],
+                entry["cache_type"],
+                persist=False,
+                validators=entry["validators"],
+            )
+            self._warm_entries[entry["key"]] = entry["data"]
+            endpoint, params = entry["key"].split(":", 1)
+            self._ingest(endpoint, {"page": None} if params else None, entry["data"])
+        return len(entries)
+
+    # ============= ALMACÉN DE ENTIDADES =============
+    def _ingest(self, endpoint: str, params: Optional[Dict], result: Dict[str, Any]):
+        """
+        Volcar una respuesta GET correcta en el almacén de entidades.
+
+        La forma del endpoint decide dónde va: /modulos/5 es un detalle,
+        /modulos/5/lecciones el listado de hijos del módulo 5 y
+        /modulos/5/evaluacion su recurso único (con sus preguntas). Un
+        listado paginado, filtrado o incremental solo actualiza entidades.
+        """
+        if not isinstance(result, dict) or not result.get("success"):
+            return
+        data = result.get("data")
+        path = endpoint.split("?", 1)[0]
+        entities, listing = parse_entity_path(path)
+
+        if not listing:
+            if entities and isinstance(data, dict):
+                self.store.upsert(entities[-1][0], [data])
+            return
+
+        segments = [segment for segment in path.split("/") if segment]
+        kind = ENTITY_SEGMENTS.get(segments[-1]) if segments else None
+        if kind is None:
+            return
+        parent = entities[-1] if entities else None
+
+        if isinstance(data, dict) and "data" not in data:
+            if data.get("id") is None:
+                return
+            self.store.set_children(parent, kind, [data])
+            if isinstance(data.get("preguntas"), list):
+                self.store.set_children((kind, data["id"]), "pregunta", data["preguntas"])
+            return
+
+        rows, _ = split_page(result)
+        if params and any(key in params for key in PARTIAL_LISTING_PARAMS):
+            self.store.upsert(kind, rows)
+        else:
+            self.store.set_children(parent, kind, rows)
+
+    def _ingest_write(self, method: str, endpoint: str, result: Dict[str, Any]):
+        """
+        Volcar en el almacén la entidad que devuelve una escritura correcta.
+
+        Un PUT/PATCH sobre /modulos/5 actualiza el módulo 5 y un POST a
+        /modulos/5/lecciones añade la lección creada al listado del módulo
+        si ya se conocía. Así las vistas enlazadas al almacén se repintan
+        sin volver a pedir el listado.
+        """
+        entity = result.get("data")
+        if isinstance(entity, dict) and isinstance(entity.get("data"), dict):
+            entity = entity["data"]
+        if not isinstance(entity, dict) or entity.get("id") is None:
+            return
+        path = endpoint.split("?", 1)[0]
+        entities, listing = parse_entity_path(path)
+        method = method.upper()
+
+        if method == "POST" and listing:
+            segments = [segment for segment in path.split("/") if segment]
+            kind = ENTITY_SEGMENTS.get(segments[-1]) if segments else None
+            if kind is not None:
+                parent = entities[-1] if entities else None
+                self.store.add_child(parent, kind, entity)
+        elif method in ("PUT", "PATCH") and entities and not listing:
+            kind, entity_id = entities[-1]
+            if entity.get("id") == entity_id:
+                # La respuesta puede omitir campos calculados del listado
+                previous = self.store.get(kind, entity_id) or {}
+                self.store.upsert(kind, [{**previous, **entity}])
 
     # ============= SISTEMA DE OBSERVADORES =============
     def subscribe(self, data_type: str, callback: Callable):
@@ -264,22 +1378,56 @@ class APIClient(QObject):
 
     # ============= INVALIDACIÓN DE CACHÉ ULTRA RÁPIDA =============
     def invalidate_cache_type(self, cache_type: str):
-        """Invalidar caché - ULTRA RÁPIDO"""
-        # Limpiar solo las claves relevantes
-        keys_to_delete = []
-        cache_type_lower = cache_type.lower()
-
-        for key in list(self.cache.keys()):
-            if cache_type_lower in key.lower():
-                keys_to_delete.append(key)
-
-        for key in keys_to_delete:
-            del self.cache[key]
+        """Invalidar todas las entradas de un tipo y notificar"""
+        removed = self._drop_cache_tags(
+            (cache_type, *DEPENDENT_CACHE_TYPES.get(cache_type, ()))
+        )
 
         # Notificar cambios
         self.notify_changed(cache_type)
 
-        return len(keys_to_delete)
+        return removed
+
+    def invalidate_entities(
+        self, method: str, endpoint: str, cache_types: List[str]
+    ) -> int:
+        """
+        Invalidar solo las entradas afectadas por una mutación.
+
+        Para cada tipo se eliminan los listados del tipo bajo cualquier
+        entidad de la ruta y las entradas del tipo que tocan la entidad
+        destino. Un DELETE elimina además todo lo que cuelga de la entidad.
+        """
+        return self._invalidate_mutations([(method, endpoint)], cache_types)
+
+    def _invalidate_mutations(self, mutations: List, cache_types: List[str]) -> int:
+        """Invalidar varias mutaciones (método, endpoint) y notificar una vez"""
+        affected = list(cache_types)
+        for cache_type in cache_types:
+            affected.extend(DEPENDENT_CACHE_TYPES.get(cache_type, ()))
+        tags = set()
+        deleted = []
+        for method, endpoint in mutations:
+            entities, _ = parse_entity_path(endpoint)
+            for cache_type in affected:
+                tags.add(("scope", cache_type, None))
+                for entity in entities:
+                    tags.add(("scope", cache_type, entity))
+                if entities:
+                    tags.add((cache_type, entities[-1]))
+            if method.upper() == "DELETE" and entities:
+                tags.add(entities[-1])
+                deleted.append((endpoint, entities[-1]))
+
+        removed = self._drop_cache_tags(list(tags))
+        for endpoint, entity in deleted:
+            self._forget_synced_row(endpoint, entity[1])
+            self.store.remove(*entity)
+
+        for cache_type in cache_types:
+            self.notify_changed(cache_type)
+
+        return removed
 
     # ============= PETICIONES ASÍNCRONAS =============
     def get_async(
@@ -288,40 +1436,211 @@ class APIClient(QObject):
         callback: Callable,
         cache_type: str = None,
         force_refresh: bool = False,
+        priority: int = Priority.VISIBLE,
+        token: CancellationToken = None,
         **kwargs,
     ):
-        """Petición GET asíncrona"""
-        worker = RequestWorker(
+        """
+        Petición GET asíncrona en el planificador compartido.
+
+        El callback se ejecuta en el hilo de la GUI. Devuelve un
+        RequestFuture que se puede cancelar o esperar; si el token se
+        cancela, la petición se descarta sin llegar a la GUI.
+        """
+        return self.executor.submit(
             self.get,
             endpoint,
+            callback=callback,
+            priority=priority,
+            token=token,
             cache_type=cache_type,
             force_refresh=force_refresh,
             **kwargs,
         )
-        worker.finished.connect(callback)
-        worker.finished.connect(worker.deleteLater)
-        worker.finished.connect(
-            lambda: (
-                self.pending_workers.remove(worker)
-                if worker in self.pending_workers
-                else None
-            )
+
+    def submit_async(
+        self,
+        func: Callable,
+        *args,
+        callback: Callable = None,
+        priority: int = Priority.VISIBLE,
+        token: CancellationToken = None,
+        **kwargs,
+    ):
+        """Ejecutar cualquier método del cliente en el planificador compartido"""
+        return self.executor.submit(
+            func, *args, callback=callback, priority=priority, token=token, **kwargs
+        )
+
+    # ============= MUTACIONES OPTIMISTAS =============
+    def mutate_optimistic(
+        self,
+        kind: str,
+        entity_id,
+        func: Callable,
+        *args,
+        fields: Dict = None,
+        remove: bool = False,
+        callback: Callable = None,
+        **kwargs,
+    ):
+        """
+        Aplicar una mutación en el almacén sin esperar al servidor.
+
+        Con fields se parchea la entidad y con remove se quita; las vistas
+        repintan solo lo afectado a través de las señales del almacén. La
+        petición va al planificador con prioridad INTERACTIVE: si falla se
+        restaura la versión anterior y si el servidor devuelve la entidad,
+        esa versión sustituye a la provisional. Llamar desde el hilo de la
+        GUI; el callback recibe el resultado allí, ya confirmado o deshecho.
+        """
+        if remove:
+            snapshot = self.store.remove(kind, entity_id)
+        else:
+            snapshot = self.store.patch(kind, entity_id, fields or {})
+
+        def settle(result):
+            if result.get("success"):
+                confirmed = result.get("data")
+                if isinstance(confirmed, dict) and isinstance(confirmed.get("data"), dict):
+                    confirmed = confirmed["data"]
+                if (
+                    not remove
+                    and isinstance(confirmed, dict)
+                    and confirmed.get("id") == entity_id
+                ):
+                    self.store.upsert(kind, [confirmed])
+            elif remove:
+                if snapshot is not None:
+                    self.store.restore(kind, snapshot)
+            elif snapshot is None:
+                self.store.remove(kind, entity_id)
+            else:
+                self.store.upsert(kind, [snapshot])
+            if callback:
+                callback(result)
+
+        return self.submit_async(
+            func, *args, callback=settle, priority=Priority.INTERACTIVE, **kwargs
+        )
+
+    # ============= OPERACIONES MASIVAS =============
+    def bulk_mutate(
+        self,
+        operations: List[Dict],
+        cache_types: List[str],
+        on_progress: Callable = None,
+        on_done: Callable = None,
+        token: CancellationToken = None,
+    ) -> RequestFuture:
+        """
+        Ejecutar muchas mutaciones en el planificador compartido (ver BulkMutation).
+
+        Cada operación es {"id", "method", "endpoint", "json"?}. Con endpoint
+        de lotes viajan en bloques de bulk_chunk_size; si no, o para lo que
+        el lote no resolvió, van una a una con bulk_concurrency peticiones
+        simultáneas. on_progress recibe {"done", "total", "failed"} y on_done
+        el resultado final con "succeeded" (ids) y "failed" (id -> error),
+        ambos en el hilo de la GUI. Las cachés se invalidan una sola vez al
+        terminar, aunque se cancele a medias. Llamar desde el hilo de la GUI.
+        """
+        return BulkMutation(
+            self, operations, cache_types, on_progress, on_done, token
+        ).start()
+
+    def _bulk_via_batch(self, chunk: List[Dict]) -> Dict[Any, Dict[str, Any]]:
+        """Enviar un bloque de mutaciones al endpoint de lotes"""
+        response = self._request(
+            "POST",
+            self.batch_endpoint,
+            json={
+                "requests": [
+                    {
+                        "id": str(op["id"]),
+                        "method": op["method"],
+                        "path": op["endpoint"],
+                        "body": op.get("json") or {},
+                    }
+                    for op in chunk
+                ]
+            },
         )
-        self.pending_workers.append(worker)
-        worker.start()
-        return worker
+        if not response.get("success"):
+            return {}
+        data = response.get("data")
+        items = data.get("responses", []) if isinstance(data, dict) else data
+        by_key = {str(op["id"]): op["id"] for op in chunk}
+        results = {}
+        for item in items or []:
+            op_id = by_key.get(str(item.get("id")))
+            if op_id is not None:
+                results[op_id] = self._batch_item_result(item)
+        return results
+
+    # ============= DISYUNTOR =============
+    def _breaker_for(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._breakers_lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+                self._breakers[host] = breaker
+            return breaker
+
+    def _set_online(self, online: bool):
+        if online != self.online:
+            self.online = online
+            logger.warning("Backend accesible" if online else "Backend inaccesible")
+            self.connectivity_changed.emit(online)
+
+    def _on_connectivity_changed(self, online: bool):
+        if online:
+            self.probe_timer.stop()
+            self._schedule_write_replay()
+        else:
+            self.probe_timer.start(int(self.breaker_cooldown * 1000))
+
+    def _probe_backend(self):
+        """Petición de prueba en segundo plano mientras no hay conexión"""
+        if self.token:
+            self.submit_async(
+                self.get_dashboard_stats,
+                force_refresh=True,
+                priority=Priority.BACKGROUND,
+            )
 
     # ============= MÉTODO BASE ULTRA OPTIMIZADO =============
+    @retry_on_failure(max_retries=2, delay=0.2)
     def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Método base ULTRA RÁPIDO"""
+        """Método base ULTRA RÁPIDO
+
+        Pasa por el disyuntor del host y marca como "retryable" los fallos
+        transitorios de métodos idempotentes para retry_on_failure.
+        """
         url = (
             f"{self.base_url}{endpoint if endpoint.startswith('/') else '/' + endpoint}"
         )
 
+        breaker = self._breaker_for(url)
+        if not breaker.allow():
+            return {
+                "success": False,
+                "error": "Servidor no disponible",
+                "offline": True,
+                "network_error": True,
+                "not_sent": True,
+            }
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        # Renovar justo a tiempo si el token está a punto de caducar
+        if self.token and self._token_expiring():
+            self._refresh_token(self.token)
+
         # Headers con token
-        if self.token:
+        sent_token = self.token
+        if sent_token:
             kwargs.setdefault("headers", {})
-            kwargs["headers"]["Authorization"] = f"Bearer {self.token}"
+            kwargs["headers"]["Authorization"] = f"Bearer {sent_token}"
 
         # Timeout agresivo
         kwargs.setdefault("timeout", self.timeout)
@@ -333,32 +1652,91 @@ class APIClient(QObject):
                 self.request_started.emit()
 
             response = self.session.request(method, url, **kwargs)
-            return self._handle_response_fast(response)
+            if breaker.record_success():
+                self._set_online(True)
 
-        except requests.ConnectionError:
-            return {"success": False, "error": "Error de conexión"}
+            # Token caducado: renovar (una vez para todos) y repetir la petición
+            if response.status_code == 401 and sent_token and self.refresh_token:
+                if not self._refresh_token(sent_token):
+                    self.session_expired.emit()
+                    return {
+                        "success": False,
+                        "error": "Sesión expirada",
+                        "status_code": 401,
+                    }
+                kwargs["headers"]["Authorization"] = f"Bearer {self.token}"
+                response = self.session.request(method, url, **kwargs)
+
+            result = self._handle_response_fast(response)
+            if idempotent and response.status_code in RETRYABLE_STATUS:
+                result["retryable"] = True
+            return result
+
+        except requests.ConnectionError as e:
+            # Incluye ConnectTimeout: el host no acepta conexiones
+            if breaker.record_failure():
+                self._set_online(False)
+            return {
+                "success": False,
+                "error": "Error de conexión",
+                "network_error": True,
+                "not_sent": request_not_sent(e),
+                "retryable": idempotent and breaker.state == CircuitBreaker.CLOSED,
+            }
         except requests.Timeout:
-            return {"success": False, "error": "Tiempo agotado"}
+            return {
+                "success": False,
+                "error": "Tiempo agotado",
+                "network_error": True,
+                "retryable": idempotent,
+            }
         except Exception as e:
             return {"success": False, "error": str(e)}
         finally:
             if not no_cache:
                 self.request_finished.emit()
 
+    def fetch_url(self, url: str, headers: Dict[str, str] = None) -> Dict[str, Any]:
+        """
+        GET de una URL absoluta (p. ej. una imagen) por el disyuntor de su host.
+
+        No añade el token ni decodifica el cuerpo: la respuesta va en
+        "response" para que quien llama lea los bytes y las cabeceras. Solo
+        los fallos del propio backend cambian el estado de conexión.
+        """
+        breaker = self._breaker_for(url)
+        if not breaker.allow():
+            return {
+                "success": False,
+                "error": "Servidor no disponible",
+                "offline": True,
+                "network_error": True,
+            }
+        backend = urlsplit(url).netloc == urlsplit(self.base_url).netloc
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.ConnectionError:
+            if breaker.record_failure() and backend:
+                self._set_online(False)
+            return {"success": False, "error": "Error de conexión", "network_error": True}
+        except requests.Timeout:
+            return {"success": False, "error": "Tiempo agotado", "network_error": True}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        if breaker.record_success() and backend:
+            self._set_online(True)
+        return {"success": True, "response": response}
+
     def _handle_response_fast(self, response: requests.Response) -> Dict[str, Any]:
         """Manejador de respuesta ULTRA RÁPIDO"""
-        # Token expirado
-        if response.status_code == 401 and self.refresh_token:
-            if self._refresh_token():
-                return {"success": None, "should_retry": True}
-            else:
-                self.session_expired.emit()
-                return {"success": False, "error": "Sesión expirada"}
+        # Revalidación condicional: el cuerpo no se descarga ni se decodifica
+        if response.status_code == 304:
+            return {"success": True, "not_modified": True, "status_code": 304}
 
         # Error rápido
         if response.status_code >= 400:
             try:
-                data = response.json()
+                data = self._decode_json(response)
                 error_msg = data.get("message", data.get("error", "Error"))
 
                 if response.status_code == 422 and "errors" in data:
@@ -380,19 +1758,147 @@ class APIClient(QObject):
 
         # Éxito rápido
         try:
-            data = response.json()
+            data = self._decode_json(response)
         except:
             return {"success": True, "data": {}, "status_code": response.status_code}
 
-        if "data" in data:
-            return {
-                "success": True,
-                "data": data["data"],
-                "meta": data.get("meta"),
-                "status_code": response.status_code,
+        result = wrap_payload(data, response.status_code)
+
+        # Validadores para futuros GET condicionales (get() los retira)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            result["validators"] = {"etag": etag, "last_modified": last_modified}
+
+        return result
+
+    # ============= DECODIFICACIÓN JSON =============
+    def _decode_json(self, response: requests.Response):
+        """
+        Decodificar el cuerpo con json_codec midiendo el tiempo por endpoint.
+
+        Se decodifica en el hilo que hizo la petición: las vistas llaman al
+        cliente con submit_async/get_async, así que eso ocurre en un worker
+        y nunca se anida un bucle de eventos en la GUI.
+        """
+        content = response.content
+        ok, data, elapsed = self._timed_decode(content)
+
+        self._record_decode(response.url, len(content), elapsed)
+        if not ok:
+            raise ValueError(data)
+        return data
+
+    @staticmethod
+    def _timed_decode(content: bytes):
+        """(ok, datos o mensaje de error, segundos) sin lanzar excepciones"""
+        start = time.perf_counter()
+        try:
+            data = json_codec.loads(content)
+            return True, data, time.perf_counter() - start
+        except ValueError as e:
+            return False, str(e), time.perf_counter() - start
+
+    def _record_decode(self, url: str, size: int, elapsed: float):
+        # "/admin/modulos/5/lecciones" -> "/admin/modulos/{id}/lecciones"
+        endpoint = re.sub(r"/\d+(?=/|$)", "/{id}", urlsplit(url or "").path)
+        with self._decode_stats_lock:
+            stats = self.decode_stats.setdefault(
+                endpoint, {"count": 0, "bytes": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            ms = elapsed * 1000
+            stats["count"] += 1
+            stats["bytes"] += size
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+        if ms >= self.slow_decode_ms:
+            logger.warning(f"Decodificación lenta de {endpoint}: {ms:.1f} ms, {size} bytes")
+
+    def get_decode_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Tiempos de decodificación por endpoint, de más a menos costoso"""
+        with self._decode_stats_lock:
+            items = [(endpoint, dict(stats)) for endpoint, stats in self.decode_stats.items()]
+        items.sort(key=lambda item: item[1]["total_ms"], reverse=True)
+        return {
+            endpoint: {
+                **stats,
+                "avg_ms": stats["total_ms"] / stats["count"] if stats["count"] else 0.0,
             }
+            for endpoint, stats in items
+        }
 
-        return {"success": True, "data": data, "status_code": response.status_code}
+    # ============= CONEXIONES =============
+    def warm_up(self, connections: int = None):
+        """
+        Abrir en paralelo varias conexiones del pool con API_URL.
+
+        Cada worker hace un HEAD a la URL base: lo que importa es que la
+        resolución DNS y el handshake TCP/TLS ocurran ahora y la conexión
+        vuelva al pool de la sesión compartida, no la respuesta. Los fallos
+        solo se registran; no cuentan para el disyuntor.
+        """
+        count = connections or self.warmup_connections
+        if count <= 0:
+            return
+        started = time.perf_counter()
+        remaining = [count]
+        lock = threading.Lock()
+
+        def open_connection():
+            try:
+                self.session.head(self.base_url, timeout=self.timeout)
+            except requests.RequestException as e:
+                with lock:
+                    self.warmup_stats["failures"] += 1
+                logger.debug(f"Pre-calentamiento sin respuesta: {e}")
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    self.warmup_stats["runs"] += 1
+                    self.warmup_stats["last_ms"] = (
+                        time.perf_counter() - started
+                    ) * 1000
+
+        for _ in range(count):
+            self.submit_async(open_connection, priority=Priority.BACKGROUND)
+
+    def start_keepalive(self):
+        """Pre-calentar ya y repetir mientras no haya tráfico real (login)"""
+        self.warm_up()
+        self.keepalive_timer.start(self.keepalive_interval)
+
+    def stop_keepalive(self):
+        """Parar el pre-calentamiento (solo desde el hilo de la GUI)"""
+        self.keepalive_timer.stop()
+
+    def _on_logged_in(self):
+        self.stop_keepalive()
+        logger.debug(f"Conexiones tras el login: {self.get_connection_stats()}")
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """
+        Reutilización de conexiones del pool de la sesión compartida.
+
+        opened son las conexiones nuevas (cada una pagó DNS, TCP y TLS);
+        el resto de peticiones viajaron por una conexión ya abierta.
+        """
+        pools = self._adapter.poolmanager.pools
+        opened = requests_sent = 0
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue
+            opened += getattr(pool, "num_connections", 0)
+            requests_sent += getattr(pool, "num_requests", 0)
+        reused = max(requests_sent - opened, 0)
+        return {
+            "requests": requests_sent,
+            "opened": opened,
+            "reused": reused,
+            "reuse_ratio": reused / requests_sent if requests_sent else 0.0,
+            "warmup": dict(self.warmup_stats),
+        }
 
     # ============= MÉTODO GET ACELERADO =============
     def get(
@@ -402,30 +1908,227 @@ class APIClient(QObject):
         cache_type: str = None,
         force_refresh: bool = False,
     ) -> Dict[str, Any]:
-        """GET con caché - ULTRA RÁPIDO"""
-        if force_refresh or not cache_type:
-            return self._request("GET", endpoint, params=params or {})
+        """GET con caché - ULTRA RÁPIDO
+
+        force_refresh ignora la vigencia de la entrada actual; si la entrada
+        tiene ETag/Last-Modified se revalida con un GET condicional y un 304
+        solo reinicia su TTL. Con stale_while_revalidate una entrada expirada
+        se devuelve al instante y data_changed avisa si el refresco trae
+        datos distintos.
+        """
+        cache_key = self._get_cache_key(endpoint, params)
+        config = self.cache_config.get(cache_type, {}) if cache_type else {}
 
-        # Verificar si el tipo de caché está habilitado
-        config = self.cache_config.get(cache_type, {})
-        if not config.get("enabled", True):
-            return self._request("GET", endpoint, params=params or {})
+        # Sin caché (o deshabilitada): solo se comparte la petición en vuelo
+        if not cache_type or not config.get("enabled", True):
+            return self._coalesced(
+                cache_key, lambda flight: self._fetch_uncached(endpoint, params)
+            )
 
         # Intentar caché
-        cache_key = self._get_cache_key(endpoint, params)
-        cached = self._get_from_cache(cache_key, cache_type)
-        if cached is not None:
-            return cached
+        entry = self._get_cache_entry(cache_key)
+        if entry is not None and not force_refresh:
+            if not entry.is_expired():
+                with self._cache_lock:
+                    self.cache_stats["hits"] += 1
+                return entry.data
+
+            # Stale-while-revalidate: servir ya y refrescar en segundo plano
+            if config.get("stale_while_revalidate"):
+                with self._cache_lock:
+                    self.cache_stats["stale"] += 1
+                self._revalidate_requested.emit(endpoint, params or {}, cache_type)
+                return entry.data
+        with self._cache_lock:
+            self.cache_stats["misses"] += 1
+
+        return self._coalesced(
+            cache_key,
+            lambda flight: self._fetch_and_cache(
+                flight, cache_key, endpoint, params, cache_type
+            ),
+        )
 
-        # Petición real
+    def _fetch_uncached(self, endpoint: str, params: Dict = None) -> Dict[str, Any]:
         result = self._request("GET", endpoint, params=params or {})
+        result.pop("validators", None)
+        self._ingest(endpoint, params, result)
+        return result
 
-        # Guardar en caché
-        if result.get("success", False):
-            self._save_to_cache(cache_key, result, cache_type)
+    def _fetch_and_cache(
+        self,
+        flight: "InFlightRequest",
+        cache_key: str,
+        endpoint: str,
+        params: Dict,
+        cache_type: str,
+    ) -> Dict[str, Any]:
+        """Petición real (condicional si hay validadores) y guardado en caché"""
+        entry = self._get_cache_entry(cache_key)
+        headers = entry.conditional_headers() if entry is not None else {}
+        result = self._request("GET", endpoint, params=params or {}, headers=headers)
+
+        if result.get("not_modified") and entry is not None:
+            self._revalidate_cache_entry(cache_key, entry)
+            return entry.data
+
+        # Sin conexión: mejor la última copia conocida que un error
+        if result.get("offline") and entry is not None:
+            return entry.data
+
+        # Guardar en caché salvo que una mutación la haya invalidado mientras
+        # la petición estaba en vuelo (la respuesta podría ser anterior)
+        validators = result.pop("validators", None)
+        if (
+            result.get("success", False)
+            and not result.get("not_modified")
+            and flight.generation == self._cache_generation
+        ):
+            self._save_to_cache(
+                cache_key, result, cache_type, endpoint, validators=validators
+            )
+            self._ingest(endpoint, params, result)
 
         return result
 
+    def _coalesced(self, cache_key: str, fetch: Callable) -> Dict[str, Any]:
+        """
+        Single-flight: las peticiones concurrentes a la misma clave esperan a
+        la que ya está en vuelo y reciben su mismo resultado.
+
+        Una invalidación incrementa la generación de la caché, de modo que las
+        peticiones posteriores no se enganchan a una iniciada antes de ella.
+        """
+        with self._inflight_lock:
+            flight = self._inflight.get(cache_key)
+            leader = flight is None or flight.generation != self._cache_generation
+            if leader:
+                flight = InFlightRequest(self._cache_generation)
+                self._inflight[cache_key] = flight
+            else:
+                flight.waiters += 1
+                self.cache_stats["coalesced"] += 1
+
+        if not leader:
+            if flight.event.wait(self.inflight_wait_timeout):
+                return flight.result
+            return {"success": False, "error": "Tiempo agotado"}
+
+        try:
+            flight.result = fetch(flight)
+        except Exception as e:
+            flight.result = {"success": False, "error": str(e)}
+        finally:
+            with self._inflight_lock:
+                if self._inflight.get(cache_key) is flight:
+                    del self._inflight[cache_key]
+            flight.event.set()
+        return flight.result
+
+    def get_many(self, requests: Dict[str, Dict]) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolver varias peticiones GET de una vez (llamar desde un worker).
+
+        Las que están vigentes en caché no salen a la red; el resto viaja en
+        una sola llamada al endpoint de lotes. Si no hay endpoint o la llamada
+        falla, se resuelven individualmente.
+
+        Args:
+            requests: clave de caché -> {"endpoint", "params", "cache_type",
+                "force_refresh"}
+        """
+        results = {}
+        pending = {}
+        for key, req in requests.items():
+            cache_type = req.get("cache_type")
+            if cache_type and not req.get("force_refresh"):
+                cached = self._get_from_cache(key, cache_type)
+                if cached is not None:
+                    results[key] = cached
+                    continue
+            pending[key] = req
+
+        if pending and self.batch_endpoint:
+            response = self._request(
+                "POST",
+                self.batch_endpoint,
+                json={
+                    "requests": [
+                        {
+                            "id": key,
+                            "method": "GET",
+                            "path": req["endpoint"],
+                            "params": req.get("params") or {},
+                        }
+                        for key, req in pending.items()
+                    ]
+                },
+            )
+            if response.get("success"):
+                data = response.get("data")
+                items = data.get("responses", []) if isinstance(data, dict) else data
+                for item in items or []:
+                    key = item.get("id")
+                    if key not in pending:
+                        continue
+                    result = self._batch_item_result(item)
+                    req = pending.pop(key)
+                    if result["success"] and req.get("cache_type"):
+                        self._save_to_cache(
+                            key, result, req["cache_type"], req["endpoint"]
+                        )
+                    results[key] = result
+
+        # Sin endpoint de lotes, o respuestas que faltaron en el lote
+        for key, req in pending.items():
+            results[key] = self.get(
+                req["endpoint"],
+                params=req.get("params"),
+                cache_type=req.get("cache_type"),
+                force_refresh=req.get("force_refresh", False),
+            )
+        return results
+
+    @staticmethod
+    def _batch_item_result(item: Dict) -> Dict[str, Any]:
+        """Convertir una sub-respuesta del endpoint de lotes en un resultado"""
+        status = item.get("status", 200)
+        body = item.get("body")
+        if status >= 400:
+            error = "Error"
+            if isinstance(body, dict):
+                error = body.get("message", body.get("error", f"Error {status}"))
+            return {"success": False, "error": error, "status_code": status}
+        return wrap_payload(body if body is not None else {}, status)
+
+    def _schedule_revalidation(self, endpoint: str, params: Dict, cache_type: str):
+        """Refrescar en segundo plano una entrada servida como stale"""
+        cache_key = self._get_cache_key(endpoint, params)
+        if cache_key in self._revalidating:
+            return
+        entry = self._get_cache_entry(cache_key)
+        old_data = entry.data if entry is not None else None
+
+        self._revalidating.add(cache_key)
+        self.get_async(
+            endpoint,
+            lambda result: self._on_revalidated(
+                result, cache_key, cache_type, old_data
+            ),
+            cache_type=cache_type,
+            force_refresh=True,
+            priority=Priority.BACKGROUND,
+            params=params or None,
+        )
+
+    def _on_revalidated(self, result, cache_key: str, cache_type: str, old_data):
+        """Notificar solo si el refresco trajo datos distintos"""
+        self._revalidating.discard(cache_key)
+        if not result or not result.get("success") or result is old_data:
+            return
+        if old_data is None or result.get("data") != old_data.get("data"):
+            self.notify_changed(cache_type)
+
     # ============= MÉTODOS CON INVALIDACIÓN AUTOMÁTICA =============
     def post(
         self,
@@ -437,11 +2140,11 @@ class APIClient(QObject):
         result = self._request("POST", endpoint, data=data, json=json)
 
         if result.get("success", False):
+            self._ingest_write("POST", endpoint, result)
             if invalidate_cache:
-                for cache_type in invalidate_cache:
-                    self.invalidate_cache_type(cache_type)
+                self.invalidate_entities("POST", endpoint, invalidate_cache)
             else:
-                self._auto_invalidate_from_endpoint(endpoint)
+                self._auto_invalidate_from_endpoint("POST", endpoint)
 
         return result
 
@@ -455,11 +2158,11 @@ class APIClient(QObject):
         result = self._request("PUT", endpoint, data=data, json=json)
 
         if result.get("success", False):
+            self._ingest_write("PUT", endpoint, result)
             if invalidate_cache:
-                for cache_type in invalidate_cache:
-                    self.invalidate_cache_type(cache_type)
+                self.invalidate_entities("PUT", endpoint, invalidate_cache)
             else:
-                self._auto_invalidate_from_endpoint(endpoint)
+                self._auto_invalidate_from_endpoint("PUT", endpoint)
 
         return result
 
@@ -473,11 +2176,11 @@ class APIClient(QObject):
         result = self._request("PATCH", endpoint, data=data, json=json)
 
         if result.get("success", False):
+            self._ingest_write("PATCH", endpoint, result)
             if invalidate_cache:
-                for cache_type in invalidate_cache:
-                    self.invalidate_cache_type(cache_type)
+                self.invalidate_entities("PATCH", endpoint, invalidate_cache)
             else:
-                self._auto_invalidate_from_endpoint(endpoint)
+                self._auto_invalidate_from_endpoint("PATCH", endpoint)
 
         return result
 
@@ -486,54 +2189,93 @@ class APIClient(QObject):
 
         if result.get("success", False):
             if invalidate_cache:
-                for cache_type in invalidate_cache:
-                    self.invalidate_cache_type(cache_type)
+                self.invalidate_entities("DELETE", endpoint, invalidate_cache)
             else:
-                self._auto_invalidate_from_endpoint(endpoint)
+                self._auto_invalidate_from_endpoint("DELETE", endpoint)
 
         return result
 
-    def _auto_invalidate_from_endpoint(self, endpoint: str):
+    def _auto_invalidate_from_endpoint(self, method: str, endpoint: str):
         """Inferir qué caché invalidar"""
         endpoint_lower = endpoint.lower()
 
         if "usuario" in endpoint_lower:
-            self.invalidate_cache_type("usuarios")
+            self.invalidate_entities(method, endpoint, ["usuarios"])
         elif "modulo" in endpoint_lower:
-            self.invalidate_cache_type("modulos")
+            self.invalidate_entities(method, endpoint, ["modulos"])
         elif "leccion" in endpoint_lower:
-            self.invalidate_cache_type("lecciones")
+            self.invalidate_entities(method, endpoint, ["lecciones"])
         elif "ejercicio" in endpoint_lower:
-            self.invalidate_cache_type("ejercicios")
+            self.invalidate_entities(method, endpoint, ["ejercicios"])
         elif "evaluacion" in endpoint_lower:
-            self.invalidate_cache_type("evaluaciones")
+            self.invalidate_entities(method, endpoint, ["evaluaciones"])
         elif "dashboard" in endpoint_lower:
-            self.invalidate_cache_type("dashboard")
+            self.invalidate_entities(method, endpoint, ["dashboard"])
 
     # ============= AUTENTICACIÓN =============
     def set_token(self, token: str, refresh_token: Optional[str] = None):
         self.token = token
         self.refresh_token = refresh_token
+        self._token_exp = jwt_expiry(token) if token else None
+        self._token_changed.emit()
+
+    def _token_expiring(self) -> bool:
+        return (
+            self._token_exp is not None
+            and self.refresh_token is not None
+            and time.time() >= self._token_exp - 5
+            and time.time() >= self._refresh_backoff_until
+        )
 
-    def _refresh_token(self) -> bool:
-        if not self.refresh_token:
+    def _refresh_token(self, stale_token: Optional[str] = None) -> bool:
+        """
+        Renovar el token de acceso (single-flight).
+
+        Los hilos que recibieron un 401 con el mismo token esperan a la
+        renovación en curso; si al entrar el token ya cambió, otro hilo lo
+        renovó y basta con repetir la petición.
+        """
+        with self._refresh_lock:
+            if stale_token is not None and self.token != stale_token:
+                return self.token is not None
+            if not self.refresh_token:
+                return False
+            try:
+                r = self.session.post(
+                    f"{self.base_url}/refresh",
+                    json={"refresh_token": self.refresh_token},
+                    timeout=self.timeout,
+                )
+                if r.status_code == 200:
+                    body = r.json()
+                    data = body.get("data", body) if isinstance(body, dict) else {}
+                    token = data.get("access_token") or data.get("token")
+                    if token:
+                        self.token = token
+                        self._token_exp = jwt_expiry(token)
+                        if data.get("refresh_token"):
+                            self.refresh_token = data.get("refresh_token")
+                        self.token_refreshed.emit()
+                        self._token_changed.emit()
+                        return True
+            except Exception as e:
+                logger.error(f"Error renovando token: {e}")
+            self._refresh_backoff_until = time.time() + 15
             return False
-        try:
-            r = requests.post(
-                f"{self.base_url}/refresh",
-                json={"refresh_token": self.refresh_token},
-                timeout=2,
+
+    def _schedule_token_renewal(self):
+        """Programar la renovación token_renew_margin segundos antes de exp"""
+        self.renew_timer.stop()
+        if not self.token or not self.refresh_token or self._token_exp is None:
+            return
+        delay = max(0.0, self._token_exp - time.time() - self.token_renew_margin)
+        self.renew_timer.start(int(min(delay, 86400) * 1000))
+
+    def _renew_token_in_background(self):
+        if self.token and self.refresh_token:
+            self.submit_async(
+                self._refresh_token, self.token, priority=Priority.INTERACTIVE
             )
-            if r.status_code == 200:
-                data = r.json()
-                self.token = data.get("access_token")
-                if data.get("refresh_token"):
-                    self.refresh_token = data.get("refresh_token")
-                self.token_refreshed.emit()
-                return True
-            return False
-        except:
-            return False
 
     # ============= PRE-CARGA INMEDIATA =============
     def preload_cache(self):
@@ -541,12 +2283,33 @@ class APIClient(QObject):
         if self.preloaded:
             return
 
-        # Cargar solo los datos más importantes
-        self.get_async("/admin/dashboard", lambda x: None, cache_type="dashboard")
-        self.get_async("/admin/modulos", lambda x: None, cache_type="modulos")
+        # Cargar solo los datos más importantes; si vinieron de disco se
+        # revalidan en segundo plano
+        for endpoint, cache_type in (
+            ("/admin/dashboard", "dashboard"),
+            ("/admin/modulos", "modulos"),
+        ):
+            key = self._get_cache_key(endpoint)
+            self.get_async(
+                endpoint,
+                lambda result, k=key, t=cache_type: self._on_preload_loaded(
+                    result, k, t
+                ),
+                cache_type=cache_type,
+                force_refresh=key in self._warm_entries,
+                priority=Priority.PREFETCH,
+            )
 
         self.preloaded = True
 
+    def _on_preload_loaded(self, result, key: str, cache_type: str):
+        """Notificar si la respuesta fresca difiere de la servida desde disco"""
+        warm = self._warm_entries.pop(key, None)
+        if warm is None or not result or not result.get("success"):
+            return
+        if result.get("data") != warm.get("data"):
+            self.notify_changed(cache_type)
+
     # ============= LOGIN/LOGOUT =============
     @retry_on_failure()
     def login(self, email: str, password: str) -> Dict[str, Any]:
@@ -562,8 +2325,14 @@ class APIClient(QObject):
                 if self.user.get("rol") != "administrador":
                     return {"success": False, "error": "Acceso denegado"}
 
-                # Pre-carga inmediata sin timer
+                # El tráfico real mantiene ya vivas las conexiones
+                self._logged_in.emit()
+
+                # Arranque en caliente desde disco y revalidación en segundo plano
+                self._open_disk_cache()
+                self._warm_from_disk()
                 self.preload_cache()
+                self._open_write_queue()
             else:
                 return {"success": False, "error": "No token"}
 
@@ -571,13 +2340,185 @@ class APIClient(QObject):
 
     def logout(self) -> Dict[str, Any]:
         result = self.post("/logout")
+        self.renew_timer.stop()
         self.token = None
         self.refresh_token = None
+        self._token_exp = None
         self.user = None
-        self.cache.clear()
+        # La caché en disco y las escrituras pendientes se conservan para
+        # la próxima sesión del mismo usuario
+        self._reset_memory_cache()
+        self._close_disk_cache()
+        self.replay_timer.stop()
+        self.write_queue = None
+        self.pending_writes_changed.emit()
+        with self._sync_lock:
+            self._sync_states.clear()
         self.preloaded = False
         return result
 
+    def shutdown(self):
+        """Liberar hilos y vaciar escrituras pendientes al cerrar la aplicación"""
+        self.sweep_timer.stop()
+        self.probe_timer.stop()
+        self.renew_timer.stop()
+        self.replay_timer.stop()
+        self.keepalive_timer.stop()
+        self.executor.shutdown(wait=False)
+        self._close_disk_cache()
+
+    # ============= ESCRITURAS SIN CONEXIÓN =============
+    def _open_write_queue(self):
+        """Abrir el diario de escrituras del backend y usuario actuales"""
+        if not self.user:
+            return
+        namespace = f"{self.base_url}|{self.user.get('id')}"
+        try:
+            self.write_queue = WriteJournal(default_cache_dir(), namespace)
+        except OSError as e:
+            logger.error(f"Diario de escrituras no disponible: {e}")
+            self.write_queue = None
+            return
+        self.pending_writes_changed.emit()
+        if self.write_queue.has_pending():
+            self._schedule_write_replay()
+
+    def queued_write(
+        self,
+        method: str,
+        endpoint: str,
+        json: Dict = None,
+        invalidate_cache: list = None,
+        label: str = "",
+    ) -> Dict[str, Any]:
+        """
+        Mutación que sobrevive a cortes de red.
+
+        Se envía con una clave de idempotencia. Solo se guarda en el diario
+        cuando es seguro que no salió (conexión rechazada, disyuntor abierto
+        o tiempo agotado al conectar) y entonces se reenvía en orden al
+        reconectar. Un corte o un tiempo agotado esperando la respuesta se
+        devuelven como error: el servidor pudo haberla aplicado y no hay
+        garantía de que respete la clave al repetirla. Mientras haya algo en
+        cola, lo nuevo se encola detrás. El resultado encolado lleva
+        "queued": True.
+        """
+        key = str(uuid.uuid4())
+        journal = self.write_queue
+        if journal is not None and journal.has_pending():
+            return self._enqueue_write(
+                key, method, endpoint, json, invalidate_cache, label
+            )
+
+        result = self._request(
+            method, endpoint, json=json, headers={"Idempotency-Key": key}
+        )
+        if result.get("success"):
+            self._ingest_write(method, endpoint, result)
+            self._invalidate_write(method, endpoint, invalidate_cache)
+        elif journal is not None and result.get("not_sent"):
+            return self._enqueue_write(
+                key, method, endpoint, json, invalidate_cache, label
+            )
+        elif result.get("network_error"):
+            result["error"] = (
+                f"{result['error']}: no se sabe si el cambio se aplicó, "
+                "compruébalo antes de repetirlo"
+            )
+        return result
+
+    def _enqueue_write(
+        self, key, method, endpoint, json, invalidate_cache, label
+    ) -> Dict[str, Any]:
+        try:
+            self.write_queue.enqueue(
+                method, endpoint, json, invalidate_cache or [], label, key=key
+            )
+        except OSError as e:
+            logger.error(f"No se pudo guardar la escritura pendiente: {e}")
+            return {"success": False, "error": "Error de conexión"}
+        logger.info(f"Escritura encolada sin conexión: {method} {endpoint}")
+        self.pending_writes_changed.emit()
+        self._replay_requested.emit()
+        return {
+            "success": False,
+            "queued": True,
+            "write_key": key,
+            "error": "Sin conexión: el cambio se guardó y se enviará al reconectar",
+        }
+
+    def _invalidate_write(self, method: str, endpoint: str, cache_types: list):
+        if cache_types:
+            self.invalidate_entities(method, endpoint, cache_types)
+        else:
+            self._auto_invalidate_from_endpoint(method, endpoint)
+
+    def _schedule_write_replay(self):
+        if self.write_queue is not None and self.write_queue.has_pending():
+            self.submit_async(self.replay_writes, priority=Priority.BACKGROUND)
+
+    def replay_writes(self) -> Dict[str, Any]:
+        """
+        Reenviar en orden las escrituras encoladas (llamar desde un worker).
+
+        Se detiene en el primer envío que no sale para no alterar el orden;
+        un rechazo del servidor, o un fallo con la petición ya enviada, marca
+        la escritura como fallida y sigue.
+        """
+        journal = self.write_queue
+        if journal is None or not self._replay_lock.acquire(blocking=False):
+            return {"success": True, "sent": 0, "failed": 0}
+        sent, failed = [], 0
+        try:
+            for entry in journal.pending():
+                result = self._request(
+                    entry["method"],
+                    entry["endpoint"],
+                    json=entry.get("json"),
+                    headers={"Idempotency-Key": entry["key"]},
+                )
+                if result.get("not_sent"):
+                    self._replay_requested.emit()
+                    break
+                if result.get("network_error"):
+                    # Pudo llegar al servidor: que lo decida el usuario
+                    # (reintentar o descartar) en vez de reenviarla a ciegas
+                    result["error"] = f"{result['error']}: estado desconocido"
+                if result.get("success"):
+                    journal.mark_done(entry["key"])
+                    self._ingest_write(entry["method"], entry["endpoint"], result)
+                    sent.append(entry)
+                else:
+                    journal.mark_failed(entry["key"], result.get("error", "Error"))
+                    failed += 1
+                self.pending_writes_changed.emit()
+        finally:
+            self._replay_lock.release()
+
+        for entry in sent:
+            self._invalidate_write(
+                entry["method"], entry["endpoint"], entry.get("cache_types")
+            )
+        if sent:
+            logger.info(f"{len(sent)} escrituras pendientes enviadas")
+        return {"success": failed == 0, "sent": len(sent), "failed": failed}
+
+    def pending_writes(self) -> List[Dict[str, Any]]:
+        """Escrituras en cola (status "pending") o rechazadas ("failed")"""
+        return self.write_queue.entries() if self.write_queue else []
+
+    def retry_write(self, key: str):
+        """Volver a poner en cola una escritura rechazada"""
+        if self.write_queue:
+            self.write_queue.retry(key)
+            self.pending_writes_changed.emit()
+            self._schedule_write_replay()
+
+    def discard_write(self, key: str):
+        if self.write_queue:
+            self.write_queue.discard(key)
+            self.pending_writes_changed.emit()
+
     # ============= MÉTODOS DE PAGINACIÓN =============
     def get_paginated(
         self,
@@ -590,6 +2531,330 @@ class APIClient(QObject):
         params.update({"page": page, "per_page": per_page})
         return self.get(endpoint, params=params, cache_type=cache_type)
 
+    def iter_pages(
+        self,
+        endpoint: str,
+        params: Dict = None,
+        per_page: int = 100,
+        cache_type: str = None,
+        force_refresh: bool = False,
+        prefetch: int = 2,
+        token: CancellationToken = None,
+    ):
+        """
+        Recorrer un listado paginado página a página.
+
+        Lee la metadata (meta.last_page o los campos del paginador) y,
+        mientras se consume la página N, las `prefetch` siguientes ya se
+        descargan en el planificador. Sin metadata sigue pidiendo mientras
+        las páginas lleguen llenas. Cada elemento es un resultado con
+        data = filas de la página; si una página falla se produce su error
+        y la iteración termina.
+        """
+        base = dict(params or {})
+
+        def fetch(page):
+            return self.get(
+                endpoint,
+                params={**base, "page": page, "per_page": per_page},
+                cache_type=cache_type,
+                force_refresh=force_refresh,
+            )
+
+        pending: Dict[int, RequestFuture] = {}
+        page, last_page = 1, None
+        try:
+            result = fetch(page)
+            while not (token is not None and token.cancelled):
+                if not result.get("success"):
+                    yield result
+                    return
+
+                rows, meta = split_page(result)
+                if meta.get("last_page"):
+                    last_page = int(meta["last_page"])
+                if last_page is not None:
+                    has_next, limit = page < last_page, last_page
+                else:
+                    has_next, limit = len(rows) >= per_page, page + 1
+
+                # Encolar las siguientes antes de ceder la página actual
+                if has_next:
+                    for n in range(page + 1, min(page + prefetch, limit) + 1):
+                        if n not in pending:
+                            pending[n] = self.executor.submit(
+                                fetch, n, priority=Priority.PREFETCH, token=token
+                            )
+
+                yield {
+                    "success": True,
+                    "data": rows,
+                    "meta": {**meta, "current_page": page},
+                    "status_code": result.get("status_code"),
+                }
+                if not has_next or (token is not None and token.cancelled):
+                    return
+                page += 1
+                result = self._await_page(pending.pop(page), fetch, page)
+        finally:
+            for handle in pending.values():
+                handle.cancel()
+
+    @staticmethod
+    def _await_page(handle: RequestFuture, fetch: Callable, page: int):
+        """Esperar una página precargada; si seguía en cola, pedirla aquí"""
+        if handle.cancel():
+            return fetch(page)
+        result = handle.result()
+        if result.get("cancelled"):
+            return fetch(page)
+        return result
+
+    def get_all_pages(
+        self,
+        endpoint: str,
+        params: Dict = None,
+        per_page: int = 100,
+        cache_type: str = None,
+        force_refresh: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Todas las filas de un listado paginado en un único resultado.
+
+        Bloquea hasta la última página: solo desde un worker (submit_async).
+        Para ir pintando en la GUI según llegan, stream_pages().
+        """
+        if threading.current_thread() is threading.main_thread():
+            logger.error(f"get_all_pages({endpoint}) llamado en el hilo de la GUI")
+            return {
+                "success": False,
+                "error": "Listado completo pedido desde el hilo de la GUI",
+            }
+        rows = []
+        for page in self.iter_pages(
+            endpoint, params, per_page, cache_type, force_refresh
+        ):
+            if not page["success"]:
+                return page
+            rows.extend(page["data"])
+        return {"success": True, "data": rows, "meta": {"total": len(rows)}}
+
+    def stream_pages(
+        self,
+        endpoint: str,
+        on_page: Callable,
+        on_done: Callable = None,
+        params: Dict = None,
+        per_page: int = 100,
+        cache_type: str = None,
+        force_refresh: bool = False,
+        priority: int = Priority.VISIBLE,
+        token: CancellationToken = None,
+        seed: bool = False,
+    ) -> RequestFuture:
+        """
+        iter_pages en un worker: on_page recibe cada página en el hilo de la
+        GUI en cuanto llega y on_done el resultado final ({"success": True,
+        "total": n} o el error). Con seed, la colección descargada queda
+        como base de sync_collection. Devuelve un RequestFuture cancelable.
+        """
+        stream = RequestFuture(priority, token)
+
+        def run():
+            stream.started = True
+            if stream.is_cancelled():
+                stream._finish(cancelled_result())
+                return
+            final = {"success": True, "total": 0}
+            rows = []
+            pages = self.iter_pages(
+                endpoint, params, per_page, cache_type, force_refresh, token=token
+            )
+            try:
+                for page in pages:
+                    if stream.is_cancelled():
+                        final = cancelled_result()
+                        break
+                    if not page["success"]:
+                        final = page
+                        break
+                    final["total"] += len(page["data"])
+                    if seed:
+                        rows.extend(page["data"])
+                    self.executor.deliver(stream, on_page, page)
+            finally:
+                pages.close()
+            if seed and final["success"]:
+                self.seed_collection(endpoint, cache_type, rows, paginated=True)
+            stream._finish(final)
+            if on_done is not None:
+                self.executor.deliver(stream, on_done, final)
+
+        self.executor.submit(run, priority=priority)
+        return stream
+
+    # ============= SINCRONIZACIÓN INCREMENTAL =============
+    def sync_collection(
+        self,
+        endpoint: str,
+        cache_type: str,
+        paginated: bool = False,
+        force_full: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Traer solo lo que cambió en una colección desde la última vez.
+
+        Guarda por endpoint las filas por id y la marca de agua (el
+        updated_at más reciente, o meta.sync_cursor si el servidor lo da) y
+        pide GET endpoint?updated_since=<marca>. Las bajas llegan en
+        meta.deleted o como filas con deleted_at. Si el servidor ignora el
+        parámetro, la respuesta completa se compara en local y las
+        siguientes sincronizaciones usan esa vía. Cada full_resync_interval
+        segundos se hace una carga completa para reconciliar bajas.
+
+        Returns:
+            Resultado con data = colección completa ya fusionada y
+            changes = {"updated": ids, "deleted": ids, "mode": ...}
+        """
+        state = self._sync_state(endpoint, cache_type, paginated)
+        with state.lock:
+            generation = self._cache_generation
+            full = (
+                force_full
+                or state.cursor is None
+                or state.server_delta is False
+                or time.time() - state.last_full > self.full_resync_interval
+            )
+            if full:
+                # La primera vez puede servirse de la caché; después, GET
+                # condicional para que un 304 no descargue nada
+                refresh = force_full or state.cursor is not None
+                result = self._full_sync(state, force_refresh=refresh)
+            else:
+                result = self._delta_sync(state)
+            if not result.get("success"):
+                return result
+
+            rows = list(state.rows.values())
+            self._ingest(endpoint, None, {"success": True, "data": rows})
+            if (
+                result["changes"]["mode"] == "delta"
+                and not paginated
+                and generation == self._cache_generation
+            ):
+                # La colección fusionada es la que verán los get_* siguientes
+                # (las cargas completas ya quedaron en caché con sus validadores)
+                self._save_to_cache(
+                    self._get_cache_key(endpoint),
+                    {"success": True, "data": rows, "status_code": 200},
+                    cache_type,
+                    endpoint,
+                )
+            return {"success": True, "data": rows, "changes": result["changes"]}
+
+    def _sync_state(self, endpoint: str, cache_type: str, paginated: bool) -> SyncState:
+        with self._sync_lock:
+            state = self._sync_states.get(endpoint)
+            if state is None:
+                state = SyncState(endpoint, cache_type, paginated)
+                self._sync_states[endpoint] = state
+            return state
+
+    def seed_collection(
+        self, endpoint: str, cache_type: str, rows: List[Dict], paginated: bool = False
+    ):
+        """Registrar una colección ya descargada como punto de partida"""
+        state = self._sync_state(endpoint, cache_type, paginated)
+        with state.lock:
+            state.replace(rows)
+
+    def _full_sync(self, state: SyncState, force_refresh: bool) -> Dict[str, Any]:
+        if state.paginated:
+            result = self.get_all_pages(
+                state.endpoint,
+                cache_type=state.cache_type,
+                force_refresh=force_refresh,
+            )
+        else:
+            result = self.get(
+                state.endpoint,
+                cache_type=state.cache_type,
+                force_refresh=force_refresh,
+            )
+        if not result.get("success"):
+            return result
+        rows, meta = split_page(result)
+        changes = state.replace(rows)
+        state.cursor = meta.get("sync_cursor") or state.cursor
+        changes["mode"] = "full" if state.server_delta is not False else "local"
+        return {"success": True, "changes": changes}
+
+    def _delta_sync(self, state: SyncState) -> Dict[str, Any]:
+        params = {"updated_since": state.cursor}
+        if state.paginated:
+            rows, meta = [], {}
+            for page in self.iter_pages(
+                state.endpoint, params, per_page=self.delta_page_size
+            ):
+                if not page["success"]:
+                    result = page
+                    break
+                rows.extend(page["data"])
+                meta = page["meta"]
+            else:
+                result = {"success": True}
+        else:
+            result = self.get(state.endpoint, params=params)
+            if result.get("success"):
+                rows, meta = split_page(result)
+        if not result.get("success"):
+            if result.get("status_code") in (400, 422):
+                # Parámetro no admitido: comparar en local desde ahora
+                state.server_delta = False
+                return self._full_sync(state, force_refresh=True)
+            return result
+
+        # Una fila antigua que además cambió es un desfase de relojes, no un
+        # servidor que ignora el filtro; solo los reenvíos idénticos anteriores
+        # a la marca indican que lo recibido es la colección completa
+        diff = state.diff(rows)
+        if diff["stale"]:
+            state.server_delta = False
+            changes = state.replace(rows)
+            changes["mode"] = "local"
+            return {"success": True, "changes": changes}
+
+        state.server_delta = True
+        cursor = max_cursor(rows, state.cursor)
+        changes = state.merge(
+            diff["changed"], meta.get("deleted") or meta.get("deleted_ids") or []
+        )
+        state.cursor = meta.get("sync_cursor") or cursor
+        changes["mode"] = "delta"
+        return {"success": True, "changes": changes}
+
+    def _forget_synced_row(self, endpoint: str, row_id):
+        """Quitar de la colección sincronizada una fila borrada desde aquí"""
+        collection = endpoint.split("?", 1)[0].rstrip("/").rsplit("/", 1)[0]
+        with self._sync_lock:
+            state = self._sync_states.get(collection)
+        if state is not None:
+            with state.lock:
+                state.rows.pop(row_id, None)
+
+    def sync_modulos(self, force_full: bool = False) -> Dict[str, Any]:
+        return self.sync_collection("/admin/modulos", "modulos", force_full=force_full)
+
+    def sync_lecciones(self, modulo_id: int, force_full: bool = False) -> Dict[str, Any]:
+        return self.sync_collection(
+            f"/admin/modulos/{modulo_id}/lecciones", "lecciones", force_full=force_full
+        )
+
+    def sync_usuarios(self, force_full: bool = False) -> Dict[str, Any]:
+        return self.sync_collection(
+            "/admin/usuarios", "usuarios", paginated=True, force_full=force_full
+        )
+
     # ============= DASHBOARD =============
     def get_dashboard_stats(self, force_refresh: bool = False) -> Dict[str, Any]:
         return self.get(
@@ -612,8 +2877,22 @@ class APIClient(QObject):
 
     # ============= USUARIOS =============
     def get_usuarios(
-        self, page: int = 1, per_page: int = 100, force_refresh: bool = False
+        self, page: int = None, per_page: int = 100, force_refresh: bool = False
     ) -> Dict[str, Any]:
+        """
+        Una página concreta, o todas si no se indica page.
+
+        Sin page se recorren todas las páginas con get_all_pages(), que se
+        niega a bloquear el hilo de la GUI: pedirlo con submit_async, o usar
+        stream_pages() para pintar cada página al llegar.
+        """
+        if page is None:
+            return self.get_all_pages(
+                "/admin/usuarios",
+                per_page=per_page,
+                cache_type="usuarios",
+                force_refresh=force_refresh,
+            )
         params = {"page": page, "per_page": per_page}
         return self.get(
             "/admin/usuarios",
@@ -622,22 +2901,58 @@ class APIClient(QObject):
             force_refresh=force_refresh,
         )
 
-    def get_avatars(self) -> Dict[str, Any]:
-        """Obtener avatares con caché de 1 hora"""
-        now = time.time()
-        if (
-            self.avatars_cache
-            and (now - self.avatars_cache_time) < self.avatars_timeout
-        ):
-            return self.avatars_cache
+    def search_usuarios(
+        self,
+        search: str = None,
+        rol: str = None,
+        page: int = 1,
+        per_page: int = 100,
+        force_refresh: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Búsqueda y filtro de usuarios en el servidor.
 
-        result = self.get("/admin/usuarios/avatars", cache_type="usuarios")
+        Cada página de cada consulta se guarda como usuarios_busqueda, un
+        LRU pequeño que se invalida junto con los usuarios.
+        """
+        params = {"page": page, "per_page": per_page}
+        search = (search or "").strip().lower()
+        if search:
+            params["search"] = search
+        if rol:
+            params["rol"] = rol
+        return self.get(
+            "/admin/usuarios",
+            params=params,
+            cache_type="usuarios_busqueda",
+            force_refresh=force_refresh,
+        )
 
-        if result.get("success"):
-            self.avatars_cache = result
-            self.avatars_cache_time = now
+    def stream_usuarios(
+        self,
+        on_page: Callable,
+        on_done: Callable = None,
+        force_refresh: bool = False,
+        token: CancellationToken = None,
+    ) -> RequestFuture:
+        """Todos los usuarios, entregados página a página según llegan"""
+        return self.stream_pages(
+            "/admin/usuarios",
+            on_page,
+            on_done,
+            cache_type="usuarios",
+            force_refresh=force_refresh,
+            token=token,
+            seed=True,
+        )
 
-        return result
+    def get_avatars(self, force_refresh: bool = False) -> Dict[str, Any]:
+        """Obtener avatares con caché de 1 hora (persistida en disco)"""
+        return self.get(
+            "/admin/usuarios/avatars",
+            cache_type="avatars",
+            force_refresh=force_refresh,
+        )
 
     def create_usuario(self, data: Dict) -> Dict[str, Any]:
         """Crear usuario - ULTRA RÁPIDO"""
@@ -696,6 +3011,36 @@ class APIClient(QObject):
             f"/admin/usuarios/{usuario_id}", invalidate_cache=["usuarios"]
         )
 
+    def bulk_toggle_usuarios(self, usuario_ids: List[int], **kwargs) -> RequestFuture:
+        """Cambiar el estado de varios usuarios (ver bulk_mutate)"""
+        return self.bulk_mutate(
+            [
+                {
+                    "id": usuario_id,
+                    "method": "PATCH",
+                    "endpoint": f"/admin/usuarios/{usuario_id}/toggle-status",
+                }
+                for usuario_id in usuario_ids
+            ],
+            ["usuarios"],
+            **kwargs,
+        )
+
+    def bulk_delete_usuarios(self, usuario_ids: List[int], **kwargs) -> RequestFuture:
+        """Eliminar varios usuarios (ver bulk_mutate)"""
+        return self.bulk_mutate(
+            [
+                {
+                    "id": usuario_id,
+                    "method": "DELETE",
+                    "endpoint": f"/admin/usuarios/{usuario_id}",
+                }
+                for usuario_id in usuario_ids
+            ],
+            ["usuarios"],
+            **kwargs,
+        )
+
     def toggle_usuario_status(self, usuario_id: int) -> Dict[str, Any]:
         """Cambiar estado de usuario"""
         return self.patch(
@@ -823,25 +3168,30 @@ class APIClient(QObject):
         if "created_by" not in api_data and self.user:
             api_data["created_by"] = self.user.get("id")
 
-        return self.post(
+        # El listado de módulos incluye total_lecciones y duración
+        return self.queued_write(
+            "POST",
             f"/admin/modulos/{modulo_id}/lecciones",
             json=api_data,
-            invalidate_cache=["lecciones"],
+            invalidate_cache=["lecciones", "modulos"],
+            label=f"Nueva lección «{data.get('titulo')}»",
         )
 
     def update_leccion(
         self, modulo_id: int, leccion_id: int, data: Dict
     ) -> Dict[str, Any]:
-        return self.put(
+        return self.queued_write(
+            "PUT",
             f"/admin/modulos/{modulo_id}/lecciones/{leccion_id}",
             json=data,
-            invalidate_cache=["lecciones"],
+            invalidate_cache=["lecciones", "modulos"],
+            label=f"Lección «{data.get('titulo', leccion_id)}»",
         )
 
     def delete_leccion(self, modulo_id: int, leccion_id: int) -> Dict[str, Any]:
         return self.delete(
             f"/admin/modulos/{modulo_id}/lecciones/{leccion_id}",
-            invalidate_cache=["lecciones"],
+            invalidate_cache=["lecciones", "modulos"],
         )
 
     def reorder_lecciones(self, modulo_id: int, lecciones: list) -> Dict[str, Any]:
@@ -948,20 +3298,6 @@ class APIClient(QObject):
             invalidate_cache=["evaluaciones"],
         )
 
-    def invalidate_cache_type(self, cache_type: str):
-        """Invalidar caché de evaluaciones"""
-        keys_to_delete = []
-        for key in list(self.cache.keys()):
-            if "evaluaciones" in key.lower():
-                keys_to_delete.append(key)
-
-        for key in keys_to_delete:
-            del self.cache[key]
-
-        # Notificar cambios
-        self.evaluaciones_changed.emit()
-        self.data_changed.emit("evaluaciones")
-
     def create_pregunta(
         self, modulo_id: int, evaluacion_id: int, data: Dict
     ) -> Dict[str, Any]:
@@ -973,10 +3309,12 @@ class APIClient(QObject):
         if "created_by" not in api_data and self.user:
             api_data["created_by"] = self.user.get("id")
 
-        return self.post(
+        return self.queued_write(
+            "POST",
             f"/admin/modulos/{modulo_id}/evaluacion/{evaluacion_id}/preguntas",
             json=api_data,
             invalidate_cache=["evaluaciones"],
+            label=f"Nueva pregunta «{data.get('pregunta', '')[:40]}»",
         )
 
     def update_pregunta(
@@ -0,0 +1,58 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Disyuntor de un host.
+
+    Tras failure_threshold fallos de conexión seguidos se abre y las
+    peticiones fallan al instante durante cooldown segundos. Después deja
+    pasar una única petición de prueba: si conecta se cierra, si no vuelve
+    a abrirse otro periodo completo.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 15.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """¿Puede salir esta petición? En HALF_OPEN solo pasa la sonda"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            # Una sonda por periodo; si se perdió sin resultado, otra al siguiente
+            if time.time() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self.opened_at = time.time()
+                return True
+            return False
+
+    def record_success(self) -> bool:
+        """Registrar una conexión correcta; True si el host vuelve a estar en línea"""
+        with self._lock:
+            recovered = self.state != self.CLOSED
+            self.state = self.CLOSED
+            self.failures = 0
+            return recovered
+
+    def record_failure(self) -> bool:
+        """Registrar un fallo de conexión; True si el disyuntor acaba de abrirse"""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                tripped = self.state == self.CLOSED
+                self.state = self.OPEN
+                self.opened_at = time.time()
+                return tripped
+            return False
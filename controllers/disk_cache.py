@@ -0,0 +1,256 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List
+
+from controllers import json_codec
+
+logger = logging.getLogger(__name__)
+
+# Subir este número invalida todo lo guardado con un formato anterior
+DISK_CACHE_SCHEMA_VERSION = 2
+
+
+def default_cache_dir() -> str:
+    """Directorio de la caché persistente (configurable con VARCHATE_CACHE_DIR)"""
+    return os.getenv("VARCHATE_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".varchate_admin"
+    )
+
+
+class DiskCache:
+    """
+    Caché persistente de respuestas GET en SQLite.
+
+    Cada fila pertenece a un namespace (URL del backend + usuario), guarda las
+    mismas etiquetas que la caché en memoria para poder invalidarse igual, y
+    caduca por su propio TTL. Las escrituras se serializan en un hilo propio
+    para que ni json.dumps ni el disco toquen el hilo de la GUI.
+    """
+
+    def __init__(self, path: str, namespace: str):
+        self.path = path
+        self.namespace = namespace
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="disk-cache-writer", daemon=True
+        )
+        self._writer.start()
+
+    # ============= ESQUEMA =============
+    def _migrate(self):
+        """Recrear las tablas si el esquema guardado no coincide"""
+        with self._lock:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == DISK_CACHE_SCHEMA_VERSION:
+                return
+            self._conn.executescript(
+                """
+                DROP TABLE IF EXISTS responses;
+                DROP TABLE IF EXISTS response_tags;
+                CREATE TABLE responses (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    cache_type TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    ttl REAL NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    PRIMARY KEY (namespace, key)
+                );
+                CREATE TABLE response_tags (
+                    namespace TEXT NOT NULL,
+                    tag TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    PRIMARY KEY (namespace, tag, key)
+                );
+                CREATE INDEX idx_response_tags_key ON response_tags (namespace, key);
+                """
+            )
+            self._conn.execute(f"PRAGMA user_version = {DISK_CACHE_SCHEMA_VERSION}")
+            self._conn.commit()
+
+    # ============= LECTURA =============
+    def load(self, cache_types: Iterable[str]) -> List[Dict[str, Any]]:
+        """Cargar las entradas vigentes del namespace para los tipos dados"""
+        cache_types = list(cache_types)
+        if not cache_types:
+            return []
+
+        now = time.time()
+        placeholders = ",".join("?" for _ in cache_types)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT key, cache_type, payload, stored_at, etag, last_modified
+                FROM responses
+                WHERE namespace = ? AND cache_type IN ({placeholders})
+                  AND stored_at + ttl > ?
+                """,
+                [self.namespace, *cache_types, now],
+            ).fetchall()
+
+        entries = []
+        for key, cache_type, payload, stored_at, etag, last_modified in rows:
+            try:
+                data = json_codec.loads(payload)
+            except ValueError:
+                continue
+            entries.append(
+                {
+                    "key": key,
+                    "cache_type": cache_type,
+                    "data": data,
+                    "stored_at": stored_at,
+                    "validators": {"etag": etag, "last_modified": last_modified},
+                }
+            )
+        return entries
+
+    # ============= ESCRITURA (en segundo plano) =============
+    def put(
+        self,
+        key: str,
+        cache_type: str,
+        data: Any,
+        ttl: float,
+        tags=(),
+        validators: Dict[str, str] = None,
+    ):
+        self._queue.put(
+            ("put", key, cache_type, data, ttl, tuple(tags), validators or {})
+        )
+
+    def touch(self, key: str):
+        """Reiniciar el TTL de una fila revalidada con un 304"""
+        self._queue.put(("touch", key))
+
+    def delete(self, key: str):
+        self._queue.put(("delete", key))
+
+    def delete_tags(self, tags):
+        self._queue.put(("delete_tags", tuple(tags)))
+
+    def clear(self):
+        self._queue.put(("clear",))
+
+    def close(self):
+        """Vaciar la cola de escrituras y cerrar la conexión"""
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+        with self._lock:
+            self._conn.close()
+
+    def _write_loop(self):
+        while True:
+            op = self._queue.get()
+            if op is None:
+                return
+            try:
+                with self._lock:
+                    self._apply(op)
+                    self._conn.commit()
+            except Exception as e:
+                logger.error(f"Error escribiendo caché en disco: {e}")
+
+    def _apply(self, op):
+        """Ejecutar una operación de la cola (llamar con el lock)"""
+        kind = op[0]
+        if kind == "put":
+            _, key, cache_type, data, ttl, tags, validators = op
+            payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+            self._conn.execute(
+                "DELETE FROM response_tags WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.namespace,
+                    key,
+                    cache_type,
+                    payload,
+                    time.time(),
+                    ttl,
+                    validators.get("etag"),
+                    validators.get("last_modified"),
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO response_tags VALUES (?, ?, ?)",
+                [(self.namespace, repr(tag), key) for tag in tags],
+            )
+        elif kind == "touch":
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ? WHERE namespace = ? AND key = ?",
+                (time.time(), self.namespace, op[1]),
+            )
+        elif kind == "delete":
+            self._delete_keys([op[1]])
+        elif kind == "delete_tags":
+            tags = [repr(tag) for tag in op[1]]
+            if not tags:
+                return
+            placeholders = ",".join("?" for _ in tags)
+            keys = [
+                row[0]
+                for row in self._conn.execute(
+                    f"""
+                    SELECT DISTINCT key FROM response_tags
+                    WHERE namespace = ? AND tag IN ({placeholders})
+                    """,
+                    [self.namespace, *tags],
+                )
+            ]
+            self._delete_keys(keys)
+        elif kind == "clear":
+            self._conn.execute(
+                "DELETE FROM responses WHERE namespace = ?", (self.namespace,)
+            )
+            self._conn.execute(
+                "DELETE FROM response_tags WHERE namespace = ?", (self.namespace,)
+            )
+
+    def _delete_keys(self, keys: List[str]):
+        for key in keys:
+            self._conn.execute(
+                "DELETE FROM responses WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            self._conn.execute(
+                "DELETE FROM response_tags WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+
+    def purge_expired(self):
+        """Eliminar filas caducadas de cualquier namespace"""
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                """
+                DELETE FROM response_tags WHERE key IN (
+                    SELECT key FROM responses
+                    WHERE stored_at + ttl <= ? AND namespace = response_tags.namespace
+                )
+                """,
+                (now,),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE stored_at + ttl <= ?", (now,)
+            )
+            self._conn.commit()
@@ -0,0 +1,142 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# Clave de un padre en los índices: ("modulo", 5); None para los listados raíz
+Parent = Optional[Tuple[str, Any]]
+
+
+class EntityStore(QObject):
+    """
+    Almacén normalizado de entidades compartido por todas las vistas.
+
+    Guarda cada entidad una sola vez en un dict por tipo e id, y los
+    listados como índices padre -> ids de hijos (modulo -> lecciones ->
+    ejercicios, modulo -> evaluacion -> preguntas). Las señales solo se
+    emiten para lo que de verdad cambió; al emitirse desde workers llegan
+    encoladas al hilo de la GUI.
+    """
+
+    # tipo, [ids] con datos nuevos o modificados
+    entities_changed = pyqtSignal(str, object)
+    # tipo, [ids] eliminados
+    entities_removed = pyqtSignal(str, object)
+    # padre (tipo, id) o None, tipo de los hijos
+    children_changed = pyqtSignal(object, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.RLock()
+        self._entities: Dict[str, Dict[Any, Dict]] = {}
+        self._children: Dict[Tuple[Parent, str], List[Any]] = {}
+
+    # ============= LECTURA =============
+    def get(self, kind: str, entity_id) -> Optional[Dict]:
+        """Buscar una entidad por id en O(1)"""
+        with self._lock:
+            return self._entities.get(kind, {}).get(entity_id)
+
+    def children(self, parent: Parent, kind: str) -> List[Dict]:
+        """Hijos de un padre en el orden del último listado recibido"""
+        with self._lock:
+            table = self._entities.get(kind, {})
+            ids = self._children.get((parent, kind), ())
+            return [table[i] for i in ids if i in table]
+
+    def listing(self, kind: str) -> List[Dict]:
+        """Listado raíz de un tipo (p. ej. todos los módulos)"""
+        return self.children(None, kind)
+
+    def has_children(self, parent: Parent, kind: str) -> bool:
+        with self._lock:
+            return (parent, kind) in self._children
+
+    # ============= ESCRITURA =============
+    def upsert(self, kind: str, rows: List[Dict]) -> List[Any]:
+        """Insertar o actualizar entidades; devuelve los ids que cambiaron"""
+        changed = []
+        with self._lock:
+            table = self._entities.setdefault(kind, {})
+            for row in rows:
+                entity_id = row.get("id") if isinstance(row, dict) else None
+                if entity_id is None:
+                    continue
+                if table.get(entity_id) != row:
+                    table[entity_id] = row
+                    changed.append(entity_id)
+        if changed:
+            self.entities_changed.emit(kind, changed)
+        return changed
+
+    def patch(self, kind: str, entity_id, fields: Dict) -> Optional[Dict]:
+        """Actualizar campos de una entidad; devuelve la versión anterior"""
+        with self._lock:
+            table = self._entities.setdefault(kind, {})
+            previous = table.get(entity_id)
+            table[entity_id] = {**(previous or {"id": entity_id}), **fields}
+        self.entities_changed.emit(kind, [entity_id])
+        return previous
+
+    def set_children(self, parent: Parent, kind: str, rows: List[Dict]):
+        """Sustituir el listado completo de hijos de un padre"""
+        self.upsert(kind, rows)
+        ids = [row.get("id") for row in rows if isinstance(row, dict)]
+        ids = [i for i in ids if i is not None]
+        with self._lock:
+            if self._children.get((parent, kind)) == ids:
+                return
+            self._children[(parent, kind)] = ids
+        self.children_changed.emit(parent, kind)
+
+    def add_child(self, parent: Parent, kind: str, row: Dict):
+        """Añadir una entidad al final de un listado ya conocido"""
+        self.upsert(kind, [row])
+        with self._lock:
+            ids = self._children.get((parent, kind))
+            if ids is None or row.get("id") in ids:
+                return
+            ids.append(row.get("id"))
+        self.children_changed.emit(parent, kind)
+
+    def remove(self, kind: str, entity_id) -> Optional[Tuple[Dict, List]]:
+        """
+        Eliminar una entidad, quitarla de los listados y olvidar sus hijos.
+
+        Devuelve la entidad y su posición en cada listado para poder
+        deshacerlo con restore(), o None si no estaba.
+        """
+        positions = []
+        with self._lock:
+            row = self._entities.get(kind, {}).pop(entity_id, None)
+            if row is None:
+                return None
+            for key, ids in self._children.items():
+                if key[1] == kind and entity_id in ids:
+                    positions.append((key, ids.index(entity_id)))
+                    ids.remove(entity_id)
+            for key in [k for k in self._children if k[0] == (kind, entity_id)]:
+                del self._children[key]
+        self.entities_removed.emit(kind, [entity_id])
+        for (parent, child_kind), _ in positions:
+            self.children_changed.emit(parent, child_kind)
+        return row, positions
+
+    def restore(self, kind: str, removed: Tuple[Dict, List]):
+        """Deshacer un remove() devolviendo la entidad a sus listados"""
+        row, positions = removed
+        self.upsert(kind, [row])
+        touched = []
+        with self._lock:
+            for key, index in positions:
+                ids = self._children.get(key)
+                if ids is not None and row["id"] not in ids:
+                    ids.insert(min(index, len(ids)), row["id"])
+                    touched.append(key)
+        for parent, child_kind in touched:
+            self.children_changed.emit(parent, child_kind)
+
+    def clear(self):
+        with self._lock:
+            self._entities.clear()
+            self._children.clear()
@@ -0,0 +1,287 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, Qt
+from PyQt5.QtGui import QImage, QPixmap, QPixmapCache
+
+from controllers.disk_cache import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+
+class ImageLoader(QObject):
+    """
+    Carga de imágenes remotas (avatares) fuera del hilo de la GUI.
+
+    Cada imagen se busca primero en QPixmapCache (ya escalada al tamaño
+    pedido), después en disco y solo por último se descarga con
+    fetch_url() del cliente, que reutiliza sus conexiones y respeta el
+    disyuntor del host. En el disco los bytes se guardan por el hash de su
+    contenido y cada URL apunta a su hash y a sus validadores, de modo que
+    dos URLs con la misma imagen ocupan un solo fichero y la caché
+    sobrevive a los reinicios. Pasado max_age la copia se revalida con
+    If-None-Match/If-Modified-Since, y si el disco supera max_disk_bytes se
+    borran las imágenes usadas hace más tiempo. Decodificar y escalar se hace en el
+    worker con QImage; en la GUI solo se convierte a QPixmap.
+
+    Como mucho max_parallel imágenes están en vuelo a la vez y varias
+    peticiones de la misma imagen comparten una sola descarga.
+    """
+
+    def __init__(self, api_client, max_parallel: int = None, directory: str = None):
+        super().__init__(api_client)
+        self.api_client = api_client
+        self.max_parallel = max_parallel or int(
+            os.getenv("API_IMAGE_CONCURRENCY", "4")
+        )
+        self.timeout = 10
+        self.directory = directory or os.path.join(default_cache_dir(), "images")
+        # Límite del disco (se desalojan las menos usadas) y cada cuánto
+        # se revalida una imagen guardada con ETag/Last-Modified
+        self.max_disk_bytes = int(os.getenv("API_IMAGE_DISK_MB", "100")) * 1024 * 1024
+        self.max_age = float(os.getenv("API_IMAGE_MAX_AGE", "86400"))
+        self._disk_bytes = None  # se calcula en la primera escritura
+        self._disk_lock = threading.Lock()
+        self._running = 0
+        self._queue = deque()
+        # clave -> [(callback, token)] a la espera de esa imagen
+        self._waiting: Dict[str, List[Tuple[Callable, object]]] = {}
+        self.stats = {
+            "memory": 0,
+            "disk": 0,
+            "revalidated": 0,
+            "network": 0,
+            "failed": 0,
+        }
+
+    @staticmethod
+    def cache_key(url: str, size: int) -> str:
+        return f"img:{size}:{url}"
+
+    # ============= API =============
+    def cached(self, url: str, size: int) -> Optional[QPixmap]:
+        """El pixmap ya escalado si está en memoria, sin cargar nada"""
+        pixmap = QPixmapCache.find(self.cache_key(url, size))
+        if pixmap is None or pixmap.isNull():
+            return None
+        return pixmap
+
+    def load(self, url: str, size: int, callback: Callable, token=None):
+        """
+        Pedir una imagen escalada a size x size (conservando proporción).
+
+        callback(pixmap) se llama en el hilo de la GUI solo si la imagen se
+        pudo cargar: al momento si ya está en memoria y, si no, cuando
+        llegue. Con el token cancelado no se llama.
+        """
+        pixmap = self.cached(url, size)
+        if pixmap is not None:
+            self.stats["memory"] += 1
+            callback(pixmap)
+            return
+        key = self.cache_key(url, size)
+        waiting = self._waiting.get(key)
+        if waiting is not None:
+            waiting.append((callback, token))
+            return
+        self._waiting[key] = [(callback, token)]
+        self._queue.append((key, url, size))
+        self._pump()
+
+    # ============= COLA =============
+    def _pump(self):
+        while self._running < self.max_parallel and self._queue:
+            key, url, size = self._queue.popleft()
+            waiting = self._waiting.get(key, [])
+            if all(token is not None and token.cancelled for _, token in waiting):
+                # Nadie la espera ya (p. ej. se cerró el diálogo)
+                self._waiting.pop(key, None)
+                continue
+            self._running += 1
+            self.api_client.submit_async(
+                self._fetch,
+                url,
+                size,
+                callback=lambda result, key=key: self._on_fetched(key, result),
+            )
+
+    def _on_fetched(self, key: str, result: Dict):
+        self._running -= 1
+        waiting = self._waiting.pop(key, [])
+        if result.get("success"):
+            pixmap = QPixmap.fromImage(result["data"])
+            QPixmapCache.insert(key, pixmap)
+            for callback, token in waiting:
+                if token is None or not token.cancelled:
+                    callback(pixmap)
+        else:
+            self.stats["failed"] += 1
+            logger.debug(f"No se pudo cargar la imagen {key}: {result.get('error')}")
+        self._pump()
+
+    # ============= WORKER =============
+    def _fetch(self, url: str, size: int) -> Dict:
+        """Leer de disco o descargar, decodificar y escalar (en un worker)"""
+        entry = self._read_pointer(url)
+        data = self._read_blob(entry["hash"]) if entry else None
+        if data is not None and time.time() - entry.get("checked_at", 0) < self.max_age:
+            image = QImage.fromData(data)
+            if not image.isNull():
+                self.stats["disk"] += 1
+                return self._scaled(image, size)
+
+        # Caducada o ausente: pedirla, condicional si hay bytes que validar
+        headers = {}
+        if data is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        result = self.api_client.fetch_url(url, headers=headers)
+
+        if not result["success"] or result["response"].status_code == 304:
+            if data is None:
+                if not result["success"]:
+                    return result
+                return {"success": False, "error": "HTTP 304 sin copia local"}
+            # Sin conexión se sirve la copia de disco aunque esté caducada
+            image = QImage.fromData(data)
+            if image.isNull():
+                return {"success": False, "error": "Formato de imagen no válido"}
+            if result["success"]:
+                self.stats["revalidated"] += 1
+                self._write_pointer(url, {**entry, "checked_at": time.time()})
+            else:
+                self.stats["disk"] += 1
+            return self._scaled(image, size)
+
+        response = result["response"]
+        if response.status_code != 200:
+            return {"success": False, "error": f"HTTP {response.status_code}"}
+        image = QImage.fromData(response.content)
+        if image.isNull():
+            return {"success": False, "error": "Formato de imagen no válido"}
+        self.stats["network"] += 1
+        self._write_disk(url, response.content, response.headers)
+        return self._scaled(image, size)
+
+    @staticmethod
+    def _scaled(image: QImage, size: int) -> Dict:
+        image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return {"success": True, "data": image}
+
+    # ============= DISCO =============
+    def _pointer_path(self, url: str) -> str:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, "urls", digest)
+
+    def _blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.directory, f"{content_hash}.img")
+
+    def _read_pointer(self, url: str) -> Optional[Dict]:
+        """Hash y validadores de una URL; None si no se ha guardado"""
+        try:
+            with open(self._pointer_path(url), "r", encoding="utf-8") as pointer:
+                raw = pointer.read().strip()
+        except OSError:
+            return None
+        try:
+            entry = json.loads(raw)
+        except ValueError:
+            # Formato anterior: solo el hash, sin validadores
+            return {"hash": raw}
+        return entry if isinstance(entry, dict) and entry.get("hash") else None
+
+    def _read_blob(self, content_hash: str) -> Optional[bytes]:
+        path = self._blob_path(content_hash)
+        try:
+            with open(path, "rb") as blob:
+                data = blob.read()
+            # La fecha de modificación hace de último uso para el LRU
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def _write_pointer(self, url: str, entry: Dict):
+        try:
+            self._write_atomic(
+                self._pointer_path(url), json.dumps(entry).encode("utf-8")
+            )
+        except OSError as e:
+            logger.error(f"Error guardando imagen en disco: {e}")
+
+    def _write_disk(self, url: str, data: bytes, headers):
+        """Guardar los bytes por su hash y apuntar la URL a ellos"""
+        content_hash = hashlib.sha256(data).hexdigest()
+        try:
+            os.makedirs(os.path.join(self.directory, "urls"), exist_ok=True)
+            blob_path = self._blob_path(content_hash)
+            if not os.path.exists(blob_path):
+                self._write_atomic(blob_path, data)
+                self._account(len(data))
+        except OSError as e:
+            logger.error(f"Error guardando imagen en disco: {e}")
+            return
+        self._write_pointer(
+            url,
+            {
+                "hash": content_hash,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "checked_at": time.time(),
+            },
+        )
+
+    # ============= LÍMITE DE TAMAÑO =============
+    def _account(self, added: int):
+        """Sumar un fichero nuevo y desalojar los menos usados si se pasa del límite"""
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._blobs())
+            else:
+                self._disk_bytes += added
+            if self._disk_bytes <= self.max_disk_bytes:
+                return
+            # Bajar hasta el 90% para no desalojar en cada descarga
+            target = self.max_disk_bytes * 0.9
+            for path, size, _ in sorted(self._blobs(), key=lambda b: b[2]):
+                if self._disk_bytes <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                self._disk_bytes -= size
+            # Las URLs que apuntaban a lo desalojado se vuelven a descargar
+
+    def _blobs(self):
+        """(ruta, tamaño, último uso) de cada imagen guardada"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        blobs = []
+        for name in names:
+            if not name.endswith(".img"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            blobs.append((path, stat.st_size, stat.st_mtime))
+        return blobs
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as output:
+            output.write(data)
+        os.replace(tmp_path, path)
@@ -0,0 +1,18 @@
+import json
+from typing import Any
+
+# orjson es opcional: decodifica varias veces más rápido que json cuando está
+# instalado (pip install orjson); si no, se usa la biblioteca estándar
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data) -> Any:
+    """Decodificar JSON desde bytes o str (ValueError si no es válido)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,14 @@
+import base64
+import json
+from typing import Optional
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Leer el claim exp de un JWT sin verificar la firma (None si no es JWT)"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+def max_cursor(rows: List[Dict], current: Optional[str]) -> Optional[str]:
+    """Marca de agua: el updated_at más reciente entre las filas y la actual"""
+    stamps = [row["updated_at"] for row in rows if row.get("updated_at")]
+    if current:
+        stamps.append(current)
+    return max(stamps) if stamps else None
+
+
+class SyncState:
+    """
+    Colección sincronizada por deltas: filas por id y marca de agua.
+
+    server_delta indica si el backend respeta updated_since (None mientras
+    no se sabe); si no lo hace, la colección completa se compara en local.
+    """
+
+    __slots__ = (
+        "endpoint",
+        "cache_type",
+        "paginated",
+        "rows",
+        "cursor",
+        "server_delta",
+        "last_full",
+        "lock",
+    )
+
+    def __init__(self, endpoint: str, cache_type: str, paginated: bool):
+        self.endpoint = endpoint
+        self.cache_type = cache_type
+        self.paginated = paginated
+        self.rows: "OrderedDict[Any, Dict]" = OrderedDict()
+        self.cursor: Optional[str] = None
+        self.server_delta: Optional[bool] = None
+        self.last_full = 0.0
+        self.lock = threading.Lock()
+
+    def replace(self, rows: List[Dict]) -> Dict[str, list]:
+        """Sustituir por la colección completa y devolver lo que cambió"""
+        new = OrderedDict((row.get("id"), row) for row in rows)
+        updated = [key for key, row in new.items() if self.rows.get(key) != row]
+        deleted = [key for key in self.rows if key not in new]
+        self.rows = new
+        self.cursor = max_cursor(rows, None)
+        self.last_full = time.time()
+        return {"updated": updated, "deleted": deleted}
+
+    def diff(self, rows: List[Dict]) -> Dict[str, list]:
+        """
+        Separar lo recibido en filas que de verdad cambiaron y reenvíos.
+
+        Una fila cambió si no se conocía o si su contenido (updated_at
+        incluido) difiere de la copia local. "stale" son las que llegaron
+        idénticas con updated_at anterior a la marca o sin él: un servidor
+        que respeta updated_since nunca las manda.
+        """
+        changed, stale = [], []
+        for row in rows:
+            if self.rows.get(row.get("id")) != row:
+                changed.append(row)
+            elif not row.get("updated_at") or (
+                self.cursor is not None and row["updated_at"] < self.cursor
+            ):
+                stale.append(row)
+        return {"changed": changed, "stale": stale}
+
+    def merge(self, rows: List[Dict], deleted_ids: List) -> Dict[str, list]:
+        """Aplicar un delta: altas/cambios por id y bajas"""
+        deleted_ids = list(deleted_ids)
+        updated = []
+        for row in rows:
+            if row.get("deleted_at"):
+                deleted_ids.append(row.get("id"))
+                continue
+            self.rows[row.get("id")] = row
+            updated.append(row.get("id"))
+        deleted = [key for key in deleted_ids if self.rows.pop(key, None) is not None]
+        self.cursor = max_cursor(rows, self.cursor)
+        return {"updated": updated, "deleted": deleted}
@@ -0,0 +1,294 @@
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from itertools import compress
+from typing import Any, Dict, Iterable, List, Optional
+
+# Se indexan todos los n-gramas de 1 a GRAM_SIZE caracteres: una consulta
+# de hasta GRAM_SIZE caracteres es directamente una lista de coincidencias y
+# una más larga se resuelve intersecando sus trigramas y verificando
+GRAM_SIZE = 3
+
+SEARCH_FIELDS = ("nombre", "email")
+
+# Campos por los que se puede ordenar la tabla
+SORT_FIELDS = ("id", "nombre", "email", "rol", "estado")
+
+
+def fold_text(text) -> str:
+    """Minúsculas y sin acentos: "José" y "jose" se buscan igual"""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def sort_key(usuario: Dict, field: str):
+    """Clave de ordenación de un campo: numérica para el id, texto normalizado si no"""
+    value = usuario.get(field)
+    if field == "id":
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return 0
+    return fold_text(value)
+
+
+def sort_usuarios(usuarios: List[Dict], sort) -> List[Dict]:
+    """Ordenar una lista pequeña sin índice (p. ej. una página de búsqueda)"""
+    usuarios = list(usuarios)
+    # Ordenaciones estables de la última clave a la primera
+    for field, descending in reversed(sort):
+        usuarios.sort(key=lambda u: sort_key(u, field), reverse=descending)
+    return usuarios
+
+
+def _grams(text: str) -> set:
+    return {
+        text[start : start + size]
+        for size in range(1, GRAM_SIZE + 1)
+        for start in range(len(text) - size + 1)
+    }
+
+
+class UserSearchIndex:
+    """
+    Índice de búsqueda de usuarios por nombre y email, y filtro por rol.
+
+    Cada usuario es un documento numerado en el orden de la lista, así que
+    sin ordenación los resultados salen en ese mismo orden. Las listas de n-gramas son
+    arrays de enteros ordenados y los roles son mapas de bits (un byte por
+    documento) que solo marcan usuarios vigentes. build() está pensado
+    para ejecutarse en un worker; después las consultas y las
+    actualizaciones sueltas se hacen en el hilo de la GUI.
+
+    Para ordenar se guardan las claves de cada campo al indexar; la
+    permutación ordenada y los rangos de cada campo se calculan la primera
+    vez que se piden y se conservan hasta que cambia alguna de sus claves.
+    """
+
+    def __init__(self):
+        self._rows: List[Optional[Dict]] = []
+        self._folded: List[Optional[tuple]] = []
+        self._doc_of: Dict[Any, int] = {}
+        self._postings: Dict[str, array] = {}
+        self._roles: Dict[str, bytearray] = {}
+        self._alive = bytearray()  # documentos no eliminados
+        self._sort_keys: Dict[str, list] = {f: [] for f in SORT_FIELDS}
+        self._orders: Dict[str, List[int]] = {}
+        self._ranks: Dict[str, array] = {}
+
+    @classmethod
+    def build(cls, usuarios: Iterable[Dict]) -> "UserSearchIndex":
+        """Construir el índice completo (costoso: llamar fuera de la GUI)"""
+        index = cls()
+        for usuario in usuarios:
+            index._append(usuario)
+        # Permutaciones y rangos listos antes de llegar a la GUI
+        for field in SORT_FIELDS:
+            index._rank(field)
+        return index
+
+    def __len__(self):
+        return self._alive.count(1)
+
+    # ============= CONSULTAS =============
+    def search(self, query: str = "", rol: str = None, sort=None) -> List[Any]:
+        """
+        Ids de los usuarios que contienen query y tienen ese rol.
+
+        sort es una lista de (campo, descendente) de SORT_FIELDS; el primer
+        campo manda y los siguientes deshacen empates.
+        """
+        return [self._rows[doc]["id"] for doc in self._query(query, rol, sort)]
+
+    def usuarios(self, query: str = "", rol: str = None, sort=None) -> List[Dict]:
+        """Como search() pero devolviendo los usuarios"""
+        return [self._rows[doc] for doc in self._query(query, rol, sort)]
+
+    def _query(self, query: str, rol: Optional[str], sort) -> List[int]:
+        docs = self._match(query, rol)
+        return self._sorted(docs, sort) if sort and docs else docs
+
+    def _match(self, query: str, rol: Optional[str]) -> List[int]:
+        query = fold_text(query).strip()
+        bits = self._alive if rol is None else self._roles.get(rol)
+        if bits is None:
+            return []
+        if not query:
+            return list(compress(range(len(bits)), bits))
+
+        if len(query) <= GRAM_SIZE:
+            docs = self._postings.get(query, ())
+            verify = False
+        else:
+            # El trigrama más raro acota los candidatos; verificar la
+            # subcadena sale más barato que intersecar el resto de listas
+            docs = min(
+                (
+                    self._postings.get(query[i : i + GRAM_SIZE], ())
+                    for i in range(len(query) - GRAM_SIZE + 1)
+                ),
+                key=len,
+            )
+            verify = True
+
+        folded = self._folded
+        return [
+            doc
+            for doc in docs
+            if bits[doc]
+            and (not verify or any(query in field for field in folded[doc]))
+        ]
+
+    # ============= ORDENACIÓN =============
+    def _sorted(self, docs: List[int], sort) -> List[int]:
+        if len(sort) == 1:
+            field, descending = sort[0]
+            if len(docs) * 8 < len(self._rows):
+                # Pocos resultados: ordenarlos por su rango
+                return sorted(
+                    docs, key=self._rank(field).__getitem__, reverse=descending
+                )
+            # Muchos: recorrer la permutación guardada quedándose con los elegidos
+            if len(docs) == len(self):
+                selected = self._alive
+            else:
+                selected = bytearray(len(self._rows))
+                for doc in docs:
+                    selected[doc] = 1
+            order = self._order(field)
+            docs = list(compress(order, map(selected.__getitem__, order)))
+            return docs[::-1] if descending else docs
+
+        # Varias claves: combinar los rangos de cada campo en un solo entero
+        base = len(self._rows) + 1
+        combined = [0] * len(docs)
+        for field, descending in sort:
+            rank = self._rank(field)
+            if descending:
+                values = [base - 1 - rank[doc] for doc in docs]
+            else:
+                values = [rank[doc] for doc in docs]
+            combined = [c * base + v for c, v in zip(combined, values)]
+        positions = sorted(range(len(docs)), key=combined.__getitem__)
+        return [docs[i] for i in positions]
+
+    def _order(self, field: str) -> List[int]:
+        """Documentos ordenados por un campo (calculado una vez)"""
+        order = self._orders.get(field)
+        if order is None:
+            keys = self._sort_keys[field]
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            self._orders[field] = order
+        return order
+
+    def _rank(self, field: str) -> array:
+        """Posición de cada documento por un campo; los empates comparten rango"""
+        rank = self._ranks.get(field)
+        if rank is None:
+            keys = self._sort_keys[field]
+            rank = array("l", [0]) * len(keys)
+            current, previous = -1, None
+            for position, doc in enumerate(self._order(field)):
+                if position == 0 or keys[doc] != previous:
+                    current += 1
+                    previous = keys[doc]
+                rank[doc] = current
+            self._ranks[field] = rank
+        return rank
+
+    def matches(self, usuario: Dict, query: str = "", rol: str = None) -> bool:
+        """Comprobar un usuario suelto con la misma semántica que search()"""
+        if rol is not None and usuario.get("rol") != rol:
+            return False
+        query = fold_text(query).strip()
+        return not query or any(
+            query in fold_text(usuario.get(field)) for field in SEARCH_FIELDS
+        )
+
+    # ============= ACTUALIZACIÓN INCREMENTAL =============
+    def update(self, usuario: Dict):
+        """Añadir o actualizar un usuario tocando solo sus n-gramas"""
+        usuario_id = usuario.get("id")
+        if usuario_id is None:
+            return
+        doc = self._doc_of.get(usuario_id)
+        if doc is None:
+            self._append(usuario)
+            return
+        # Un documento borrado conserva su número para volver a su sitio
+        old_grams = self._doc_grams(doc) if self._folded[doc] else set()
+        old_rol = self._rows[doc].get("rol") if self._rows[doc] else None
+        folded = tuple(fold_text(usuario.get(f)) for f in SEARCH_FIELDS)
+        self._rows[doc] = usuario
+        self._folded[doc] = folded
+        new_grams = set().union(*(_grams(f) for f in folded))
+        for gram in old_grams - new_grams:
+            self._discard(gram, doc)
+        for gram in new_grams - old_grams:
+            insort(self._postings.setdefault(gram, array("l")), doc)
+        if old_rol is not None and old_rol != usuario.get("rol"):
+            self._roles[old_rol][doc] = 0
+        self._set_role(usuario.get("rol"), doc)
+        self._alive[doc] = 1
+        for field, keys in self._sort_keys.items():
+            key = sort_key(usuario, field)
+            if keys[doc] != key:
+                keys[doc] = key
+                self._orders.pop(field, None)
+                self._ranks.pop(field, None)
+
+    def remove(self, usuario_id):
+        doc = self._doc_of.get(usuario_id)
+        if doc is None or self._rows[doc] is None:
+            return
+        for gram in self._doc_grams(doc):
+            self._discard(gram, doc)
+        rol = self._rows[doc].get("rol")
+        if rol in self._roles:
+            self._roles[rol][doc] = 0
+        self._alive[doc] = 0
+        self._rows[doc] = None
+        self._folded[doc] = None
+
+    def _append(self, usuario: Dict):
+        usuario_id = usuario.get("id")
+        if usuario_id is None or usuario_id in self._doc_of:
+            return
+        doc = len(self._rows)
+        folded = tuple(fold_text(usuario.get(f)) for f in SEARCH_FIELDS)
+        self._rows.append(usuario)
+        self._folded.append(folded)
+        self._doc_of[usuario_id] = doc
+        for gram in set().union(*(_grams(f) for f in folded)):
+            # Los documentos llegan en orden: basta con añadir al final
+            self._postings.setdefault(gram, array("l")).append(doc)
+        self._alive.append(1)
+        for bits in self._roles.values():
+            bits.append(0)
+        self._set_role(usuario.get("rol"), doc)
+        for field, keys in self._sort_keys.items():
+            keys.append(sort_key(usuario, field))
+        if self._orders or self._ranks:
+            self._orders.clear()
+            self._ranks.clear()
+
+    def _doc_grams(self, doc: int) -> set:
+        return set().union(*(_grams(f) for f in self._folded[doc]))
+
+    def _set_role(self, rol, doc: int):
+        if rol is None:
+            return
+        bits = self._roles.get(rol)
+        if bits is None:
+            bits = self._roles[rol] = bytearray(len(self._alive))
+        bits[doc] = 1
+
+    def _discard(self, gram: str, doc: int):
+        posting = self._postings.get(gram)
+        if posting is None:
+            return
+        pos = bisect_left(posting, doc)
+        if pos < len(posting) and posting[pos] == doc:
+            del posting[pos]
+            if not posting:
+                del self._postings[gram]
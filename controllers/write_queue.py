@@ -0,0 +1,155 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+FAILED = "failed"
+
+
+class WriteJournal:
+    """
+    Diario de escrituras pendientes en disco (solo se añaden líneas).
+
+    Cada mutación que no pudo enviarse queda como una línea "queued" con su
+    clave de idempotencia; las líneas "done", "failed" y "discarded"
+    cambian su estado. Al abrir se reproduce el fichero para reconstruir
+    la cola en orden, y cuando ya no queda nada vivo se compacta. Cada
+    línea se escribe con fsync para sobrevivir a un cierre inesperado.
+    """
+
+    def __init__(self, directory: str, namespace: str):
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha1(namespace.encode("utf-8")).hexdigest()[:12]
+        self.path = os.path.join(directory, f"pending_writes-{digest}.jsonl")
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._load()
+
+    # ============= LECTURA =============
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Última línea a medio escribir
+                    continue
+                self._apply(record)
+        self._compact()
+
+    def _apply(self, record: Dict[str, Any]):
+        event = record.get("event")
+        key = record.get("key")
+        if event == "queued":
+            entry = dict(record)
+            entry.pop("event")
+            entry["status"] = PENDING
+            self._entries[key] = entry
+        elif event in ("done", "discarded"):
+            self._entries.pop(key, None)
+        elif event == "failed" and key in self._entries:
+            self._entries[key]["status"] = FAILED
+            self._entries[key]["error"] = record.get("error")
+        elif event == "retry" and key in self._entries:
+            self._entries[key]["status"] = PENDING
+            self._entries[key].pop("error", None)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Copia de la cola en orden de llegada (pendientes y fallidas)"""
+        with self._lock:
+            return [dict(entry) for entry in self._entries.values()]
+
+    def pending(self) -> List[Dict[str, Any]]:
+        return [e for e in self.entries() if e["status"] == PENDING]
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return any(e["status"] == PENDING for e in self._entries.values())
+
+    # ============= ESCRITURA =============
+    def enqueue(
+        self,
+        method: str,
+        endpoint: str,
+        json_body: Optional[Dict],
+        cache_types: List[str],
+        label: str,
+        key: str = None,
+    ) -> Dict[str, Any]:
+        record = {
+            "event": "queued",
+            "key": key or str(uuid.uuid4()),
+            "method": method,
+            "endpoint": endpoint,
+            "json": json_body,
+            "cache_types": list(cache_types),
+            "label": label,
+            "queued_at": time.time(),
+        }
+        self._append(record)
+        return {**record, "status": PENDING}
+
+    def mark_done(self, key: str):
+        self._append({"event": "done", "key": key})
+
+    def mark_failed(self, key: str, error: str):
+        self._append({"event": "failed", "key": key, "error": error})
+
+    def retry(self, key: str):
+        self._append({"event": "retry", "key": key})
+
+    def discard(self, key: str):
+        self._append({"event": "discarded", "key": key})
+
+    def _append(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as journal:
+                journal.write(line + "\n")
+                journal.flush()
+                os.fsync(journal.fileno())
+            self._apply(record)
+            if not self._entries:
+                self._compact()
+
+    def _compact(self):
+        """Reescribir el diario solo con lo vivo (llamar con el lock o al abrir)"""
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as journal:
+                for entry in self._entries.values():
+                    records = [
+                        {
+                            "event": "queued",
+                            **{
+                                k: v
+                                for k, v in entry.items()
+                                if k not in ("status", "error")
+                            },
+                        }
+                    ]
+                    if entry["status"] == FAILED:
+                        records.append(
+                            {
+                                "event": "failed",
+                                "key": entry["key"],
+                                "error": entry.get("error"),
+                            }
+                        )
+                    for record in records:
+                        journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+                journal.flush()
+                os.fsync(journal.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error compactando el diario de escrituras: {e}")
@@ -101,6 +101,7 @@ class AdminApplication:
 
         # Inicializar API client
         self.api_client = APIClient()
+        self.app.aboutToQuit.connect(self.api_client.shutdown)
 
         # Mostrar ventana de login
         self.login_window = LoginWindow(self.api_client)
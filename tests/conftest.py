@@ -0,0 +1,21 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    QtCore = pytest.importorskip(
+        "PyQt5.QtCore", reason="requiere PyQt5 (requirements-dev.txt)"
+    )
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture
+def client(qapp, tmp_path, monkeypatch):
+    """APIClient sin sesión iniciada, con la caché de disco en tmp_path"""
+    pytest.importorskip("requests")
+    from controllers.api_client import APIClient
+
+    monkeypatch.setenv("VARCHATE_CACHE_DIR", str(tmp_path))
+    client = APIClient()
+    yield client
+    client.shutdown()
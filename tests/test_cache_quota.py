@@ -0,0 +1,69 @@
+import pytest
+
+pytest.importorskip("PyQt5", reason="requiere PyQt5 (requirements-dev.txt)")
+pytest.importorskip("requests")
+
+from controllers.api_client import estimate_size  # noqa: E402
+
+
+def _valor(n=100):
+    return "x" * n
+
+
+def _configurar(client, max_bytes):
+    client.cache_config["prueba"] = {"timeout": 300, "max_bytes": max_bytes}
+
+
+def test_cuota_expulsa_la_menos_usada(client):
+    size = estimate_size(_valor())
+    _configurar(client, 3 * size)
+    for i in range(3):
+        client._save_to_cache(f"k{i}", _valor(), "prueba", "/prueba")
+    # Usar k0 la convierte en la más reciente: la siguiente expulsa k1
+    assert client._get_from_cache("k0") == _valor()
+    client._save_to_cache("k3", _valor(), "prueba", "/prueba")
+
+    assert set(client.cache) == {"k0", "k2", "k3"}
+    assert client._cache_bytes_by_type["prueba"] == 3 * size
+    assert client.cache_stats["evictions"] == 1
+
+
+def test_cuota_de_un_tipo_no_expulsa_otros(client):
+    size = estimate_size(_valor())
+    _configurar(client, size)
+    client.cache_config["otro"] = {"timeout": 300, "max_bytes": 10 * size}
+    client._save_to_cache("otro", _valor(), "otro", "/otro")
+    client._save_to_cache("a", _valor(), "prueba", "/prueba")
+    client._save_to_cache("b", _valor(), "prueba", "/prueba")
+    assert set(client.cache) == {"otro", "b"}
+
+
+def test_presupuesto_global_expulsa_la_mas_antigua(client):
+    size = estimate_size(_valor())
+    _configurar(client, 10 * size)
+    client.cache_max_bytes = 2 * size
+    for key in ("a", "b", "c"):
+        client._save_to_cache(key, _valor(), "prueba", "/prueba")
+    assert list(client.cache) == ["b", "c"]
+    assert client.cache_bytes == 2 * size
+
+
+def test_respuesta_mayor_que_la_cuota_retira_la_anterior(client):
+    size = estimate_size(_valor())
+    _configurar(client, 2 * size)
+    client._save_to_cache("k", _valor(), "prueba", "/prueba")
+    client._save_to_cache("k", _valor(10 * size), "prueba", "/prueba")
+
+    assert "k" not in client.cache
+    assert client._get_from_cache("k") is None
+    assert client._cache_bytes_by_type["prueba"] == 0
+    assert client.cache_bytes == 0
+
+
+def test_reemplazar_una_clave_no_duplica_bytes(client):
+    size = estimate_size(_valor())
+    _configurar(client, 10 * size)
+    client._save_to_cache("k", _valor(), "prueba", "/prueba")
+    client._save_to_cache("k", _valor(), "prueba", "/prueba")
+    assert client._cache_bytes_by_type["prueba"] == size
+    assert list(client._cache_lru_by_type["prueba"]) == ["k"]
@@ -0,0 +1,38 @@
+import time
+
+from controllers.circuit_breaker import CircuitBreaker
+
+
+def test_breaker_abre_tras_el_umbral():
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+    assert not breaker.record_failure()
+    assert not breaker.record_failure()
+    assert breaker.record_failure()  # se acaba de abrir
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_un_exito_reinicia_la_cuenta():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+    breaker.record_failure()
+    assert not breaker.record_success()  # ya estaba cerrado
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_sonda_tras_el_enfriamiento():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    breaker.record_failure()
+    breaker.opened_at = time.time() - 61
+    assert breaker.allow()  # la sonda
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()  # solo una por periodo
+
+    # La sonda falla: vuelve a abrirse sin contar como nueva apertura
+    assert not breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    breaker.opened_at = time.time() - 61
+    assert breaker.allow()
+    assert breaker.record_success()  # vuelve a estar en línea
+    assert breaker.state == CircuitBreaker.CLOSED
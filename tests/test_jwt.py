@@ -0,0 +1,22 @@
+import base64
+import json
+
+import pytest
+
+from controllers.jwt_utils import jwt_expiry
+
+
+def _jwt(payload) -> str:
+    body = base64.urlsafe_b64encode(json.dumps(payload).encode()).rstrip(b"=")
+    return f"eyJhbGciOiJIUzI1NiJ9.{body.decode()}.firma"
+
+
+def test_jwt_expiry_lee_exp():
+    assert jwt_expiry(_jwt({"sub": 1, "exp": 1700000000})) == 1700000000.0
+
+
+@pytest.mark.parametrize(
+    "token", ["", "no-es-un-jwt", "a.@@@.c", _jwt({"sub": 1}), _jwt([1, 2]), None]
+)
+def test_jwt_expiry_sin_exp_valido(token):
+    assert jwt_expiry(token) is None
@@ -0,0 +1,83 @@
+from controllers.sync_state import SyncState
+
+
+def _fila(id, updated_at, **extra):
+    return {"id": id, "updated_at": updated_at, **extra}
+
+
+def test_sync_state_replace_devuelve_cambios_y_bajas():
+    state = SyncState("/admin/modulos", "modulos", paginated=False)
+    first = state.replace([_fila(1, "2024-01-01"), _fila(2, "2024-01-02")])
+    assert first == {"updated": [1, 2], "deleted": []}
+    assert state.cursor == "2024-01-02"
+
+    changes = state.replace([_fila(1, "2024-01-01"), _fila(3, "2024-01-05")])
+    assert changes == {"updated": [3], "deleted": [2]}
+    assert list(state.rows) == [1, 3]
+    assert state.cursor == "2024-01-05"
+    assert state.last_full > 0
+
+
+def test_sync_state_diff_separa_cambios_y_reenvios():
+    state = SyncState("/admin/modulos", "modulos", paginated=False)
+    state.replace(
+        [_fila(1, "2024-01-01"), _fila(2, "2024-01-03"), {"id": 3, "titulo": "c"}]
+    )
+    nueva = _fila(4, "2024-01-04")
+    editada = _fila(2, "2024-01-04", titulo="nuevo")
+    diff = state.diff(
+        [
+            _fila(1, "2024-01-01"),  # idéntica y anterior a la marca
+            _fila(2, "2024-01-03"),  # idéntica pero en la marca
+            {"id": 3, "titulo": "c"},  # idéntica y sin updated_at
+            editada,
+            nueva,
+        ]
+    )
+    assert diff["changed"] == [editada, nueva]
+    assert [row["id"] for row in diff["stale"]] == [1, 3]
+
+
+def test_sync_state_merge_aplica_delta_y_bajas():
+    state = SyncState("/admin/modulos", "modulos", paginated=False)
+    state.replace([_fila(1, "2024-01-01"), _fila(2, "2024-01-02")])
+    changes = state.merge(
+        [_fila(3, "2024-01-06"), _fila(1, "2024-01-07", deleted_at="2024-01-07")],
+        [2, 99],
+    )
+    assert changes == {"updated": [3], "deleted": [2, 1]}
+    assert list(state.rows) == [3]
+    assert state.cursor == "2024-01-07"
+
+
+def test_delta_paginado_rechazado_compara_en_local(client, monkeypatch):
+    state = client._sync_state("/admin/usuarios", "usuarios", paginated=True)
+    state.replace([_fila(1, "2024-01-01"), _fila(2, "2024-01-02")])
+    pedidas = []
+
+    def iter_pages(endpoint, params=None, per_page=100, *args, **kwargs):
+        pedidas.append(params)
+        yield {"success": False, "error": "HTTP 422", "status_code": 422}
+
+    def get_all_pages(endpoint, *args, **kwargs):
+        filas = [_fila(1, "2024-01-01"), _fila(3, "2024-01-03")]
+        return {"success": True, "data": filas}
+
+    monkeypatch.setattr(client, "iter_pages", iter_pages)
+    monkeypatch.setattr(client, "get_all_pages", get_all_pages)
+
+    result = client._delta_sync(state)
+    assert pedidas == [{"updated_since": "2024-01-02"}]
+    assert result["success"]
+    assert result["changes"] == {"updated": [3], "deleted": [2], "mode": "local"}
+    assert state.server_delta is False
+
+
+def test_delta_paginado_otro_error_se_devuelve(client, monkeypatch):
+    state = client._sync_state("/admin/usuarios", "usuarios", paginated=True)
+    state.replace([_fila(1, "2024-01-01")])
+    error = {"success": False, "error": "Error de conexión", "network_error": True}
+    monkeypatch.setattr(client, "iter_pages", lambda *args, **kwargs: iter([error]))
+
+    assert client._delta_sync(state) is error
+    assert state.server_delta is None
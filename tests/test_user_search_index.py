@@ -0,0 +1,84 @@
+from controllers.user_search_index import UserSearchIndex, fold_text, sort_usuarios
+
+USUARIOS = [
+    {"id": 1, "nombre": "José Pérez", "email": "jose@example.com", "rol": "admin"},
+    {"id": 2, "nombre": "Ana Gómez", "email": "ana@example.com", "rol": "alumno"},
+    {"id": 3, "nombre": "Joseba Ruiz", "email": "jruiz@example.com", "rol": "alumno"},
+    {"id": 4, "nombre": "Bea", "email": "bea@otro.org", "rol": "profesor"},
+]
+
+
+def test_fold_text_ignora_acentos_y_mayusculas():
+    assert fold_text("JOSÉ") == "jose"
+    assert fold_text(None) == ""
+
+
+def test_busqueda_corta_y_larga():
+    index = UserSearchIndex.build(USUARIOS)
+    # Hasta tres caracteres es una lista de n-gramas directa
+    assert index.search("jos") == [1, 3]
+    # Más larga: trigrama más raro y verificación de la subcadena
+    assert index.search("jose p") == [1]
+    assert index.search("example") == [1, 2, 3]
+    assert index.search("zzzz") == []
+
+
+def test_sin_consulta_devuelve_todos_en_orden():
+    index = UserSearchIndex.build(USUARIOS)
+    assert index.search() == [1, 2, 3, 4]
+    assert len(index) == 4
+
+
+def test_filtro_por_rol():
+    index = UserSearchIndex.build(USUARIOS)
+    assert index.search(rol="alumno") == [2, 3]
+    assert index.search("jos", rol="alumno") == [3]
+    assert index.search(rol="inexistente") == []
+
+
+def test_ordenacion_simple_y_compuesta():
+    index = UserSearchIndex.build(USUARIOS)
+    assert index.search(sort=[("nombre", False)]) == [2, 4, 1, 3]
+    assert index.search(sort=[("id", True)]) == [4, 3, 2, 1]
+    assert index.search(sort=[("rol", False), ("nombre", True)]) == [1, 3, 2, 4]
+    assert index.search("example", sort=[("email", False)]) == [2, 1, 3]
+
+
+def test_ordenacion_coincide_con_sort_usuarios():
+    index = UserSearchIndex.build(USUARIOS)
+    sort = [("rol", True), ("email", False)]
+    esperado = [u["id"] for u in sort_usuarios(USUARIOS, sort)]
+    assert index.search(sort=sort) == esperado
+
+
+def test_update_reindexa_solo_lo_cambiado():
+    index = UserSearchIndex.build(USUARIOS)
+    index.update({**USUARIOS[1], "nombre": "Anabel Gómez", "rol": "admin"})
+    assert index.search("anabel") == [2]
+    assert index.search(rol="admin") == [1, 2]
+    assert index.search(rol="alumno") == [3]
+    # La ordenación se recalcula con la clave nueva
+    assert index.search(sort=[("nombre", False)]) == [2, 4, 1, 3]
+    index.update({"id": 5, "nombre": "Zoe", "email": "zoe@example.com", "rol": "alumno"})
+    assert index.search("zoe") == [5]
+    assert index.search(sort=[("nombre", True)])[0] == 5
+
+
+def test_remove_y_vuelta_conserva_posicion():
+    index = UserSearchIndex.build(USUARIOS)
+    index.remove(1)
+    assert index.search("jos") == [3]
+    assert index.search(rol="admin") == []
+    assert len(index) == 3
+    index.remove(1)  # eliminar dos veces no falla
+    index.update(USUARIOS[0])
+    assert index.search() == [1, 2, 3, 4]
+
+
+def test_matches_tiene_la_misma_semantica():
+    index = UserSearchIndex.build(USUARIOS)
+    for usuario in USUARIOS:
+        for query, rol in (("jos", None), ("EXAMPLE", "alumno"), ("", "profesor")):
+            assert index.matches(usuario, query, rol) == (
+                usuario["id"] in index.search(query, rol)
+            )
@@ -0,0 +1,93 @@
+import json
+
+from controllers.write_queue import FAILED, PENDING, WriteJournal
+
+
+def _lineas(journal):
+    with open(journal.path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _encolar(journal, endpoint, key=None):
+    return journal.enqueue(
+        "PUT", endpoint, {"titulo": "x"}, ["modulos"], f"Editar {endpoint}", key=key
+    )
+
+
+def test_enqueue_y_estados(tmp_path):
+    journal = WriteJournal(str(tmp_path), "http://api|1")
+    a = _encolar(journal, "/admin/modulos/1")
+    b = _encolar(journal, "/admin/modulos/2")
+    assert a["status"] == PENDING
+    assert [e["key"] for e in journal.pending()] == [a["key"], b["key"]]
+
+    journal.mark_failed(a["key"], "HTTP 422")
+    assert [e["key"] for e in journal.pending()] == [b["key"]]
+    assert journal.entries()[0]["status"] == FAILED
+    assert journal.entries()[0]["error"] == "HTTP 422"
+
+    journal.retry(a["key"])
+    assert journal.entries()[0]["status"] == PENDING
+    assert "error" not in journal.entries()[0]
+
+
+def test_replay_reconstruye_la_cola_en_orden(tmp_path):
+    journal = WriteJournal(str(tmp_path), "http://api|1")
+    keys = [_encolar(journal, f"/admin/modulos/{i}")["key"] for i in range(4)]
+    journal.mark_done(keys[1])
+    journal.mark_failed(keys[2], "HTTP 500")
+    journal.discard(keys[3])
+
+    reabierto = WriteJournal(str(tmp_path), "http://api|1")
+    entries = reabierto.entries()
+    assert [e["key"] for e in entries] == [keys[0], keys[2]]
+    assert entries[0]["status"] == PENDING
+    assert entries[0]["endpoint"] == "/admin/modulos/0"
+    assert entries[0]["json"] == {"titulo": "x"}
+    assert entries[1]["status"] == FAILED
+    assert entries[1]["error"] == "HTTP 500"
+
+
+def test_al_abrir_compacta_solo_lo_vivo(tmp_path):
+    journal = WriteJournal(str(tmp_path), "http://api|1")
+    vivo = _encolar(journal, "/admin/modulos/1")["key"]
+    fallido = _encolar(journal, "/admin/modulos/2")["key"]
+    hecho = _encolar(journal, "/admin/modulos/3")["key"]
+    journal.mark_failed(fallido, "HTTP 409")
+    journal.mark_done(hecho)
+    assert len(_lineas(journal)) == 5
+
+    reabierto = WriteJournal(str(tmp_path), "http://api|1")
+    lineas = _lineas(reabierto)
+    assert [(r["event"], r["key"]) for r in lineas] == [
+        ("queued", vivo),
+        ("queued", fallido),
+        ("failed", fallido),
+    ]
+    assert all("status" not in r for r in lineas)
+
+
+def test_compacta_cuando_la_cola_queda_vacia(tmp_path):
+    journal = WriteJournal(str(tmp_path), "http://api|1")
+    key = _encolar(journal, "/admin/modulos/1")["key"]
+    journal.mark_done(key)
+    assert _lineas(journal) == []
+    assert not journal.has_pending()
+
+
+def test_ignora_una_ultima_linea_a_medio_escribir(tmp_path):
+    journal = WriteJournal(str(tmp_path), "http://api|1")
+    key = _encolar(journal, "/admin/modulos/1")["key"]
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"event": "done", "ke')
+
+    reabierto = WriteJournal(str(tmp_path), "http://api|1")
+    assert [e["key"] for e in reabierto.pending()] == [key]
+
+
+def test_cada_namespace_tiene_su_diario(tmp_path):
+    a = WriteJournal(str(tmp_path), "http://api|1")
+    b = WriteJournal(str(tmp_path), "http://api|2")
+    _encolar(a, "/admin/modulos/1")
+    assert a.path != b.path
+    assert WriteJournal(str(tmp_path), "http://api|2").entries() == []
@@ -0,0 +1,46 @@
+from PyQt5.QtCore import QObject
+
+
+class StoreComboBinding(QObject):
+    """
+    Mantiene un QComboBox al día con un listado raíz del almacén de entidades.
+
+    Si se edita una entidad solo cambia el texto de su elemento; si cambia el
+    listado se rehace el combo sin emitir currentIndexChanged, conservando la
+    selección. Si el elemento seleccionado desaparece se vuelve al primer
+    elemento (el texto de ayuda) y entonces sí se notifica a la vista.
+    """
+
+    def __init__(self, combo, store, kind: str, placeholder: str, field: str = "titulo"):
+        super().__init__(combo)
+        self.combo = combo
+        self.store = store
+        self.kind = kind
+        self.placeholder = placeholder
+        self.field = field
+        store.entities_changed.connect(self._on_entities_changed)
+        store.children_changed.connect(self._on_children_changed)
+
+    def _on_entities_changed(self, kind, ids):
+        if kind != self.kind:
+            return
+        for index in range(1, self.combo.count()):
+            entity_id = self.combo.itemData(index)
+            if entity_id in ids:
+                entity = self.store.get(self.kind, entity_id) or {}
+                self.combo.setItemText(index, f"{entity.get(self.field)}")
+
+    def _on_children_changed(self, parent, kind):
+        if parent is not None or kind != self.kind:
+            return
+        selected = self.combo.currentData()
+        self.combo.blockSignals(True)
+        self.combo.clear()
+        self.combo.addItem(self.placeholder, None)
+        for entity in self.store.listing(self.kind):
+            self.combo.addItem(f"{entity.get(self.field)}", entity.get("id"))
+        index = self.combo.findData(selected) if selected is not None else 0
+        self.combo.setCurrentIndex(max(index, 0))
+        self.combo.blockSignals(False)
+        if index < 0:
+            self.combo.currentIndexChanged.emit(0)
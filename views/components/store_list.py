@@ -0,0 +1,77 @@
+from PyQt5.QtCore import QObject, QTimer
+
+from controllers.api_client import split_page
+
+
+class StoreListBinding(QObject):
+    """
+    Enlaza un listado del almacén de entidades con el repintado de una vista.
+
+    La vista no guarda su propia copia: rows se lee siempre del almacén
+    (el listado raíz de kind, o los hijos de parent). Cuando cambia el
+    listado o se edita alguna de sus entidades se llama a on_changed(rows)
+    si se indicó, agrupando las señales de una misma vuelta del bucle de
+    eventos en un solo repintado. Con parent a None y root=False no se
+    observa nada (p. ej. mientras no hay módulo seleccionado).
+    """
+
+    def __init__(
+        self, owner, store, kind: str, on_changed=None, parent=None, root=True
+    ):
+        super().__init__(owner)
+        self.store = store
+        self.kind = kind
+        self.on_changed = on_changed
+        self.parent = parent
+        self.root = root
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._emit)
+        store.entities_changed.connect(self._on_entities_changed)
+        store.children_changed.connect(self._on_children_changed)
+
+    @property
+    def active(self) -> bool:
+        return self.root or self.parent is not None
+
+    @property
+    def rows(self):
+        if not self.active:
+            return []
+        return self.store.children(self.parent, self.kind)
+
+    def ingest(self, result) -> list:
+        """
+        Filas del listado tras una carga correcta.
+
+        Si la respuesta se sirvió de una caché que el almacén aún no conoce,
+        se vuelca antes para que rows y las señales partan de ella.
+        """
+        if (
+            result.get("success")
+            and self.active
+            and not self.store.has_children(self.parent, self.kind)
+        ):
+            rows, _ = split_page(result)
+            self.store.set_children(self.parent, self.kind, rows)
+        return self.rows
+
+    def set_parent(self, parent):
+        """Observar los hijos de otro padre (sin repintar: la vista los pide)"""
+        self.parent = parent
+        self._timer.stop()
+
+    def _on_entities_changed(self, kind, ids):
+        if kind != self.kind or not self.active:
+            return
+        ids = set(ids)
+        if any(row.get("id") in ids for row in self.rows):
+            self._timer.start(0)
+
+    def _on_children_changed(self, parent, kind):
+        if kind == self.kind and self.active and parent == self.parent:
+            self._timer.start(0)
+
+    def _emit(self):
+        if self.on_changed is not None:
+            self.on_changed(self.rows)
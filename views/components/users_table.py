@@ -0,0 +1,543 @@
+from bisect import bisect_right
+from collections import OrderedDict
+
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle, QToolTip
+from PyQt5.QtCore import (
+    Qt,
+    QAbstractTableModel,
+    QModelIndex,
+    QRect,
+    QRectF,
+    QEvent,
+    pyqtSignal,
+)
+from PyQt5.QtGui import QFont, QColor, QPainter, QPainterPath
+
+from controllers.api_client import split_page
+
+
+class UsersTableModel(QAbstractTableModel):
+    """
+    Modelo de la tabla de usuarios con carga incremental.
+
+    No crea ningún objeto por celda: textos, fuentes y colores se calculan
+    en data() cuando la vista pinta una celda visible. Tiene dos modos:
+
+    - local (set_rows): una lista ya en memoria (p. ej. el resultado de un
+      filtro) que se va mostrando en lotes a medida que se desplaza.
+    - remoto (set_remote): las páginas se piden al cargador con fetchMore
+      según se acerca el final, y solo se guardan las max_pages últimas
+      usadas. Una fila cuya página se descartó se pinta como marcador y la
+      página se vuelve a pedir al pintarla. Si una página falla no se pide
+      nada más (ni siquiera al repintar) hasta retry(), invalidate_pages()
+      o un listado nuevo, y loading_failed se emite una sola vez.
+    """
+
+    COLUMNS = ["ID", "Nombre", "Email", "Rol", "Estado", "Acciones"]
+    # Campo de cada columna ordenable
+    SORT_FIELDS = ["id", "nombre", "email", "rol", "estado"]
+    ACTIONS_COLUMN = 5
+    BATCH_SIZE = 100
+    PLACEHOLDER = "…"
+
+    # Error al pedir una página en modo remoto (una vez hasta retry())
+    loading_failed = pyqtSignal(str)
+    # Total de usuarios según el servidor (None si no lo indica)
+    total_changed = pyqtSignal(object)
+
+    def __init__(self, parent=None, max_pages: int = 10):
+        super().__init__(parent)
+        self.max_pages = max_pages
+        # Modo local
+        self._rows = []
+        self._visible = 0
+        # Modo remoto
+        self._loader = None
+        self._per_page = self.BATCH_SIZE
+        self._pages = OrderedDict()  # página -> filas (LRU)
+        self._sizes = []  # filas de cada página ya incorporada
+        self._offsets = [0]  # primera fila de cada página
+        self._last_page = None
+        self._requested = set()
+        self._failed = False
+        # Las respuestas de un listado anterior se descartan
+        self._generation = 0
+        # Compartidos por todas las celdas
+        self._font = QFont("Segoe UI", 11)
+        self._font_bold = QFont("Segoe UI", 11, QFont.Bold)
+        self._color_admin = QColor("#e74c3c")
+        self._color_aprendiz = QColor("#3498db")
+        self._color_placeholder = QColor("#bdc3c7")
+        self._color_activo = QColor("#27ae60")
+        self._color_inactivo = QColor("#c0392b")
+        # [(columna, descendente)] para las flechas de la cabecera
+        self._sort = []
+
+    # ============= DATOS =============
+    def is_remote(self) -> bool:
+        return self._loader is not None
+
+    def set_sort_indicator(self, sort):
+        """Marcar en la cabecera las columnas de la ordenación y su prioridad"""
+        self._sort = list(sort)
+        self.headerDataChanged.emit(Qt.Horizontal, 0, len(self.COLUMNS) - 1)
+
+    def set_rows(self, rows, keep_position: bool = False):
+        """
+        Mostrar una lista en memoria. Con keep_position se mantienen
+        reveladas las filas que ya lo estaban para no saltar al inicio.
+        """
+        visible = self._visible if keep_position and not self.is_remote() else 0
+        self.beginResetModel()
+        self._reset_remote()
+        self._loader = None
+        self._rows = list(rows)
+        self._visible = min(len(self._rows), max(visible, self.BATCH_SIZE))
+        self.endResetModel()
+
+    def set_remote(self, loader, per_page: int = 100):
+        """
+        Mostrar el listado paginado del servidor.
+
+        loader(page, per_page, done) debe pedir la página y llamar a
+        done(result) en el hilo de la GUI con el resultado de la API.
+        """
+        self.beginResetModel()
+        self._reset_remote()
+        self._rows = []
+        self._visible = 0
+        self._loader = loader
+        self._per_page = per_page
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def _reset_remote(self):
+        self._generation += 1
+        self._pages.clear()
+        self._sizes = []
+        self._offsets = [0]
+        self._last_page = None
+        self._requested.clear()
+        self._failed = False
+
+    def invalidate_pages(self):
+        """
+        Olvidar las páginas guardadas sin mover la vista: las filas visibles
+        se vuelven a pedir al repintarse (p. ej. tras un cambio externo).
+        """
+        if not self.is_remote():
+            return
+        if not self._sizes:
+            # Aún sin filas: basta con volver a pedir la primera página
+            self.retry()
+            return
+        self._generation += 1
+        self._pages.clear()
+        self._requested.clear()
+        self._failed = False
+        self.dataChanged.emit(
+            self.index(0, 0), self.index(self.rowCount() - 1, len(self.COLUMNS) - 1)
+        )
+
+    def retry(self):
+        """Volver a pedir las páginas tras un fallo, conservando las cargadas"""
+        if not self.is_remote() or not self._failed:
+            return
+        self._failed = False
+        if self.rowCount():
+            # Las filas visibles sin página la piden al repintarse
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.rowCount() - 1, len(self.COLUMNS) - 1),
+            )
+        self.fetchMore(QModelIndex())
+
+    def update_row(self, row, usuario):
+        """Sustituir un usuario y repintar solo su fila"""
+        if self.is_remote():
+            if not 0 <= row < self.rowCount():
+                return
+            page, offset = self._locate(row)
+            rows = self._pages.get(page)
+            if rows is None or offset >= len(rows):
+                return
+            rows[offset] = usuario
+        elif 0 <= row < len(self._rows):
+            self._rows[row] = usuario
+            if row >= self._visible:
+                # Aún sin mostrar: no hay nada que repintar
+                return
+        else:
+            return
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, len(self.COLUMNS) - 1)
+        )
+
+    def replace_usuario(self, usuario) -> bool:
+        """Sustituir un usuario cargado por id; False si no está en memoria"""
+        row = self.row_of(usuario.get("id"))
+        if row is None:
+            return False
+        self.update_row(row, usuario)
+        return True
+
+    def remove_usuario(self, usuario_id) -> bool:
+        """Quitar la fila de un usuario cargado; False si no está en memoria"""
+        row = self.row_of(usuario_id)
+        if row is None:
+            return False
+        if not self.is_remote() and row >= self._visible:
+            del self._rows[row]
+            return True
+        self.beginRemoveRows(QModelIndex(), row, row)
+        if self.is_remote():
+            page, offset = self._locate(row)
+            del self._pages[page][offset]
+            self._sizes[page - 1] -= 1
+            self._rebuild_offsets()
+        else:
+            del self._rows[row]
+            self._visible -= 1
+        self.endRemoveRows()
+        return True
+
+    def row_of(self, usuario_id):
+        """Fila (quizá aún sin mostrar) de un usuario en memoria, o None"""
+        if self.is_remote():
+            for page, rows in self._pages.items():
+                for offset, usuario in enumerate(rows):
+                    if usuario.get("id") == usuario_id:
+                        return self._offsets[page - 1] + offset
+            return None
+        for row, usuario in enumerate(self._rows):
+            if usuario.get("id") == usuario_id:
+                return row
+        return None
+
+    def usuario_at(self, row):
+        """Usuario de una fila, o None si su página no está en memoria"""
+        if self.is_remote():
+            if not 0 <= row < self.rowCount():
+                return None
+            page, offset = self._locate(row)
+            rows = self._pages.get(page)
+            return rows[offset] if rows is not None and offset < len(rows) else None
+        return self._rows[row] if 0 <= row < self._visible else None
+
+    def loaded_rows(self):
+        """Todas las filas disponibles sin pedir nada al servidor"""
+        if self.is_remote():
+            return [u for page in sorted(self._pages) for u in self._pages[page]]
+        return list(self._rows)
+
+    # ============= PÁGINAS REMOTAS =============
+    def _locate(self, row):
+        """(página, posición dentro de la página) de una fila"""
+        index = bisect_right(self._offsets, row) - 1
+        index = min(max(index, 0), len(self._sizes) - 1)
+        return index + 1, row - self._offsets[index]
+
+    def _rebuild_offsets(self):
+        self._offsets = [0]
+        for size in self._sizes:
+            self._offsets.append(self._offsets[-1] + size)
+
+    def _request_page(self, page):
+        if self._failed or page in self._requested:
+            return
+        self._requested.add(page)
+        generation = self._generation
+        self._loader(
+            page,
+            self._per_page,
+            lambda result: self._on_page(generation, page, result),
+        )
+
+    def _on_page(self, generation, page, result):
+        if generation != self._generation:
+            return
+        self._requested.discard(page)
+        if not result.get("success"):
+            if not self._failed:
+                self._failed = True
+                self.loading_failed.emit(result.get("error", "Error desconocido"))
+            return
+
+        rows, meta = split_page(result)
+        if meta.get("last_page"):
+            self._last_page = meta["last_page"]
+        elif len(rows) < self._per_page:
+            self._last_page = page
+        if "total" in meta:
+            self.total_changed.emit(meta["total"])
+
+        if page == len(self._sizes) + 1:
+            # Página nueva al final
+            if not rows:
+                self._last_page = len(self._sizes)
+                return
+            first = self._offsets[-1]
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._pages[page] = list(rows)
+            self._sizes.append(len(rows))
+            self._offsets.append(first + len(rows))
+            self.endInsertRows()
+        elif page <= len(self._sizes):
+            # Página descartada que se volvió a pintar
+            self._pages[page] = list(rows)
+            if len(rows) != self._sizes[page - 1]:
+                # El listado cambió en el servidor mientras tanto
+                self.beginResetModel()
+                self._sizes[page - 1] = len(rows)
+                self._rebuild_offsets()
+                self.endResetModel()
+            else:
+                first = self._offsets[page - 1]
+                self.dataChanged.emit(
+                    self.index(first, 0),
+                    self.index(first + len(rows) - 1, len(self.COLUMNS) - 1),
+                )
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    # ============= QAbstractTableModel =============
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._offsets[-1] if self.is_remote() else self._visible
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        if self.is_remote():
+            return not self._failed and (
+                self._last_page is None or len(self._sizes) < self._last_page
+            )
+        return self._visible < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        if self.is_remote():
+            self._request_page(len(self._sizes) + 1)
+            return
+        count = min(self.BATCH_SIZE, len(self._rows) - self._visible)
+        self.beginInsertRows(QModelIndex(), self._visible, self._visible + count - 1)
+        self._visible += count
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal:
+            return None
+        if role == Qt.DisplayRole:
+            text = self.COLUMNS[section]
+            for position, (column, descending) in enumerate(self._sort):
+                if column == section:
+                    text += " ▼" if descending else " ▲"
+                    if len(self._sort) > 1:
+                        text += str(position + 1)
+            return text
+        if role == Qt.ToolTipRole and section < self.ACTIONS_COLUMN:
+            return "Clic para ordenar; Mayús+clic para añadir un criterio"
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if self.is_remote():
+            page, offset = self._locate(index.row())
+            rows = self._pages.get(page)
+            if rows is None:
+                self._request_page(page)
+                return self._placeholder(column, role)
+            self._pages.move_to_end(page)
+            if offset >= len(rows):
+                return self._placeholder(column, role)
+            usuario = rows[offset]
+        else:
+            usuario = self._rows[index.row()]
+
+        if role == Qt.UserRole:
+            return usuario
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(usuario.get("id", ""))
+            if column == 1:
+                return usuario.get("nombre", "")
+            if column == 2:
+                return usuario.get("email", "")
+            if column == 3:
+                return usuario.get("rol", "")
+            if column == 4:
+                return (usuario.get("estado") or "").capitalize()
+            return None
+        if role == Qt.TextAlignmentRole and column in (0, 3, 4):
+            return Qt.AlignCenter
+        if role == Qt.FontRole and column in (1, 2, 3, 4):
+            if column == 3 and usuario.get("rol") == "administrador":
+                return self._font_bold
+            return self._font
+        if role == Qt.ForegroundRole and column == 3:
+            if usuario.get("rol") == "administrador":
+                return self._color_admin
+            return self._color_aprendiz
+        if role == Qt.ForegroundRole and column == 4:
+            if usuario.get("estado") == "activo":
+                return self._color_activo
+            return self._color_inactivo
+        return None
+
+    def _placeholder(self, column, role):
+        """Fila cuya página se está pidiendo"""
+        if role == Qt.DisplayRole and column < self.ACTIONS_COLUMN:
+            return self.PLACEHOLDER
+        if role == Qt.ForegroundRole:
+            return self._color_placeholder
+        if role == Qt.TextAlignmentRole and column in (0, 3, 4):
+            return Qt.AlignCenter
+        return None
+
+
+class UserActionsDelegate(QStyledItemDelegate):
+    """
+    Pinta los botones Editar / estado / ✕ de la columna de acciones y
+    traduce los clics en señales con el usuario de la fila.
+    """
+
+    edit_clicked = pyqtSignal(object)
+    toggle_clicked = pyqtSignal(object)
+    delete_clicked = pyqtSignal(object)
+
+    # (clave, ancho, alto, radio)
+    BUTTONS = [("edit", 70, 32, 4), ("estado", 32, 32, 16), ("delete", 32, 32, 4)]
+    SPACING = 8
+
+    TOOLTIPS = {
+        "edit": "Editar usuario",
+        "delete": "Eliminar usuario",
+    }
+
+    def __init__(self, view):
+        super().__init__(view)
+        self._hover = None  # (fila, botón) bajo el ratón
+        self._font_edit = QFont("Segoe UI", 9, QFont.Bold)
+        self._font_icon = QFont("Segoe UI", 12, QFont.Bold)
+        # (normal, hover)
+        self._color_edit = (QColor("#3498db"), QColor("#2980b9"))
+        self._color_activo = (QColor("#2ecc71"), QColor("#27ae60"))
+        self._color_peligro = (QColor("#e74c3c"), QColor("#c0392b"))
+        view.setMouseTracking(True)
+        view.viewport().installEventFilter(self)
+
+    def _button_rects(self, cell: QRect):
+        total = sum(w for _, w, _, _ in self.BUTTONS) + self.SPACING * (
+            len(self.BUTTONS) - 1
+        )
+        x = cell.x() + (cell.width() - total) // 2
+        rects = []
+        for key, width, height, radius in self.BUTTONS:
+            y = cell.y() + (cell.height() - height) // 2
+            rects.append((key, QRect(x, y, width, height), radius))
+            x += width + self.SPACING
+        return rects
+
+    def _button_at(self, cell: QRect, pos):
+        for key, rect, _ in self._button_rects(cell):
+            if rect.contains(pos):
+                return key
+        return None
+
+    def paint(self, painter, option, index):
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        usuario = index.data(Qt.UserRole)
+        if usuario is None:
+            # Página aún sin cargar
+            return
+        activo = usuario.get("estado") == "activo"
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        for key, rect, radius in self._button_rects(option.rect):
+            if key == "edit":
+                colors, text, font = self._color_edit, "Editar", self._font_edit
+            elif key == "estado":
+                colors = self._color_activo if activo else self._color_peligro
+                text, font = "●", self._font_icon
+            else:
+                colors, text, font = self._color_peligro, "✕", self._font_icon
+            hovered = self._hover == (index.row(), key)
+
+            path = QPainterPath()
+            path.addRoundedRect(QRectF(rect), radius, radius)
+            painter.fillPath(path, colors[1] if hovered else colors[0])
+            painter.setPen(Qt.white)
+            painter.setFont(font)
+            painter.drawText(rect, Qt.AlignCenter, text)
+            painter.setPen(Qt.NoPen)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseMove:
+            key = self._button_at(option.rect, event.pos())
+            hover = (index.row(), key) if key else None
+            if hover != self._hover:
+                self._set_hover(hover)
+            return False
+        if (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+        ):
+            key = self._button_at(option.rect, event.pos())
+            if key is None:
+                return False
+            usuario = index.data(Qt.UserRole)
+            if usuario is None:
+                return True
+            if key == "edit":
+                self.edit_clicked.emit(usuario)
+            elif key == "estado":
+                self.toggle_clicked.emit(usuario)
+            else:
+                self.delete_clicked.emit(usuario)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+    def helpEvent(self, event, view, option, index):
+        key = self._button_at(option.rect, event.pos())
+        if key is None:
+            return super().helpEvent(event, view, option, index)
+        if key == "estado":
+            usuario = index.data(Qt.UserRole) or {}
+            text = (
+                "Activo - Click para inactivar"
+                if usuario.get("estado") == "activo"
+                else "Inactivo - Click para activar"
+            )
+        else:
+            text = self.TOOLTIPS[key]
+        QToolTip.showText(event.globalPos(), text, view)
+        return True
+
+    def _set_hover(self, hover):
+        self._hover = hover
+        viewport = self.parent().viewport()
+        viewport.setCursor(Qt.PointingHandCursor if hover else Qt.ArrowCursor)
+        viewport.update()
+
+    def eventFilter(self, obj, event):
+        """Quitar el resaltado al salir de la columna de acciones"""
+        if self._hover is not None:
+            if event.type() == QEvent.Leave:
+                self._set_hover(None)
+            elif event.type() == QEvent.MouseMove:
+                index = self.parent().indexAt(event.pos())
+                if index.column() != UsersTableModel.ACTIONS_COLUMN:
+                    self._set_hover(None)
+        return False
@@ -19,6 +19,8 @@ from PyQt5.QtGui import QFont, QPainter, QColor, QPen, QLinearGradient
 from datetime import datetime
 import locale
 import logging
+from controllers.api_client import Priority
+from views.components.store_list import StoreListBinding
 from utils.paths import resource_path
 
 # Configurar locale en español para fechas
@@ -342,7 +344,12 @@ class DashboardView(QWidget):
         super().__init__()
         self.api_client = api_client
         self.cards = {}
-        self.modulos = []
+        # Los módulos se leen del almacén; los conteos de lecciones se guardan
+        # aparte para no modificar sus entidades
+        self._modulos = StoreListBinding(
+            self, api_client.store, "modulo", self._on_modulos_store
+        )
+        self._lecciones_count = {}
 
         # Variables para control de carga
         self.is_visible = False
@@ -527,6 +534,9 @@ class DashboardView(QWidget):
             self._schedule_update("usuarios", delay=100)
         elif data_type in ["modulos", "lecciones"]:
             self._schedule_update("modulos", delay=200)
+        elif data_type == "dashboard":
+            # Llegaron datos frescos tras pintar la copia de disco
+            self._schedule_update("full", delay=100)
 
     def on_usuarios_changed(self):
         """Cambios en usuarios"""
@@ -581,8 +591,12 @@ class DashboardView(QWidget):
     def _quick_update_usuarios(self):
         """Actualizar solo usuarios"""
         logger.info("⚡ Actualizando usuarios...")
-        result = self.api_client.get_dashboard_stats()
+        self.api_client.submit_async(
+            self.api_client.get_dashboard_stats,
+            callback=self._on_usuarios_actualizados,
+        )
 
+    def _on_usuarios_actualizados(self, result):
         if result.get("success"):
             data = result.get("data", {})
             usuarios = data.get("usuarios", {})
@@ -596,28 +610,18 @@ class DashboardView(QWidget):
         """Actualizar módulos y conteos"""
         logger.info("⚡ Actualizando módulos...")
 
-        # Actualizar número de módulos
-        result = self.api_client.get_modulos(force_refresh=True)
+        # Solo los módulos cambiados desde la última sincronización
+        self.api_client.submit_async(
+            self.api_client.sync_modulos,
+            callback=self._on_modulos_actualizados,
+        )
 
+    def _on_modulos_actualizados(self, result):
         if result.get("success"):
-            data = result.get("data", [])
-            if isinstance(data, list):
-                self.cards["modulos"].set_value(len(data))
-
-                # Actualizar vista de módulos
-                modulos_para_mostrar = []
-                for modulo in data[:6]:
-                    lecciones = modulo.get("lecciones_count", 0)
-                    modulos_para_mostrar.append(
-                        {
-                            "titulo": modulo.get("titulo", ""),
-                            "lecciones_count": lecciones,
-                            "id": modulo.get("id"),
-                        }
-                    )
-
-                self.modulos_card.update_data(modulos_para_mostrar)
-                logger.info(f"✅ Módulos actualizados: {len(data)}")
+            # sync_modulos ya volcó la colección en el almacén
+            self.cards["modulos"].set_value(len(self.modulos))
+            self.modulos_card.update_data(self._modulos_con_conteo())
+            logger.info(f"✅ Módulos actualizados: {len(self.modulos)}")
 
         self.loading_indicator.stop_loading()
 
@@ -674,13 +678,14 @@ class DashboardView(QWidget):
     def load_stats(self, initial_load=False, background=False, manual_refresh=False):
         """Cargar estadísticas"""
         if initial_load:
+            # Aprovechar lo que preload_cache ya dejó en caché
             self._full_load()
         elif manual_refresh:
-            self._full_load()
+            self._full_load(force_refresh=True)
         elif background and self.is_visible:
             self._quick_load()
 
-    def _full_load(self):
+    def _full_load(self, force_refresh=False):
         """Carga completa"""
         logger.info("🔄 Carga completa del dashboard")
         self.loading_indicator.start_loading("Cargando dashboard completo...")
@@ -688,9 +693,16 @@ class DashboardView(QWidget):
         self._last_refresh = datetime.now()
         self.update_date()
 
-        # Cargar estadísticas
-        result = self.api_client.get_dashboard_stats(force_refresh=True)
+        # Cargar estadísticas y, en paralelo, los módulos
+        self.api_client.submit_async(
+            self.api_client.get_dashboard_stats,
+            force_refresh=force_refresh,
+            callback=self._on_full_stats_loaded,
+        )
+        self._load_modulos_background(force_refresh)
 
+    def _on_full_stats_loaded(self, result):
+        """Callback de las estadísticas de la carga completa"""
         if result["success"]:
             data = result.get("data", {})
             if isinstance(data, dict):
@@ -702,16 +714,20 @@ class DashboardView(QWidget):
                 self.cards["modulos"].set_value(contenido.get("modulos", 0))
                 self.cards["certificaciones"].set_value(certificaciones.get("total", 0))
 
-        # Cargar módulos
-        self._load_modulos_background()
-
     def _quick_load(self):
         """Carga rápida"""
         logger.info("⚡ Carga rápida del dashboard")
         self.loading_indicator.start_loading("Actualizando números...")
 
-        result = self.api_client.get_dashboard_stats()
+        # Refresco periódico: cede el paso a lo que pida el usuario
+        self.api_client.submit_async(
+            self.api_client.get_dashboard_stats,
+            callback=self._on_quick_loaded,
+            priority=Priority.BACKGROUND,
+        )
 
+    def _on_quick_loaded(self, result):
+        """Callback de la carga rápida"""
         if result["success"]:
             data = result.get("data", {})
             if isinstance(data, dict):
@@ -723,10 +739,13 @@ class DashboardView(QWidget):
 
         self.loading_indicator.stop_loading()
 
-    def _load_modulos_background(self):
+    def _load_modulos_background(self, force_refresh=False):
         """Cargar módulos en segundo plano"""
         self.api_client.get_async(
-            "/admin/modulos", self._on_modulos_loaded, force_refresh=True
+            "/admin/modulos",
+            self._on_modulos_loaded,
+            cache_type="modulos",
+            force_refresh=force_refresh,
         )
 
     def _on_modulos_loaded(self, result):
@@ -736,13 +755,35 @@ class DashboardView(QWidget):
             return
 
         if result and result.get("success"):
-            data = result.get("data", [])
-            if isinstance(data, list):
-                self.modulos = data
-                self._load_lecciones_counts_light()
+            self._modulos.ingest(result)
+            # Carga completa: volver a contar las lecciones
+            self._lecciones_count.clear()
+            self._load_lecciones_counts_light()
         else:
             self.loading_indicator.stop_loading()
 
+    @property
+    def modulos(self):
+        return self._modulos.rows
+
+    def _on_modulos_store(self, modulos):
+        """Repintar la tarjeta cuando cambian los módulos en el almacén"""
+        if self.is_visible:
+            self.cards["modulos"].set_value(len(modulos))
+            self.modulos_card.update_data(self._modulos_con_conteo())
+
+    def _modulos_con_conteo(self):
+        """Los módulos a mostrar con su número de lecciones"""
+        return [
+            {
+                **modulo,
+                "lecciones_count": modulo.get(
+                    "lecciones_count", self._lecciones_count.get(modulo.get("id"), 0)
+                ),
+            }
+            for modulo in self.modulos[:6]
+        ]
+
     def _load_lecciones_counts_light(self):
         """Cargar conteos de lecciones"""
         modulos_a_mostrar = self.modulos[:6]
@@ -752,38 +793,40 @@ class DashboardView(QWidget):
             self.loading_indicator.stop_loading()
             return
 
-        # Verificar si ya tienen conteo
-        todos_con_conteo = all("lecciones_count" in m for m in modulos_a_mostrar)
+        # Módulos sin conteo en el listado ni calculado antes
+        sin_conteo = [
+            m
+            for m in modulos_a_mostrar
+            if "lecciones_count" not in m and m.get("id") not in self._lecciones_count
+        ]
 
-        if todos_con_conteo:
-            self.modulos_card.update_data(modulos_a_mostrar)
+        if not sin_conteo:
+            self.modulos_card.update_data(self._modulos_con_conteo())
             self.loading_indicator.stop_loading()
             return
 
         # Cargar conteos pendientes
-        self.modulos_pendientes = len(modulos_a_mostrar)
+        self.modulos_pendientes = len(sin_conteo)
         self.modulos_completados = 0
 
-        for modulo in modulos_a_mostrar:
-            if "lecciones_count" not in modulo:
-                self.api_client.get_async(
-                    f"/admin/modulos/{modulo['id']}/lecciones",
-                    lambda result, m=modulo: self._update_modulo_count(result, m),
-                    params={"per_page": 1},
-                )
-            else:
-                self.modulos_completados += 1
+        for modulo in sin_conteo:
+            self.api_client.get_async(
+                f"/admin/modulos/{modulo['id']}/lecciones",
+                lambda result, m=modulo["id"]: self._update_modulo_count(result, m),
+                params={"per_page": 1},
+            )
 
-    def _update_modulo_count(self, result, modulo):
+    def _update_modulo_count(self, result, modulo_id):
         """Actualizar conteo de un módulo"""
         if result and result.get("success"):
             data = result.get("data", [])
-            modulo["lecciones_count"] = len(data) if isinstance(data, list) else 0
+            count = len(data) if isinstance(data, list) else 0
         else:
-            modulo["lecciones_count"] = 0
+            count = 0
+        self._lecciones_count[modulo_id] = count
 
         self.modulos_completados += 1
 
         if self.modulos_completados >= self.modulos_pendientes:
-            self.modulos_card.update_data(self.modulos[:6])
+            self.modulos_card.update_data(self._modulos_con_conteo())
             self.loading_indicator.stop_loading()
@@ -30,7 +30,10 @@ import logging
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
+from controllers.api_client import CancellationScope, Priority
+from views.components.store_list import StoreListBinding
 from utils.paths import resource_path
+from views.components.store_combo import StoreComboBinding
 
 
 class EvaluationConfigDialog(QDialog):
@@ -902,13 +905,20 @@ class EvaluationsView(QWidget):
     def __init__(self, api_client):
         super().__init__()
         self.api_client = api_client
-        self.modulos = []
         self.modulo_actual = None
         self.evaluacion_actual = None
         self.preguntas = []
+        # Cambiar de módulo deja obsoleta la carga anterior
+        self._evaluacion_scope = CancellationScope(self)
+        # Los módulos se leen del almacén (ver StoreListBinding)
+        self._modulos = StoreListBinding(self, api_client.store, "modulo")
         self.setup_ui()
         self.load_modulos()
 
+    @property
+    def modulos(self):
+        return self._modulos.rows
+
     def setup_ui(self):
         self.setStyleSheet(
             """
@@ -972,6 +982,9 @@ class EvaluationsView(QWidget):
 
         self.modulo_combo = QComboBox()
         self.modulo_combo.currentIndexChanged.connect(self.cambiar_modulo)
+        StoreComboBinding(
+            self.modulo_combo, self.api_client.store, "modulo", "Seleccione un módulo"
+        )
         self.modulo_combo.setMinimumWidth(250)
         module_selector.addWidget(self.modulo_combo)
 
@@ -1102,24 +1115,22 @@ class EvaluationsView(QWidget):
     def load_modulos(self):
         """Cargar lista de módulos"""
         logger.debug("Cargando módulos...")
-        result = self.api_client.get_modulos()
+        self.api_client.submit_async(
+            self.api_client.get_modulos, callback=self._on_modulos_cargados
+        )
 
+    def _on_modulos_cargados(self, result):
         if result["success"]:
-            data = result.get("data", [])
-            if isinstance(data, list):
-                self.modulos = data
-            elif isinstance(data, dict) and "data" in data:
-                self.modulos = data["data"]
-            else:
-                self.modulos = []
-
-            self.modulo_combo.clear()
-            self.modulo_combo.addItem("Seleccione un módulo", None)
-            for modulo in self.modulos:
-                self.modulo_combo.addItem(f"{modulo.get('titulo')}", modulo.get("id"))
+            # Después de la primera carga el combo lo mantiene StoreComboBinding
+            if self.modulo_combo.count() == 0:
+                self.modulo_combo.addItem("Seleccione un módulo", None)
+                for modulo in self._modulos.ingest(result):
+                    self.modulo_combo.addItem(
+                        f"{modulo.get('titulo')}", modulo.get("id")
+                    )
 
-            self.mostrar_sin_evaluacion()
-            self.new_question_btn.setEnabled(False)
+                self.mostrar_sin_evaluacion()
+                self.new_question_btn.setEnabled(False)
         else:
             QMessageBox.warning(
                 self, "Error", f"Error al cargar módulos: {result.get('error')}"
@@ -1127,6 +1138,7 @@ class EvaluationsView(QWidget):
 
     def cambiar_modulo(self, index):
         """Cambiar módulo seleccionado"""
+        self._evaluacion_scope.cancel()
         if index <= 0:
             self.modulo_actual = None
             self.mostrar_sin_evaluacion()
@@ -1134,9 +1146,7 @@ class EvaluationsView(QWidget):
             return
 
         modulo_id = self.modulo_combo.currentData()
-        self.modulo_actual = next(
-            (m for m in self.modulos if m.get("id") == modulo_id), None
-        )
+        self.modulo_actual = self.api_client.store.get("modulo", modulo_id)
 
         if self.modulo_actual:
             self.load_evaluacion(modulo_id)
@@ -1144,8 +1154,16 @@ class EvaluationsView(QWidget):
     def load_evaluacion(self, modulo_id):
         """Cargar evaluación del módulo"""
         logger.debug(f"Cargando evaluación del módulo {modulo_id}...")
-        result = self.api_client.get_evaluacion(modulo_id)
+        self.api_client.submit_async(
+            self.api_client.get_evaluacion,
+            modulo_id,
+            callback=lambda result: self._on_evaluacion_loaded(result, modulo_id),
+            priority=Priority.INTERACTIVE,
+            token=self._evaluacion_scope.renew(),
+        )
 
+    def _on_evaluacion_loaded(self, result, modulo_id):
+        """Pintar la evaluación recibida"""
         if result["success"]:
             data = result.get("data", {})
             if isinstance(data, dict) and data:
@@ -1343,18 +1361,26 @@ class EvaluationsView(QWidget):
 
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
-
-            result = self.api_client.update_evaluacion_config(
-                self.modulo_actual.get("id"), data
+            modulo_id = self.modulo_actual.get("id")
+            self.api_client.submit_async(
+                self.api_client.update_evaluacion_config,
+                modulo_id,
+                data,
+                callback=lambda result: self._on_config_guardada(result, modulo_id),
+                priority=Priority.INTERACTIVE,
             )
 
-            if result["success"]:
-                QMessageBox.information(
-                    self, "Éxito", "Configuración guardada correctamente"
-                )
-                self.load_evaluacion(self.modulo_actual.get("id"))
-            else:
-                QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
+    def _on_config_guardada(self, result, modulo_id):
+        if result["success"]:
+            QMessageBox.information(self, "Éxito", "Configuración guardada correctamente")
+            self._recargar_si_actual(modulo_id)
+        else:
+            QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
+
+    def _recargar_si_actual(self, modulo_id):
+        """Recargar la evaluación si el módulo sigue seleccionado"""
+        if self.modulo_actual and self.modulo_actual.get("id") == modulo_id:
+            self.load_evaluacion(modulo_id)
 
     def nueva_pregunta(self):
         """Crear nueva pregunta"""
@@ -1368,16 +1394,24 @@ class EvaluationsView(QWidget):
 
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
-
-            result = self.api_client.create_pregunta(
-                self.modulo_actual.get("id"), self.evaluacion_actual.get("id"), data
+            modulo_id = self.modulo_actual.get("id")
+            self.api_client.submit_async(
+                self.api_client.create_pregunta,
+                modulo_id,
+                self.evaluacion_actual.get("id"),
+                data,
+                callback=lambda result: self._on_pregunta_creada(result, modulo_id),
+                priority=Priority.INTERACTIVE,
             )
 
-            if result["success"]:
-                QMessageBox.information(self, "Éxito", "Pregunta creada correctamente")
-                self.load_evaluacion(self.modulo_actual.get("id"))
-            else:
-                QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
+    def _on_pregunta_creada(self, result, modulo_id):
+        if result["success"]:
+            QMessageBox.information(self, "Éxito", "Pregunta creada correctamente")
+            self._recargar_si_actual(modulo_id)
+        elif result.get("queued"):
+            QMessageBox.information(self, "Guardado sin conexión", result["error"])
+        else:
+            QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
 
     def editar_pregunta(self, pregunta):
         """Editar pregunta existente"""
@@ -1390,19 +1424,26 @@ class EvaluationsView(QWidget):
 
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
-
-            result = self.api_client.update_pregunta(
-                self.modulo_actual.get("id"),
+            modulo_id = self.modulo_actual.get("id")
+            self.api_client.submit_async(
+                self.api_client.update_pregunta,
+                modulo_id,
                 self.evaluacion_actual.get("id"),
                 pregunta["id"],
                 data,
+                callback=lambda result: self._on_pregunta_guardada(
+                    result, modulo_id, "Pregunta actualizada"
+                ),
+                priority=Priority.INTERACTIVE,
             )
 
-            if result["success"]:
-                QMessageBox.information(self, "Éxito", "Pregunta actualizada")
-                self.load_evaluacion(self.modulo_actual.get("id"))
-            else:
-                QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
+    def _on_pregunta_guardada(self, result, modulo_id, mensaje=None):
+        if result["success"]:
+            if mensaje:
+                QMessageBox.information(self, "Éxito", mensaje)
+            self._recargar_si_actual(modulo_id)
+        else:
+            QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
 
     def eliminar_pregunta(self, pregunta):
         """Eliminar pregunta"""
@@ -1414,17 +1455,16 @@ class EvaluationsView(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            result = self.api_client.delete_pregunta(
-                self.modulo_actual.get("id"),
+            modulo_id = self.modulo_actual.get("id")
+            self.api_client.submit_async(
+                self.api_client.delete_pregunta,
+                modulo_id,
                 self.evaluacion_actual.get("id"),
                 pregunta["id"],
+                callback=lambda result: self._on_pregunta_guardada(result, modulo_id),
+                priority=Priority.INTERACTIVE,
             )
 
-            if result["success"]:
-                self.load_evaluacion(self.modulo_actual.get("id"))
-            else:
-                QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
-
     def clear_layout(self, layout):
         """Limpiar un layout"""
         while layout.count():
@@ -27,7 +27,10 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QColor
 import logging
+from controllers.api_client import CancellationScope, Priority
+from views.components.store_list import StoreListBinding
 from utils.paths import resource_path
+from views.components.store_combo import StoreComboBinding
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -920,13 +923,27 @@ class ExercisesView(QWidget):
         super().__init__()
         self.api_client = api_client
         self.ejercicios = []
-        self.modulos = []
-        self.lecciones = []
         self.modulo_actual = None
         self.leccion_actual = None
+        # Cada selección en los combos deja obsoleta la carga anterior
+        self._lecciones_scope = CancellationScope(self)
+        self._ejercicios_scope = CancellationScope(self)
+        # Módulos y lecciones se leen del almacén (ver StoreListBinding)
+        self._modulos = StoreListBinding(self, api_client.store, "modulo")
+        self._lecciones = StoreListBinding(
+            self, api_client.store, "leccion", self._pintar_lecciones, root=False
+        )
         self.setup_ui()
         self.load_modulos()
 
+    @property
+    def modulos(self):
+        return self._modulos.rows
+
+    @property
+    def lecciones(self):
+        return self._lecciones.rows
+
     def setup_ui(self):
         self.setStyleSheet(
             """
@@ -1004,6 +1021,9 @@ class ExercisesView(QWidget):
         module_layout.addWidget(QLabel("Módulo:"))
         self.modulo_combo = QComboBox()
         self.modulo_combo.currentIndexChanged.connect(self.cambiar_modulo)
+        StoreComboBinding(
+            self.modulo_combo, self.api_client.store, "modulo", "Seleccione un módulo"
+        )
         module_layout.addWidget(self.modulo_combo)
         selectors_layout.addLayout(module_layout)
 
@@ -1056,71 +1076,81 @@ class ExercisesView(QWidget):
 
     def load_modulos(self):
         logger.debug("Cargando módulos...")
-        result = self.api_client.get_modulos()
+        self.api_client.submit_async(
+            self.api_client.get_modulos, callback=self._on_modulos_cargados
+        )
 
+    def _on_modulos_cargados(self, result):
         if result["success"]:
-            data = result.get("data", [])
-            if isinstance(data, list):
-                self.modulos = data
-            elif isinstance(data, dict) and "data" in data:
-                self.modulos = data["data"]
-            else:
-                self.modulos = []
-
-            self.modulo_combo.clear()
-            self.modulo_combo.addItem("Seleccione un módulo", None)
-            for modulo in self.modulos:
-                self.modulo_combo.addItem(f"{modulo.get('titulo')}", modulo.get("id"))
+            # Después de la primera carga el combo lo mantiene StoreComboBinding
+            if self.modulo_combo.count() == 0:
+                self.modulo_combo.addItem("Seleccione un módulo", None)
+                for modulo in self._modulos.ingest(result):
+                    self.modulo_combo.addItem(
+                        f"{modulo.get('titulo')}", modulo.get("id")
+                    )
 
-            self.leccion_combo.clear()
-            self.leccion_combo.addItem("Primero seleccione un módulo", None)
-            self.new_btn.setEnabled(False)
+                self.leccion_combo.clear()
+                self.leccion_combo.addItem("Primero seleccione un módulo", None)
+                self.new_btn.setEnabled(False)
         else:
             QMessageBox.warning(
                 self, "Error", f"Error al cargar módulos: {result.get('error')}"
             )
 
     def cambiar_modulo(self, index):
+        self._lecciones_scope.cancel()
+        self._ejercicios_scope.cancel()
         if index <= 0:
             self.modulo_actual = None
+            self._lecciones.set_parent(None)
             self.leccion_combo.clear()
             self.leccion_combo.addItem("Seleccione un módulo primero", None)
             self.new_btn.setEnabled(False)
             return
 
         modulo_id = self.modulo_combo.currentData()
-        self.modulo_actual = next(
-            (m for m in self.modulos if m.get("id") == modulo_id), None
-        )
+        self.modulo_actual = self.api_client.store.get("modulo", modulo_id)
+        self._lecciones.set_parent(("modulo", modulo_id))
 
         if self.modulo_actual:
             self.load_lecciones(modulo_id)
 
     def load_lecciones(self, modulo_id):
         logger.debug(f"Cargando lecciones del módulo {modulo_id}...")
-        result = self.api_client.get_lecciones(modulo_id)
+        self.api_client.submit_async(
+            self.api_client.get_lecciones,
+            modulo_id,
+            callback=self._on_lecciones_loaded,
+            priority=Priority.INTERACTIVE,
+            token=self._lecciones_scope.renew(),
+        )
 
+    def _on_lecciones_loaded(self, result):
         if result["success"]:
-            data = result.get("data", [])
-            if isinstance(data, list):
-                self.lecciones = data
-            elif isinstance(data, dict) and "data" in data:
-                self.lecciones = data["data"]
-            else:
-                self.lecciones = []
-
-            self.leccion_combo.clear()
-            self.leccion_combo.addItem("Seleccione una lección", None)
-            for leccion in self.lecciones:
-                self.leccion_combo.addItem(
-                    f"{leccion.get('titulo')}", leccion.get("id")
-                )
+            self._pintar_lecciones(self._lecciones.ingest(result))
         else:
             QMessageBox.warning(
                 self, "Error", f"Error al cargar lecciones: {result.get('error')}"
             )
 
+    def _pintar_lecciones(self, lecciones):
+        """Rehacer el combo de lecciones conservando la selección"""
+        selected = self.leccion_combo.currentData()
+        self.leccion_combo.blockSignals(True)
+        self.leccion_combo.clear()
+        self.leccion_combo.addItem("Seleccione una lección", None)
+        for leccion in lecciones:
+            self.leccion_combo.addItem(f"{leccion.get('titulo')}", leccion.get("id"))
+        index = self.leccion_combo.findData(selected) if selected is not None else 0
+        self.leccion_combo.setCurrentIndex(max(index, 0))
+        self.leccion_combo.blockSignals(False)
+        if index < 0:
+            # La lección seleccionada ya no existe
+            self.cambiar_leccion(0)
+
     def cambiar_leccion(self, index):
+        self._ejercicios_scope.cancel()
         if index <= 0:
             self.leccion_actual = None
             self.new_btn.setEnabled(False)
@@ -1129,9 +1159,7 @@ class ExercisesView(QWidget):
             return
 
         leccion_id = self.leccion_combo.currentData()
-        self.leccion_actual = next(
-            (l for l in self.lecciones if l.get("id") == leccion_id), None
-        )
+        self.leccion_actual = self.api_client.store.get("leccion", leccion_id)
 
         if self.leccion_actual:
             self.new_btn.setEnabled(True)
@@ -1141,8 +1169,16 @@ class ExercisesView(QWidget):
         logger.debug(f"Cargando ejercicios de la lección {leccion_id}...")
         self.table.setRowCount(0)
 
-        result = self.api_client.get_ejercicios(modulo_id, leccion_id)
+        self.api_client.submit_async(
+            self.api_client.get_ejercicios,
+            modulo_id,
+            leccion_id,
+            callback=self._on_ejercicios_loaded,
+            priority=Priority.INTERACTIVE,
+            token=self._ejercicios_scope.renew(),
+        )
 
+    def _on_ejercicios_loaded(self, result):
         if result["success"]:
             data = result.get("data", [])
             logger.debug(f"Ejercicios recibidos: {data}")
@@ -1263,19 +1299,12 @@ class ExercisesView(QWidget):
 
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
-
-            result = self.api_client.create_ejercicio(
-                self.modulo_actual.get("id"), self.leccion_actual.get("id"), data
+            self._mutar_ejercicio(
+                self.api_client.create_ejercicio,
+                data,
+                mensaje="Ejercicio creado correctamente",
             )
 
-            if result["success"]:
-                QMessageBox.information(self, "Éxito", "Ejercicio creado correctamente")
-                self.load_ejercicios(
-                    self.modulo_actual.get("id"), self.leccion_actual.get("id")
-                )
-            else:
-                QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
-
     def editar_ejercicio(self, ejercicio):
         if not self.modulo_actual or not self.leccion_actual:
             return
@@ -1289,22 +1318,13 @@ class ExercisesView(QWidget):
 
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
-
-            result = self.api_client.update_ejercicio(
-                self.modulo_actual.get("id"),
-                self.leccion_actual.get("id"),
+            self._mutar_ejercicio(
+                self.api_client.update_ejercicio,
                 ejercicio["id"],
                 data,
+                mensaje="Ejercicio actualizado",
             )
 
-            if result["success"]:
-                QMessageBox.information(self, "Éxito", "Ejercicio actualizado")
-                self.load_ejercicios(
-                    self.modulo_actual.get("id"), self.leccion_actual.get("id")
-                )
-            else:
-                QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
-
     def eliminar_ejercicio(self, ejercicio):
         reply = QMessageBox.question(
             self,
@@ -1314,15 +1334,33 @@ class ExercisesView(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            result = self.api_client.delete_ejercicio(
-                self.modulo_actual.get("id"),
-                self.leccion_actual.get("id"),
-                ejercicio["id"],
-            )
+            self._mutar_ejercicio(self.api_client.delete_ejercicio, ejercicio["id"])
+
+    def _mutar_ejercicio(self, func, *args, mensaje=None):
+        """Enviar la mutación en un worker y recargar la lección al terminar"""
+        modulo_id = self.modulo_actual.get("id")
+        leccion_id = self.leccion_actual.get("id")
+        self.api_client.submit_async(
+            func,
+            modulo_id,
+            leccion_id,
+            *args,
+            callback=lambda result: self._on_ejercicio_mutado(
+                result, modulo_id, leccion_id, mensaje
+            ),
+            priority=Priority.INTERACTIVE,
+        )
 
-            if result["success"]:
-                self.load_ejercicios(
-                    self.modulo_actual.get("id"), self.leccion_actual.get("id")
-                )
-            else:
-                QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
+    def _on_ejercicio_mutado(self, result, modulo_id, leccion_id, mensaje):
+        if not result["success"]:
+            QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
+            return
+        if mensaje:
+            QMessageBox.information(self, "Éxito", mensaje)
+        if (
+            self.modulo_actual
+            and self.leccion_actual
+            and self.modulo_actual.get("id") == modulo_id
+            and self.leccion_actual.get("id") == leccion_id
+        ):
+            self.load_ejercicios(modulo_id, leccion_id)
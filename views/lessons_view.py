@@ -29,6 +29,9 @@ from PyQt5.QtGui import QFont, QColor
 import logging
 
 from views.components.rich_text_editor import RichTextEditor
+from views.components.store_combo import StoreComboBinding
+from views.components.store_list import StoreListBinding
+from controllers.api_client import CancellationScope, Priority
 from views.exercises_view import ExerciseDialog  # <-- IMPORTANTE: esta importación
 from utils.paths import resource_path
 
@@ -158,6 +161,7 @@ class LessonDialog(QDialog):
         self.modulo_id = modulo_id
         self.lesson_data = lesson_data
         self.ejercicios = []
+        self._ejercicios_scope = CancellationScope(self)
         self.setWindowTitle("Editar Lección" if lesson_data else "Nueva Lección")
         self.setMinimumSize(800, 700)
         self.setup_ui()
@@ -381,10 +385,17 @@ class LessonDialog(QDialog):
             return
 
         logger.debug(f"Cargando ejercicios para lección {self.lesson_data['id']}")
-        self.exercises_list.clear()
-
-        result = self.api_client.get_ejercicios(self.modulo_id, self.lesson_data["id"])
+        self.api_client.submit_async(
+            self.api_client.get_ejercicios,
+            self.modulo_id,
+            self.lesson_data["id"],
+            callback=self._on_ejercicios_cargados,
+            priority=Priority.INTERACTIVE,
+            token=self._ejercicios_scope.renew(),
+        )
 
+    def _on_ejercicios_cargados(self, result):
+        self.exercises_list.clear()
         if result["success"]:
             data = result.get("data", [])
             if isinstance(data, list):
@@ -430,21 +441,24 @@ class LessonDialog(QDialog):
                 return
 
             logger.debug(f"Creando ejercicio con datos: {data}")
-            result = self.api_client.create_ejercicio(
-                self.modulo_id, self.lesson_data["id"], data
+            self._mutar_ejercicio(
+                self.api_client.create_ejercicio,
+                data,
+                callback=self._on_ejercicio_creado,
             )
 
-            if result["success"]:
-                QMessageBox.information(self, "Éxito", "Ejercicio creado correctamente")
-                self.cargar_ejercicios()
-                # Asegurar que el checkbox esté marcado
-                if not self.ejercicios_check.isChecked():
-                    self.ejercicios_check.setChecked(True)
-            else:
-                error_msg = result.get("error", "Error desconocido")
-                QMessageBox.critical(
-                    self, "Error", f"Error al crear ejercicio:\n{error_msg}"
-                )
+    def _on_ejercicio_creado(self, result):
+        if result["success"]:
+            QMessageBox.information(self, "Éxito", "Ejercicio creado correctamente")
+            self.cargar_ejercicios()
+            # Asegurar que el checkbox esté marcado
+            if not self.ejercicios_check.isChecked():
+                self.ejercicios_check.setChecked(True)
+        else:
+            error_msg = result.get("error", "Error desconocido")
+            QMessageBox.critical(
+                self, "Error", f"Error al crear ejercicio:\n{error_msg}"
+            )
 
     def editar_ejercicio(self, ejercicio):
         """Editar ejercicio existente"""
@@ -461,20 +475,20 @@ class LessonDialog(QDialog):
             if data is None:
                 return
 
-            result = self.api_client.update_ejercicio(
-                self.modulo_id, self.lesson_data["id"], ejercicio["id"], data
+            self._mutar_ejercicio(
+                self.api_client.update_ejercicio,
+                ejercicio["id"],
+                data,
+                callback=self._on_ejercicio_actualizado,
             )
 
-            if result["success"]:
-                QMessageBox.information(
-                    self, "Éxito", "Ejercicio actualizado correctamente"
-                )
-                self.cargar_ejercicios()
-            else:
-                error_msg = result.get("error", "Error desconocido")
-                QMessageBox.critical(
-                    self, "Error", f"Error al actualizar:\n{error_msg}"
-                )
+    def _on_ejercicio_actualizado(self, result):
+        if result["success"]:
+            QMessageBox.information(self, "Éxito", "Ejercicio actualizado correctamente")
+            self.cargar_ejercicios()
+        else:
+            error_msg = result.get("error", "Error desconocido")
+            QMessageBox.critical(self, "Error", f"Error al actualizar:\n{error_msg}")
 
     def eliminar_ejercicio(self, ejercicio):
         """Eliminar ejercicio"""
@@ -488,21 +502,37 @@ class LessonDialog(QDialog):
 
         if reply == QMessageBox.Yes:
             logger.debug(f"Eliminando ejercicio: {ejercicio.get('id')}")
-            result = self.api_client.delete_ejercicio(
-                self.modulo_id, self.lesson_data["id"], ejercicio["id"]
+            self._mutar_ejercicio(
+                self.api_client.delete_ejercicio,
+                ejercicio["id"],
+                callback=lambda result, ejercicio_id=ejercicio["id"]: (
+                    self._on_ejercicio_eliminado(result, ejercicio_id)
+                ),
             )
 
-            if result["success"]:
-                QMessageBox.information(
-                    self, "Éxito", "Ejercicio eliminado correctamente"
-                )
-                self.cargar_ejercicios()
-                # Si no quedan ejercicios, podemos desmarcar el checkbox
-                if not self.ejercicios:
-                    self.ejercicios_check.setChecked(False)
+    def _on_ejercicio_eliminado(self, result, ejercicio_id):
+        if result["success"]:
+            QMessageBox.information(self, "Éxito", "Ejercicio eliminado correctamente")
+            self.ejercicios = [e for e in self.ejercicios if e.get("id") != ejercicio_id]
+            # Si no quedan ejercicios, podemos desmarcar el checkbox
+            if not self.ejercicios:
+                self.ejercicios_check.setChecked(False)
             else:
-                error_msg = result.get("error", "Error desconocido")
-                QMessageBox.critical(self, "Error", f"Error al eliminar:\n{error_msg}")
+                self.cargar_ejercicios()
+        else:
+            error_msg = result.get("error", "Error desconocido")
+            QMessageBox.critical(self, "Error", f"Error al eliminar:\n{error_msg}")
+
+    def _mutar_ejercicio(self, func, *args, callback):
+        """Enviar la mutación de un ejercicio de esta lección en un worker"""
+        self.api_client.submit_async(
+            func,
+            self.modulo_id,
+            self.lesson_data["id"],
+            *args,
+            callback=callback,
+            priority=Priority.INTERACTIVE,
+        )
 
     def load_lesson_data(self):
         """Cargar datos de la lección"""
@@ -563,12 +593,25 @@ class LessonsView(QWidget):
     def __init__(self, api_client):
         super().__init__()
         self.api_client = api_client
-        self.modulos = []
-        self.lecciones = []
         self.modulo_actual = None
+        self._lecciones_scope = CancellationScope(self)
+        # Módulos y lecciones se leen del almacén; la tabla se repinta sola
+        # cuando cambian, también por ediciones hechas en otras vistas
+        self._modulos = StoreListBinding(self, api_client.store, "modulo")
+        self._lecciones = StoreListBinding(
+            self, api_client.store, "leccion", self.actualizar_tabla, root=False
+        )
         self.setup_ui()
         self.load_modulos()
 
+    @property
+    def modulos(self):
+        return self._modulos.rows
+
+    @property
+    def lecciones(self):
+        return self._lecciones.rows
+
     def setup_ui(self):
         self.setStyleSheet(
             """
@@ -606,6 +649,9 @@ class LessonsView(QWidget):
         self.modulo_combo = QComboBox()
         self.modulo_combo.setMinimumWidth(200)
         self.modulo_combo.currentIndexChanged.connect(self.cambiar_modulo)
+        StoreComboBinding(
+            self.modulo_combo, self.api_client.store, "modulo", "Seleccione un módulo"
+        )
         header_layout.addWidget(self.modulo_combo)
 
         self.refresh_btn = QPushButton("🔄")
@@ -630,43 +676,44 @@ class LessonsView(QWidget):
 
     def load_modulos(self):
         """Cargar módulos"""
-        result = self.api_client.get_modulos()
-        if result["success"]:
-            data = result.get("data", [])
-            if isinstance(data, list):
-                self.modulos = data
-            else:
-                self.modulos = []
+        self.api_client.submit_async(
+            self.api_client.get_modulos, callback=self._on_modulos_cargados
+        )
 
-            self.modulo_combo.clear()
+    def _on_modulos_cargados(self, result):
+        # Después de la primera carga el combo lo mantiene StoreComboBinding
+        if result["success"] and self.modulo_combo.count() == 0:
             self.modulo_combo.addItem("Seleccione un módulo", None)
-            for m in self.modulos:
+            for m in self._modulos.ingest(result):
                 self.modulo_combo.addItem(m.get("titulo"), m.get("id"))
 
     def cambiar_modulo(self, index):
         """Cambiar módulo seleccionado"""
         if index <= 0:
             self.modulo_actual = None
-            self.lecciones = []
+            self._lecciones_scope.cancel()
+            self._lecciones.set_parent(None)
             self.actualizar_tabla([])
             return
 
         modulo_id = self.modulo_combo.currentData()
-        self.modulo_actual = next(
-            (m for m in self.modulos if m["id"] == modulo_id), None
-        )
+        self.modulo_actual = self.api_client.store.get("modulo", modulo_id)
+        self._lecciones.set_parent(("modulo", modulo_id))
         self.load_lecciones(modulo_id)
 
     def load_lecciones(self, modulo_id):
         """Cargar lecciones del módulo"""
-        result = self.api_client.get_lecciones(modulo_id)
+        self.api_client.submit_async(
+            self.api_client.get_lecciones,
+            modulo_id,
+            callback=self._on_lecciones_cargadas,
+            priority=Priority.INTERACTIVE,
+            token=self._lecciones_scope.renew(),
+        )
+
+    def _on_lecciones_cargadas(self, result):
         if result["success"]:
-            data = result.get("data", [])
-            if isinstance(data, list):
-                self.lecciones = data
-            else:
-                self.lecciones = []
-            self.actualizar_tabla(self.lecciones)
+            self.actualizar_tabla(self._lecciones.ingest(result))
 
     def actualizar_tabla(self, lecciones):
         """Actualizar tabla de lecciones"""
@@ -720,14 +767,16 @@ class LessonsView(QWidget):
         dialog = LessonDialog(self.api_client, self.modulo_actual["id"], leccion, self)
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
-            result = self.api_client.update_leccion(
-                self.modulo_actual["id"], leccion["id"], data
+            self.api_client.submit_async(
+                self.api_client.update_leccion,
+                self.modulo_actual["id"],
+                leccion["id"],
+                data,
+                callback=lambda result: self._on_leccion_mutada(
+                    result, "Lección actualizada"
+                ),
+                priority=Priority.INTERACTIVE,
             )
-            if result["success"]:
-                QMessageBox.information(self, "Éxito", "Lección actualizada")
-                self.load_lecciones(self.modulo_actual["id"])
-            else:
-                QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
 
     def eliminar_leccion(self, leccion):
         """Eliminar lección"""
@@ -739,10 +788,20 @@ class LessonsView(QWidget):
         )
 
         if reply == QMessageBox.Yes and self.modulo_actual:
-            result = self.api_client.delete_leccion(
-                self.modulo_actual["id"], leccion["id"]
+            self.api_client.submit_async(
+                self.api_client.delete_leccion,
+                self.modulo_actual["id"],
+                leccion["id"],
+                callback=self._on_leccion_mutada,
+                priority=Priority.INTERACTIVE,
             )
-            if result["success"]:
-                self.load_lecciones(self.modulo_actual["id"])
-            else:
-                QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
+
+    def _on_leccion_mutada(self, result, mensaje=None):
+        if result["success"]:
+            # La tabla se repinta desde el almacén, que ya tiene el cambio
+            if mensaje:
+                QMessageBox.information(self, "Éxito", mensaje)
+        elif result.get("queued"):
+            QMessageBox.information(self, "Guardado sin conexión", result["error"])
+        else:
+            QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
@@ -29,7 +29,7 @@ from PyQt5.QtGui import (
     QPainterPath,
     QEnterEvent,
 )
-from controllers.api_client import APIClient
+from controllers.api_client import APIClient, Priority
 from views.main_window import MainWindow
 import math
 
@@ -405,6 +405,10 @@ class LoginWindow(QWidget):
         # Conectar señal de error a nuestro método mejorado
         self.api_client.error_occurred.connect(self.show_elegant_error)
 
+        # Abrir conexiones con el backend mientras el usuario escribe, para
+        # que el POST /login no pague DNS, TCP y TLS
+        self.api_client.start_keepalive()
+
         self.animation = QPropertyAnimation(self, b"windowOpacity")
         self.animation.setDuration(500)
         self.animation.setStartValue(0)
@@ -735,8 +739,15 @@ class LoginWindow(QWidget):
         QTimer.singleShot(800, lambda: self.do_login(email, password))
 
     def do_login(self, email, password):
-        result = self.api_client.login(email, password)
+        self.api_client.submit_async(
+            self.api_client.login,
+            email,
+            password,
+            callback=self._on_login,
+            priority=Priority.INTERACTIVE,
+        )
 
+    def _on_login(self, result):
         if result["success"]:
             self.loading_overlay.set_message("¡Bienvenido! Cargando panel...")
             QTimer.singleShot(1500, self.open_main_window)
@@ -1,4 +1,14 @@
-from PyQt5.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QStackedWidget
+from PyQt5.QtWidgets import (
+    QMainWindow,
+    QWidget,
+    QHBoxLayout,
+    QVBoxLayout,
+    QStackedWidget,
+    QLabel,
+    QFrame,
+    QPushButton,
+    QMessageBox,
+)
 from PyQt5.QtCore import Qt
 from views.components.sidebar import Sidebar
 from views.dashboard_view import DashboardView
@@ -31,7 +41,59 @@ class MainWindow(QMainWindow):
         self.sidebar.navigation_changed.connect(self.change_page)
         main_layout.addWidget(self.sidebar)
 
-        # Contenido principal
+        # Contenido principal: aviso de conexión sobre las páginas
+        content_layout = QVBoxLayout()
+        content_layout.setContentsMargins(0, 0, 0, 0)
+        content_layout.setSpacing(0)
+
+        self.offline_banner = QLabel(
+            "Sin conexión con el servidor: se muestran los últimos datos "
+            "disponibles. Reintentando automáticamente..."
+        )
+        self.offline_banner.setAlignment(Qt.AlignCenter)
+        self.offline_banner.setStyleSheet(
+            """
+            QLabel {
+                background-color: #fef3c7;
+                color: #92400e;
+                padding: 8px;
+                font-weight: bold;
+                border-bottom: 1px solid #fcd34d;
+            }
+        """
+        )
+        self.offline_banner.setVisible(not self.api_client.online)
+        self.api_client.connectivity_changed.connect(self._on_connectivity_changed)
+        content_layout.addWidget(self.offline_banner)
+
+        # Escrituras hechas sin conexión que esperan su envío
+        self.pending_bar = QFrame()
+        self.pending_bar.setStyleSheet(
+            """
+            QFrame {
+                background-color: #e0e7ff;
+                border-bottom: 1px solid #a5b4fc;
+            }
+            QLabel {
+                color: #3730a3;
+                font-weight: bold;
+            }
+        """
+        )
+        pending_layout = QHBoxLayout(self.pending_bar)
+        pending_layout.setContentsMargins(12, 4, 12, 4)
+        self.pending_label = QLabel()
+        self.retry_writes_btn = QPushButton("Reintentar")
+        self.retry_writes_btn.clicked.connect(self._reintentar_escrituras)
+        self.discard_writes_btn = QPushButton("Descartar rechazados")
+        self.discard_writes_btn.clicked.connect(self._descartar_escrituras)
+        pending_layout.addWidget(self.pending_label, 1)
+        pending_layout.addWidget(self.retry_writes_btn)
+        pending_layout.addWidget(self.discard_writes_btn)
+        self.api_client.pending_writes_changed.connect(self._on_pending_writes_changed)
+        content_layout.addWidget(self.pending_bar)
+        self._on_pending_writes_changed()
+
         self.content_stack = QStackedWidget()
         self.content_stack.setStyleSheet(
             """
@@ -40,7 +102,8 @@ class MainWindow(QMainWindow):
             }
         """
         )
-        main_layout.addWidget(self.content_stack, 1)
+        content_layout.addWidget(self.content_stack, 1)
+        main_layout.addLayout(content_layout, 1)
 
         # Cargar páginas
         self.load_pages()
@@ -64,6 +127,56 @@ class MainWindow(QMainWindow):
         self.content_stack.addWidget(self.exercises_page)
         self.content_stack.addWidget(self.evaluations_page)
 
+    def _on_connectivity_changed(self, online):
+        """Mostrar u ocultar el aviso de modo sin conexión"""
+        self.offline_banner.setVisible(not online)
+
+    def _on_pending_writes_changed(self):
+        """Mostrar cuántos cambios esperan envío y cuáles rechazó el servidor"""
+        entries = self.api_client.pending_writes()
+        pendientes = [e for e in entries if e["status"] == "pending"]
+        rechazados = [e for e in entries if e["status"] == "failed"]
+        self.pending_bar.setVisible(bool(entries))
+        if not entries:
+            return
+
+        partes = []
+        if pendientes:
+            partes.append(f"{len(pendientes)} cambio(s) pendiente(s) de enviar")
+        if rechazados:
+            partes.append(f"{len(rechazados)} rechazado(s) por el servidor")
+        self.pending_label.setText(" · ".join(partes))
+        self.pending_label.setToolTip(
+            "\n".join(
+                f"{e.get('label') or e['endpoint']}"
+                + (f": {e.get('error')}" if e["status"] == "failed" else "")
+                for e in entries
+            )
+        )
+        self.retry_writes_btn.setVisible(bool(rechazados))
+        self.discard_writes_btn.setVisible(bool(rechazados))
+
+    def _reintentar_escrituras(self):
+        for entry in self.api_client.pending_writes():
+            if entry["status"] == "failed":
+                self.api_client.retry_write(entry["key"])
+
+    def _descartar_escrituras(self):
+        rechazados = [
+            e for e in self.api_client.pending_writes() if e["status"] == "failed"
+        ]
+        reply = QMessageBox.question(
+            self,
+            "Descartar cambios",
+            f"¿Descartar {len(rechazados)} cambio(s) rechazado(s)? "
+            "Se perderán definitivamente.",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No,
+        )
+        if reply == QMessageBox.Yes:
+            for entry in rechazados:
+                self.api_client.discard_write(entry["key"])
+
     def change_page(self, page_name):
         """Cambiar la página actual"""
         pages = {
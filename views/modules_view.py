@@ -55,6 +55,8 @@ from PyQt5.QtGui import (
 )
 import logging
 import re
+from controllers.api_client import CancellationScope, CancellationToken, Priority
+from views.components.store_list import StoreListBinding
 from utils.paths import resource_path
 from views.lessons_view import LessonDialog
 from views.components.rich_text_editor import RichTextEditor
@@ -969,6 +971,7 @@ class ModuleDialog(QDialog):
         self.api_client = api_client
         self.modulo_data = modulo_data
         self.modulos_existentes = []
+        self._modulos_scope = CancellationScope(self)
 
         self.setWindowTitle("Editar Módulo" if modulo_data else "Nuevo Módulo")
         self.setMinimumSize(700, 600)
@@ -983,7 +986,14 @@ class ModuleDialog(QDialog):
 
     def _cargar_modulos_existentes(self) -> None:
         """Carga los módulos existentes para calcular el siguiente orden"""
-        result = self.api_client.get_modulos()
+        self.api_client.submit_async(
+            self.api_client.get_modulos,
+            callback=self._on_modulos_existentes,
+            priority=Priority.INTERACTIVE,
+            token=self._modulos_scope.token,
+        )
+
+    def _on_modulos_existentes(self, result: dict) -> None:
         if result["success"]:
             data = result.get("data", [])
             self.modulos_existentes = (
@@ -1243,11 +1253,28 @@ class ModuleDetailView(QWidget):
         object, object
     )  # Señal cuando se selecciona una lección
 
-    def __init__(self, api_client, modulo: dict, parent=None):
+    def __init__(
+        self,
+        api_client,
+        modulo: dict,
+        parent=None,
+        token: CancellationToken = None,
+    ):
         super().__init__(parent)
         self.api_client = api_client
         self.modulo = modulo
-        self.lecciones = []
+        # Se cancela cuando el usuario selecciona otro módulo
+        self._token = token or CancellationToken()
+        self.destroyed.connect(self._token.cancel)
+        # Las lecciones se leen del almacén y se repintan cuando cambian
+        self._lecciones = StoreListBinding(
+            self,
+            api_client.store,
+            "leccion",
+            self._mostrar_lecciones,
+            parent=("modulo", modulo["id"]),
+            root=False,
+        )
         self.evaluacion_actual = None
         self._loaded = False
         self._cambiando_estado = False  # Flag para evitar múltiples cambios
@@ -1256,20 +1283,33 @@ class ModuleDetailView(QWidget):
         self.loading_eval_label = None
         self.loading_lessons_label = None
 
+        # Preguntas pintadas (id -> widget) y ediciones optimistas en curso
+        self._items_pregunta = {}
+        self._preguntas_title = None
+        self._mutaciones_pendientes = 0
+
         self._setup_ui()
 
         # Conectar señales del API client para actualización en tiempo real
         self.api_client.evaluaciones_changed.connect(self._on_evaluaciones_changed)
         self.api_client.data_changed.connect(self._on_data_changed)
+        self.api_client.store.entities_changed.connect(self._on_preguntas_editadas)
+        self.api_client.store.entities_removed.connect(self._on_preguntas_eliminadas)
 
         QTimer.singleShot(50, self._load_all_data)
 
+    @property
+    def lecciones(self) -> list:
+        return self._lecciones.rows
+
     # ============================================================================
     # MANEJADORES DE SEÑALES
     # ============================================================================
 
     def _on_evaluaciones_changed(self) -> None:
         """Cuando cambian las evaluaciones, recargar automáticamente"""
+        if self._mutaciones_pendientes:
+            return
         logger.debug(
             f"Signal evaluaciones_changed recibida para módulo {self.modulo.get('id')}"
         )
@@ -1278,11 +1318,12 @@ class ModuleDetailView(QWidget):
     def _on_data_changed(self, data_type: str) -> None:
         """Cuando cambia cualquier dato, verificar si es relevante"""
         if data_type == "evaluaciones":
+            if self._mutaciones_pendientes:
+                # Cambio propio: ya se pintó la pregunta afectada
+                return
             logger.debug("Signal data_changed(evaluaciones) recibida")
             QTimer.singleShot(300, self._recargar_evaluacion_con_indicador)
-        elif data_type == "lecciones":
-            logger.debug("Signal data_changed(lecciones) recibida")
-            QTimer.singleShot(300, self._recargar_lecciones_con_indicador)
+        # Las lecciones no se recargan aquí: StoreListBinding las repinta
 
     # ============================================================================
     # SETUP DE UI
@@ -1751,34 +1792,30 @@ class ModuleDetailView(QWidget):
             nuevo_estado: Nuevo estado a establecer
         """
         QApplication.setOverrideCursor(Qt.WaitCursor)
+        self.api_client.submit_async(
+            self.api_client.update_modulo,
+            self.modulo["id"],
+            {"estado": nuevo_estado},
+            callback=lambda result: self._on_estado_cambiado(result, nuevo_estado),
+            priority=Priority.INTERACTIVE,
+        )
 
-        try:
-            result = self.api_client.update_modulo(
-                self.modulo["id"], {"estado": nuevo_estado}
+    def _on_estado_cambiado(self, result: dict, nuevo_estado: str) -> None:
+        QApplication.restoreOverrideCursor()
+        self._cambiando_estado = False
+        if result["success"]:
+            self.modulo = {**self.modulo, "estado": nuevo_estado}
+            self._actualizar_estado_badge(nuevo_estado)
+            QMessageBox.information(
+                self, "Éxito", f"Estado cambiado a '{nuevo_estado}' correctamente"
+            )
+            self.module_updated.emit()
+        else:
+            QMessageBox.critical(
+                self,
+                "Error",
+                f"Error al cambiar estado:\n{result.get('error', 'Error desconocido')}",
             )
-
-            if result["success"]:
-                self.modulo["estado"] = nuevo_estado
-                self._actualizar_estado_badge(nuevo_estado)
-
-                QApplication.restoreOverrideCursor()
-                QMessageBox.information(
-                    self, "Éxito", f"Estado cambiado a '{nuevo_estado}' correctamente"
-                )
-
-                self.module_updated.emit()
-            else:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.critical(
-                    self,
-                    "Error",
-                    f"Error al cambiar estado:\n{result.get('error', 'Error desconocido')}",
-                )
-        except Exception as e:
-            QApplication.restoreOverrideCursor()
-            QMessageBox.critical(self, "Error inesperado", f"Error: {str(e)}")
-        finally:
-            self._cambiando_estado = False
 
     # ============================================================================
     # MÉTODOS DE CARGA Y ACTUALIZACIÓN
@@ -1808,12 +1845,6 @@ class ModuleDetailView(QWidget):
 
         self._clear_layout(self.eval_container_layout)
         self.eval_container_layout.addWidget(self.loading_eval_label)
-        QApplication.processEvents()
-
-        QTimer.singleShot(300, self._do_load_evaluacion)
-
-    def _do_load_evaluacion(self) -> None:
-        """Carga la evaluación forzando refresco"""
         self._load_evaluacion()
 
     def _recargar_lecciones_con_indicador(self) -> None:
@@ -1838,25 +1869,36 @@ class ModuleDetailView(QWidget):
 
         self._clear_layout(self.lessons_container_layout)
         self.lessons_container_layout.addWidget(self.loading_lessons_label)
-        QApplication.processEvents()
-        # Llamar directamente a _load_lecciones sin timer adicional
-        self._load_lecciones()
-
-        QTimer.singleShot(300, self._do_load_lecciones)
-
-    def _do_load_lecciones(self) -> None:
-        """Carga las lecciones forzando refresco"""
         self._load_lecciones()
 
     def _load_all_data(self) -> None:
-        """Carga todos los datos del módulo"""
+        """Carga lecciones y evaluación en un solo lote concurrente"""
         if self._loaded:
             return
+        self._loaded = True
 
-        self._recargar_lecciones_con_indicador()
-        self._recargar_evaluacion_con_indicador()
+        modulo_id = self.modulo["id"]
+        self.api_client.batch_manager.execute(
+            {
+                "lecciones": {
+                    "endpoint": f"/admin/modulos/{modulo_id}/lecciones",
+                    "cache_type": "lecciones",
+                },
+                "evaluacion": {
+                    "endpoint": f"/admin/modulos/{modulo_id}/evaluacion",
+                    "cache_type": "evaluaciones",
+                },
+            },
+            self._on_module_data_loaded,
+            priority=Priority.INTERACTIVE,
+            token=self._token,
+        )
 
-        self._loaded = True
+    def _on_module_data_loaded(self, results: dict) -> None:
+        """Pintar ambas pestañas con lo que trajo el lote, sin volver a pedirlo"""
+        sin_respuesta = {"success": False, "error": "Sin respuesta del servidor"}
+        self._pintar_lecciones(results.get("lecciones", sin_respuesta))
+        self._pintar_evaluacion(results.get("evaluacion", sin_respuesta))
 
     def _update_stats(self) -> None:
         """Actualiza las estadísticas del módulo"""
@@ -1892,60 +1934,69 @@ class ModuleDetailView(QWidget):
             # Aquí deberías agregarlo al layout si es necesario
 
     def _load_lecciones(self) -> None:
-        """Carga las lecciones del módulo desde la API"""
-        # Limpiar referencias
-        if hasattr(self, "loading_lessons_label") and self.loading_lessons_label:
-            self.loading_lessons_label = None
-
-        self._clear_layout(self.lessons_container_layout)
-
-        result = self.api_client.get_lecciones(self.modulo["id"], force_refresh=True)
+        """Pide las lecciones del módulo en un worker"""
+        self.api_client.submit_async(
+            self.api_client.get_lecciones,
+            self.modulo["id"],
+            callback=self._pintar_lecciones,
+            priority=Priority.INTERACTIVE,
+            token=self._token,
+        )
 
+    def _pintar_lecciones(self, result: dict) -> None:
+        """Pinta la pestaña de lecciones con el resultado de get_lecciones"""
         if result["success"]:
-            data = result.get("data", [])
-            self.lecciones = (
-                data
-                if isinstance(data, list)
-                else data.get("data", []) if isinstance(data, dict) else []
-            )
+            self._mostrar_lecciones(self._lecciones.ingest(result))
+            return
 
-            self._update_stats()
+        self.loading_lessons_label = None
+        self._clear_layout(self.lessons_container_layout)
+        error_label = QLabel(f"Error al cargar lecciones: {result.get('error')}")
+        error_label.setStyleSheet("color: #ef4444; padding: 40px; font-size: 14px;")
+        error_label.setAlignment(Qt.AlignCenter)
+        self.lessons_container_layout.addWidget(error_label)
+        self.lessons_container_layout.addStretch()
 
-            if not self.lecciones:
-                empty_label = QLabel("No hay lecciones creadas en este módulo")
-                empty_label.setStyleSheet(
-                    "color: #94a3b8; padding: 60px; font-size: 14px;"
-                )
-                empty_label.setAlignment(Qt.AlignCenter)
-                self.lessons_container_layout.addWidget(empty_label)
-            else:
-                lecciones_ordenadas = sorted(
-                    self.lecciones, key=lambda x: x.get("orden", 999)
-                )
-                for leccion in lecciones_ordenadas:
-                    item = EnhancedLessonItem(leccion)
-                    item.clicked.connect(self._abrir_leccion)
-                    item.edit_clicked.connect(self._editar_leccion)
-                    item.delete_clicked.connect(self._eliminar_leccion)
-                    self.lessons_container_layout.addWidget(item)
+    def _mostrar_lecciones(self, lecciones: list) -> None:
+        """Pinta la pestaña de lecciones (también cuando cambian en el almacén)"""
+        self.loading_lessons_label = None
+        self._clear_layout(self.lessons_container_layout)
+        self._update_stats()
+
+        if not lecciones:
+            empty_label = QLabel("No hay lecciones creadas en este módulo")
+            empty_label.setStyleSheet("color: #94a3b8; padding: 60px; font-size: 14px;")
+            empty_label.setAlignment(Qt.AlignCenter)
+            self.lessons_container_layout.addWidget(empty_label)
         else:
-            error_label = QLabel(f"Error al cargar lecciones: {result.get('error')}")
-            error_label.setStyleSheet("color: #ef4444; padding: 40px; font-size: 14px;")
-            error_label.setAlignment(Qt.AlignCenter)
-            self.lessons_container_layout.addWidget(error_label)
-            self.lecciones = []
+            lecciones_ordenadas = sorted(lecciones, key=lambda x: x.get("orden", 999))
+            for leccion in lecciones_ordenadas:
+                item = EnhancedLessonItem(leccion)
+                item.clicked.connect(self._abrir_leccion)
+                item.edit_clicked.connect(self._editar_leccion)
+                item.delete_clicked.connect(self._eliminar_leccion)
+                self.lessons_container_layout.addWidget(item)
 
         self.lessons_container_layout.addStretch()
-        QApplication.processEvents()
 
     def _load_evaluacion(self) -> None:
-        """Carga la evaluación del módulo desde la API"""
+        """Pide la evaluación del módulo en un worker"""
+        self.api_client.submit_async(
+            self.api_client.get_evaluacion,
+            self.modulo["id"],
+            callback=self._pintar_evaluacion,
+            priority=Priority.INTERACTIVE,
+            token=self._token,
+        )
+
+    def _pintar_evaluacion(self, result: dict) -> None:
+        """Pinta la pestaña de evaluación con el resultado de get_evaluacion"""
         if hasattr(self, "loading_eval_label") and self.loading_eval_label:
             self.loading_eval_label = None
 
         self._clear_layout(self.eval_container_layout)
-
-        result = self.api_client.get_evaluacion(self.modulo["id"], force_refresh=True)
+        self._items_pregunta = {}
+        self._preguntas_title = None
 
         if result["success"] and result.get("data"):
             # Hay evaluación configurada
@@ -1986,11 +2037,10 @@ class ModuleDetailView(QWidget):
                     "color: #1e293b; margin-top: 20px; margin-bottom: 10px;"
                 )
                 self.eval_container_layout.addWidget(preguntas_title)
+                self._preguntas_title = preguntas_title
 
                 for pregunta in preguntas:
-                    item = QuestionItemWidget(pregunta)
-                    item.edit_clicked.connect(self._editar_pregunta)
-                    item.delete_clicked.connect(self._eliminar_pregunta)
+                    item = self._crear_item_pregunta(pregunta)
                     self.eval_container_layout.addWidget(item)
             else:
                 no_preguntas_label = QLabel("No hay preguntas creadas aún")
@@ -2067,32 +2117,21 @@ class ModuleDetailView(QWidget):
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
 
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-
-            try:
-                if "titulo" not in data or not data["titulo"]:
-                    data["titulo"] = f"Evaluación del Módulo {self.modulo['id']}"
-
-                result = self.api_client.update_evaluacion_config(
-                    self.modulo["id"], data
-                )
+            if "titulo" not in data or not data["titulo"]:
+                data["titulo"] = f"Evaluación del Módulo {self.modulo['id']}"
 
-                if result["success"]:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.information(
-                        self, "Éxito", "Evaluación configurada correctamente"
-                    )
+            self._enviar_mutacion(
+                self.api_client.update_evaluacion_config,
+                self.modulo["id"],
+                data,
+                exito="Evaluación configurada correctamente",
+                error="Error al configurar",
+                on_success=self._on_evaluacion_configurada,
+            )
 
-                    self._recargar_evaluacion_con_indicador()
-                    self.module_updated.emit()
-                else:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.critical(
-                        self, "Error", f"Error al configurar: {result.get('error')}"
-                    )
-            except Exception as e:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.critical(self, "Error inesperado", f"Error: {str(e)}")
+    def _on_evaluacion_configurada(self) -> None:
+        self._recargar_evaluacion_con_indicador()
+        self.module_updated.emit()
 
     # ============================================================================
     # GESTIÓN DE PREGUNTAS
@@ -2115,28 +2154,15 @@ class ModuleDetailView(QWidget):
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
 
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-
-            try:
-                result = self.api_client.create_pregunta(
-                    self.modulo["id"], self.evaluacion_actual.get("id"), data
-                )
-
-                if result["success"]:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.information(
-                        self, "Éxito", "Pregunta creada correctamente"
-                    )
-
-                    self._recargar_evaluacion_con_indicador()
-                else:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.critical(
-                        self, "Error", f"Error al crear: {result.get('error')}"
-                    )
-            except Exception as e:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.critical(self, "Error inesperado", f"Error: {str(e)}")
+            self._enviar_mutacion(
+                self.api_client.create_pregunta,
+                self.modulo["id"],
+                self.evaluacion_actual.get("id"),
+                data,
+                exito="Pregunta creada correctamente",
+                error="Error al crear",
+                on_success=self._recargar_evaluacion_con_indicador,
+            )
 
     def _eliminar_pregunta(self, pregunta: dict) -> None:
         """
@@ -2156,30 +2182,15 @@ class ModuleDetailView(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-
-            try:
-                result = self.api_client.delete_pregunta(
-                    self.modulo["id"],
-                    self.evaluacion_actual.get("id"),
-                    pregunta["id"],
-                )
-
-                if result["success"]:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.information(
-                        self, "Éxito", "Pregunta eliminada correctamente"
-                    )
-
-                    self._recargar_evaluacion_con_indicador()
-                else:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.critical(
-                        self, "Error", f"Error al eliminar: {result.get('error')}"
-                    )
-            except Exception as e:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.critical(self, "Error inesperado", f"Error: {str(e)}")
+            self._mutar_pregunta(
+                pregunta["id"],
+                self.api_client.delete_pregunta,
+                self.modulo["id"],
+                self.evaluacion_actual.get("id"),
+                pregunta["id"],
+                remove=True,
+                accion="eliminar",
+            )
 
     def _editar_pregunta(self, pregunta: dict) -> None:
         """
@@ -2194,32 +2205,75 @@ class ModuleDetailView(QWidget):
 
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
+            self._mutar_pregunta(
+                pregunta["id"],
+                self.api_client.update_pregunta,
+                self.modulo["id"],
+                self.evaluacion_actual.get("id"),
+                pregunta["id"],
+                data,
+                fields=data,
+                accion="actualizar",
+            )
 
-            QApplication.setOverrideCursor(Qt.WaitCursor)
+    def _crear_item_pregunta(self, pregunta: dict) -> QuestionItemWidget:
+        item = QuestionItemWidget(pregunta)
+        item.edit_clicked.connect(self._editar_pregunta)
+        item.delete_clicked.connect(self._eliminar_pregunta)
+        self._items_pregunta[pregunta.get("id")] = item
+        return item
 
-            try:
-                result = self.api_client.update_pregunta(
-                    self.modulo["id"],
-                    self.evaluacion_actual.get("id"),
-                    pregunta["id"],
-                    data,
-                )
+    def _mutar_pregunta(self, pregunta_id: int, func, *args, accion: str, **kwargs) -> None:
+        """
+        Aplica la edición o el borrado en pantalla y lo envía al servidor.
 
-                if result["success"]:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.information(
-                        self, "Éxito", "Pregunta actualizada correctamente"
-                    )
+        Si el servidor lo rechaza, el almacén restaura la pregunta y se
+        avisa al usuario; no se reconstruye la pestaña en ningún caso.
+        """
+        self._mutaciones_pendientes += 1
 
-                    self._recargar_evaluacion_con_indicador()
-                else:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.critical(
-                        self, "Error", f"Error al actualizar: {result.get('error')}"
-                    )
-            except Exception as e:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.critical(self, "Error inesperado", f"Error: {str(e)}")
+        def terminar(result: dict) -> None:
+            self._mutaciones_pendientes -= 1
+            if result.get("success"):
+                return
+            if accion == "eliminar":
+                # La pregunta vuelve a su sitio: se repinta la evaluación
+                self._load_evaluacion()
+            QMessageBox.critical(
+                self,
+                "Error",
+                f"Error al {accion} (cambios deshechos): {result.get('error')}",
+            )
+
+        self.api_client.mutate_optimistic(
+            "pregunta", pregunta_id, func, *args, callback=terminar, **kwargs
+        )
+
+    def _on_preguntas_editadas(self, kind: str, ids) -> None:
+        """Sustituye solo los widgets de las preguntas que cambiaron"""
+        if kind != "pregunta":
+            return
+        for pregunta_id in ids:
+            viejo = self._items_pregunta.get(pregunta_id)
+            pregunta = self.api_client.store.get("pregunta", pregunta_id)
+            if viejo is None or pregunta is None:
+                continue
+            nuevo = self._crear_item_pregunta(pregunta)
+            self.eval_container_layout.replaceWidget(viejo, nuevo)
+            viejo.setParent(None)
+            viejo.deleteLater()
+
+    def _on_preguntas_eliminadas(self, kind: str, ids) -> None:
+        if kind != "pregunta":
+            return
+        for pregunta_id in ids:
+            item = self._items_pregunta.pop(pregunta_id, None)
+            if item is not None:
+                self.eval_container_layout.removeWidget(item)
+                item.setParent(None)
+                item.deleteLater()
+        if self._preguntas_title is not None:
+            self._preguntas_title.setText(f"Preguntas ({len(self._items_pregunta)})")
 
     def _update_pregunta_opciones(self, pregunta_id: int, opciones: list) -> None:
         """
@@ -2229,32 +2283,16 @@ class ModuleDetailView(QWidget):
             pregunta_id: ID de la pregunta
             opciones: Lista de opciones actualizadas
         """
-        QApplication.setOverrideCursor(Qt.WaitCursor)
-
-        try:
-            result = self.api_client.update_pregunta_opciones(
-                self.modulo["id"],
-                self.evaluacion_actual.get("id"),
-                pregunta_id,
-                opciones,
-            )
-
-            if result["success"]:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.information(
-                    self, "Éxito", "Opciones actualizadas correctamente"
-                )
-                self._recargar_evaluacion_con_indicador()
-            else:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.critical(
-                    self,
-                    "Error",
-                    f"Error al actualizar opciones: {result.get('error')}",
-                )
-        except Exception as e:
-            QApplication.restoreOverrideCursor()
-            QMessageBox.critical(self, "Error inesperado", f"Error: {str(e)}")
+        self._enviar_mutacion(
+            self.api_client.update_pregunta_opciones,
+            self.modulo["id"],
+            self.evaluacion_actual.get("id"),
+            pregunta_id,
+            opciones,
+            exito="Opciones actualizadas correctamente",
+            error="Error al actualizar opciones",
+            on_success=self._recargar_evaluacion_con_indicador,
+        )
 
     # ============================================================================
     # GESTIÓN DE LECCIONES
@@ -2269,31 +2307,13 @@ class ModuleDetailView(QWidget):
             if data is None:
                 return
 
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-
-            try:
-                result = self.api_client.create_leccion(self.modulo["id"], data)
-
-                if result["success"]:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.information(
-                        self, "Éxito", "Lección creada correctamente"
-                    )
-
-                    self._recargar_lecciones_con_indicador()
-                    QTimer.singleShot(500, self._update_stats)
-                    self.module_updated.emit()
-                else:
-                    QApplication.restoreOverrideCursor()
-                    error_msg = result.get("error", "Error desconocido")
-                    if "errors" in result:
-                        error_msg += "\n" + "\n".join(result["errors"])
-                    QMessageBox.critical(
-                        self, "Error", f"Error al crear lección:\n{error_msg}"
-                    )
-            except Exception as e:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.critical(self, "Error inesperado", f"Error: {str(e)}")
+            self._enviar_mutacion(
+                self.api_client.create_leccion,
+                self.modulo["id"],
+                data,
+                exito="Lección creada correctamente",
+                error="Error al crear lección",
+            )
 
     def _editar_leccion(self, leccion: dict) -> None:
         """
@@ -2309,33 +2329,14 @@ class ModuleDetailView(QWidget):
             if data is None:
                 return
 
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-
-            try:
-                result = self.api_client.update_leccion(
-                    self.modulo["id"], leccion["id"], data
-                )
-
-                if result["success"]:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.information(
-                        self, "Éxito", "Lección actualizada correctamente"
-                    )
-
-                    self._recargar_lecciones_con_indicador()
-                    QTimer.singleShot(500, self._update_stats)
-                    self.module_updated.emit()
-                else:
-                    QApplication.restoreOverrideCursor()
-                    error_msg = result.get("error", "Error desconocido")
-                    if "errors" in result:
-                        error_msg += "\n" + "\n".join(result["errors"])
-                    QMessageBox.critical(
-                        self, "Error", f"Error al actualizar:\n{error_msg}"
-                    )
-            except Exception as e:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.critical(self, "Error inesperado", f"Error: {str(e)}")
+            self._enviar_mutacion(
+                self.api_client.update_leccion,
+                self.modulo["id"],
+                leccion["id"],
+                data,
+                exito="Lección actualizada correctamente",
+                error="Error al actualizar",
+            )
 
     def _eliminar_leccion(self, leccion: dict) -> None:
         """
@@ -2355,33 +2356,13 @@ class ModuleDetailView(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-
-            try:
-                result = self.api_client.delete_leccion(
-                    self.modulo["id"], leccion["id"]
-                )
-
-                if result["success"]:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.information(
-                        self, "Éxito", "Lección eliminada correctamente"
-                    )
-
-                    self.lecciones = []
-                    self._recargar_lecciones_con_indicador()
-                    QTimer.singleShot(500, self._update_stats)
-                    self.module_updated.emit()
-                else:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.critical(
-                        self,
-                        "Error",
-                        f"Error al eliminar lección:\n{result.get('error')}",
-                    )
-            except Exception as e:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.critical(self, "Error inesperado", f"Error: {str(e)}")
+            self._enviar_mutacion(
+                self.api_client.delete_leccion,
+                self.modulo["id"],
+                leccion["id"],
+                exito="Lección eliminada correctamente",
+                error="Error al eliminar lección",
+            )
 
     # ============================================================================
     # GESTIÓN DE MÓDULOS
@@ -2394,31 +2375,19 @@ class ModuleDetailView(QWidget):
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
 
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-
-            try:
-                result = self.api_client.update_modulo(self.modulo["id"], data)
-
-                if result["success"]:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.information(
-                        self, "Éxito", "Módulo actualizado correctamente"
-                    )
-
-                    self.modulo.update(data)
-                    self.module_updated.emit()
+            self._enviar_mutacion(
+                self.api_client.update_modulo,
+                self.modulo["id"],
+                data,
+                exito="Módulo actualizado correctamente",
+                error="Error al actualizar módulo",
+                on_success=lambda: self._on_modulo_actualizado(data),
+            )
 
-                    QTimer.singleShot(300, self._load_all_data)
-                else:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.critical(
-                        self,
-                        "Error",
-                        f"Error al actualizar módulo: {result.get('error')}",
-                    )
-            except Exception as e:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.critical(self, "Error inesperado", f"Error: {str(e)}")
+    def _on_modulo_actualizado(self, data: dict) -> None:
+        self.modulo = {**self.modulo, **data}
+        self.module_updated.emit()
+        QTimer.singleShot(300, self._load_all_data)
 
     def _eliminar_modulo(self) -> None:
         """Elimina el módulo actual"""
@@ -2433,29 +2402,45 @@ class ModuleDetailView(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            QApplication.setOverrideCursor(Qt.WaitCursor)
+            self._enviar_mutacion(
+                self.api_client.delete_modulo,
+                self.modulo["id"],
+                exito="Módulo eliminado correctamente",
+                error="Error al eliminar módulo",
+                on_success=self.module_updated.emit,
+            )
 
-            try:
-                result = self.api_client.delete_modulo(self.modulo["id"])
+    def _enviar_mutacion(self, func, *args, exito: str, error: str, on_success=None):
+        """
+        Envía una mutación en un worker mostrando el cursor de espera.
 
-                if result["success"]:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.information(
-                        self, "Éxito", "Módulo eliminado correctamente"
-                    )
+        Al terminar se restaura el cursor y se avisa del éxito, del guardado
+        sin conexión o del error; on_success solo se llama si el servidor
+        confirmó el cambio.
+        """
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        self.api_client.submit_async(
+            func,
+            *args,
+            callback=lambda result: self._on_mutacion(
+                result, exito, error, on_success
+            ),
+            priority=Priority.INTERACTIVE,
+        )
 
-                    self.module_updated.emit()
-                else:
-                    QApplication.restoreOverrideCursor()
-                    error_msg = result.get("error", "Error desconocido")
-                    if "errors" in result:
-                        error_msg += "\n" + "\n".join(result["errors"])
-                    QMessageBox.critical(
-                        self, "Error", f"Error al eliminar módulo:\n{error_msg}"
-                    )
-            except Exception as e:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.critical(self, "Error inesperado", f"Error: {str(e)}")
+    def _on_mutacion(self, result: dict, exito: str, error: str, on_success) -> None:
+        QApplication.restoreOverrideCursor()
+        if result["success"]:
+            QMessageBox.information(self, "Éxito", exito)
+            if on_success:
+                on_success()
+        elif result.get("queued"):
+            QMessageBox.information(self, "Guardado sin conexión", result["error"])
+        else:
+            error_msg = result.get("error", "Error desconocido")
+            if "errors" in result:
+                error_msg += "\n" + "\n".join(result["errors"])
+            QMessageBox.critical(self, "Error", f"{error}:\n{error_msg}")
 
     # ============================================================================
     # MÉTODOS UTILITARIOS
@@ -2487,8 +2472,6 @@ class ModuleDetailView(QWidget):
                 if sublayout is not None:
                     self._clear_layout(sublayout)
 
-        QApplication.processEvents()
-
     def _abrir_leccion(self, leccion: dict) -> None:
         """
         Abre la vista detallada de una lección.
@@ -2517,15 +2500,40 @@ class ModulesView(QWidget):
     def __init__(self, api_client):
         super().__init__()
         self.api_client = api_client
-        self.modulos = []
+        # La lista se lee del almacén y se repinta cuando cambia
+        self._modulos = StoreListBinding(
+            self, api_client.store, "modulo", self._on_modulos_store
+        )
         self.modulo_actual = None
         self.current_detail_view = None
         self.placeholder = None
+        # Cada clic en una tarjeta deja obsoletas las cargas del módulo anterior
+        self._selection_scope = CancellationScope(self)
+        self._listado_scope = CancellationScope(self)
 
         self._setup_ui()
 
+        # Repintar cuando cambian los módulos (mutaciones o datos frescos
+        # que reemplazan la copia servida desde disco)
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.timeout.connect(self._load_modulos)
+        self.api_client.modulos_changed.connect(self._on_modulos_changed)
+
         QTimer.singleShot(0, self._load_modulos)
 
+    @property
+    def modulos(self) -> list:
+        return self._modulos.rows
+
+    def _on_modulos_changed(self) -> None:
+        """Reconciliar con el servidor tras una invalidación (sync delta)"""
+        self._reload_timer.start(100)
+
+    def _on_modulos_store(self, modulos: list) -> None:
+        """Repintar la lista cuando cambian los módulos en el almacén"""
+        self._pintar_listado()
+
     def _setup_ui(self) -> None:
         """Configura la interfaz de usuario principal"""
         main_layout = QVBoxLayout(self)
@@ -2812,8 +2820,6 @@ class ModulesView(QWidget):
                 except:
                     pass
 
-        QApplication.processEvents()
-
     def _load_modulos(self, force_refresh: bool = False) -> None:
         """
         Carga la lista de módulos desde la API.
@@ -2821,36 +2827,41 @@ class ModulesView(QWidget):
         Args:
             force_refresh: Si es True, fuerza la recarga ignorando caché
         """
-        self._clear_layout_safe(self.modulos_layout)
-
-        if force_refresh:
-            self.api_client.invalidate_cache_type("modulos")
+        # Delta desde la última sincronización; el refresco manual es completo
+        self.api_client.submit_async(
+            self.api_client.sync_modulos,
+            force_full=force_refresh,
+            callback=self._on_modulos_cargados,
+            priority=Priority.INTERACTIVE,
+            token=self._listado_scope.renew(),
+        )
 
-        result = self.api_client.get_modulos(force_refresh=force_refresh)
+    def _on_modulos_cargados(self, result: dict) -> None:
+        """Pinta la lista de módulos con el resultado de sync_modulos"""
+        self._clear_layout_safe(self.modulos_layout)
 
         if result["success"]:
-            data = result.get("data", [])
-            self.modulos = (
-                data
-                if isinstance(data, list)
-                else data.get("data", []) if isinstance(data, dict) else []
-            )
-            self.count_label.setText(str(len(self.modulos)))
-            self._mostrar_modulos(self.modulos)
-
-            if self.modulo_actual:
-                modulo_existe = any(
-                    m.get("id") == self.modulo_actual.get("id") for m in self.modulos
-                )
-                if not modulo_existe:
-                    self.modulo_actual = None
-                    QTimer.singleShot(0, self._show_placeholder)
+            self._modulos.ingest(result)
+            self._pintar_listado()
         else:
             error_label = QLabel(f"Error: {result.get('error')}")
             error_label.setStyleSheet("color: #ef4444; padding: 40px; font-size: 14px;")
             error_label.setAlignment(Qt.AlignCenter)
             self.modulos_layout.addWidget(error_label)
 
+    def _pintar_listado(self) -> None:
+        """Pintar los módulos del almacén respetando la búsqueda actual"""
+        self.count_label.setText(str(len(self.modulos)))
+        self._filtrar_modulos()
+
+        if self.modulo_actual:
+            modulo_existe = self.api_client.store.get(
+                "modulo", self.modulo_actual.get("id")
+            )
+            if modulo_existe is None:
+                self.modulo_actual = None
+                QTimer.singleShot(0, self._show_placeholder)
+
     def _mostrar_modulos(self, modulos: list) -> None:
         """
         Muestra los módulos en el panel izquierdo.
@@ -2903,7 +2914,9 @@ class ModulesView(QWidget):
 
         self._clear_layout(self.right_layout)
 
-        self.current_detail_view = ModuleDetailView(self.api_client, modulo)
+        self.current_detail_view = ModuleDetailView(
+            self.api_client, modulo, token=self._selection_scope.renew()
+        )
         self.current_detail_view.module_updated.connect(self._on_module_updated)
         self.current_detail_view.lesson_selected.connect(self._abrir_leccion)
         self.right_layout.addWidget(self.current_detail_view)
@@ -2920,18 +2933,15 @@ class ModulesView(QWidget):
 
     def _on_module_updated(self) -> None:
         """Manejador cuando se actualiza un módulo"""
-        self.api_client.invalidate_cache_type("modulos")
-        self._load_modulos(force_refresh=True)
-        QTimer.singleShot(100, self._delayed_module_selection)
+        # La escritura ya actualizó el almacén y la lista se repinta sola
+        QTimer.singleShot(0, self._delayed_module_selection)
 
     def _delayed_module_selection(self) -> None:
         """Selecciona el módulo después de un pequeño retraso"""
         if self.modulo_actual:
-            modulo_actualizado = None
-            for modulo in self.modulos:
-                if modulo.get("id") == self.modulo_actual.get("id"):
-                    modulo_actualizado = modulo
-                    break
+            modulo_actualizado = self.api_client.store.get(
+                "modulo", self.modulo_actual.get("id")
+            )
 
             if modulo_actualizado:
                 self._mostrar_detalle_modulo(modulo_actualizado)
@@ -2942,13 +2952,22 @@ class ModulesView(QWidget):
     def _refrescar_modulos(self) -> None:
         """Refresca manualmente la lista de módulos"""
         QApplication.setOverrideCursor(Qt.WaitCursor)
-        self._load_modulos(force_refresh=True)
-        QApplication.restoreOverrideCursor()
-
-        QMessageBox.information(
-            self, "Actualizado", "Lista de módulos actualizada correctamente"
+        self.api_client.submit_async(
+            self.api_client.sync_modulos,
+            force_full=True,
+            callback=self._on_modulos_refrescados,
+            priority=Priority.INTERACTIVE,
+            token=self._listado_scope.renew(),
         )
 
+    def _on_modulos_refrescados(self, result: dict) -> None:
+        QApplication.restoreOverrideCursor()
+        self._on_modulos_cargados(result)
+        if result["success"]:
+            QMessageBox.information(
+                self, "Actualizado", "Lista de módulos actualizada correctamente"
+            )
+
     def _nuevo_modulo(self) -> None:
         """Crea un nuevo módulo"""
         dialog = ModuleDialog(self.api_client, parent=self)
@@ -2959,38 +2978,33 @@ class ModulesView(QWidget):
                 return
 
             QApplication.setOverrideCursor(Qt.WaitCursor)
+            self.api_client.submit_async(
+                self.api_client.create_modulo,
+                data,
+                callback=self._on_modulo_creado,
+                priority=Priority.INTERACTIVE,
+            )
 
-            try:
-                result = self.api_client.create_modulo(data)
-                if result["success"]:
-                    QApplication.restoreOverrideCursor()
-                    QMessageBox.information(
-                        self, "Éxito", "Módulo creado correctamente"
-                    )
-
-                    self._load_modulos(force_refresh=True)
-
-                    nuevo_modulo = None
-                    if result.get("data") and isinstance(result["data"], dict):
-                        nuevo_modulo = result["data"]
-                    elif self.modulos:
-                        nuevo_modulo = self.modulos[-1]
-
-                    if nuevo_modulo:
-                        self._mostrar_detalle_modulo(nuevo_modulo)
-                    else:
-                        self._show_placeholder()
-                else:
-                    QApplication.restoreOverrideCursor()
-                    error_msg = result.get("error", "Error desconocido")
-                    if "errors" in result:
-                        error_msg += "\n" + "\n".join(result["errors"])
-                    QMessageBox.critical(
-                        self, "Error", f"Error al crear módulo:\n{error_msg}"
-                    )
-            except Exception as e:
-                QApplication.restoreOverrideCursor()
-                QMessageBox.critical(self, "Error inesperado", f"Error:\n{str(e)}")
+    def _on_modulo_creado(self, result: dict) -> None:
+        QApplication.restoreOverrideCursor()
+        if result["success"]:
+            QMessageBox.information(self, "Éxito", "Módulo creado correctamente")
+
+            nuevo_modulo = None
+            if result.get("data") and isinstance(result["data"], dict):
+                nuevo_modulo = result["data"]
+            elif self.modulos:
+                nuevo_modulo = self.modulos[-1]
+
+            if nuevo_modulo:
+                self._mostrar_detalle_modulo(nuevo_modulo)
+            else:
+                self._show_placeholder()
+        else:
+            error_msg = result.get("error", "Error desconocido")
+            if "errors" in result:
+                error_msg += "\n" + "\n".join(result["errors"])
+            QMessageBox.critical(self, "Error", f"Error al crear módulo:\n{error_msg}")
 
     def _clear_layout(self, layout) -> None:
         """
@@ -3011,8 +3025,6 @@ class ModulesView(QWidget):
                 except:
                     pass
 
-        QApplication.processEvents()
-
 
 # ============================================================================
 # DIÁLOGO: CREACIÓN/EDICIÓN RÁPIDA DE PREGUNTAS
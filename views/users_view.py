@@ -4,8 +4,7 @@ from PyQt5.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QHeaderView,
     QLineEdit,
     QComboBox,
@@ -15,15 +14,18 @@ from PyQt5.QtWidgets import (
     QFrame,
     QScrollArea,
     QProgressBar,
+    QProgressDialog,
     QApplication,  # Añadido
 )
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QColor, QPixmap, QPainter, QPen
 import logging
 import re
-import requests
 from io import BytesIO
+from controllers.api_client import CancellationScope, Priority
+from controllers.user_search_index import UserSearchIndex, fold_text, sort_usuarios
 from utils.paths import resource_path
+from views.components.users_table import UsersTableModel, UserActionsDelegate
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -58,6 +60,8 @@ class AvatarSelector(QDialog):
         self.current_avatar = current_avatar
         self.selected_avatar = current_avatar
         self.avatars = []
+        # Las imágenes que lleguen tras cerrar el diálogo se descartan
+        self._imagenes_scope = CancellationScope(self)
         self.setWindowTitle("Seleccionar Avatar")
         self.setFixedSize(600, 500)
         self.setup_ui()
@@ -154,22 +158,23 @@ class AvatarSelector(QDialog):
 
     def cargar_avatars(self):
         """Cargar avatares desde la API"""
-        try:
-            # Llamar al endpoint de avatares
-            result = self.api_client.get("/admin/usuarios/avatars")
-
-            if result.get("success"):
-                self.avatars = result.get("data", [])
+        self.api_client.submit_async(
+            self.api_client.get_avatars,
+            callback=self._on_avatars_cargados,
+            priority=Priority.INTERACTIVE,
+            token=self._imagenes_scope.token,
+        )
 
-                # Crear frames para cada avatar
-                for avatar in self.avatars:
-                    self.crear_frame_avatar(avatar)
-            else:
-                # Si falla, crear avatares por defecto
-                self.crear_avatars_default()
+    def _on_avatars_cargados(self, result):
+        if result.get("success"):
+            self.avatars = result.get("data", [])
 
-        except Exception as e:
-            logger.error(f"Error cargando avatares: {e}")
+            # Crear frames para cada avatar
+            for avatar in self.avatars:
+                self.crear_frame_avatar(avatar)
+        else:
+            # Si falla, crear avatares por defecto
+            logger.error(f"Error cargando avatares: {result.get('error')}")
             self.crear_avatars_default()
 
     def crear_frame_avatar(self, avatar):
@@ -193,23 +198,15 @@ class AvatarSelector(QDialog):
         img_container.setAlignment(Qt.AlignCenter)
         img_container.setStyleSheet("border: none;")
 
-        # Cargar imagen del avatar
+        # Iniciales hasta que llegue la imagen (si no llega, se quedan)
+        self.mostrar_iniciales(img_container, avatar.get("nombre", "AV"))
         if avatar.get("url"):
-            try:
-                response = requests.get(avatar["url"], timeout=5)
-                if response.status_code == 200:
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(response.content)
-                    pixmap = pixmap.scaled(
-                        90, 90, Qt.KeepAspectRatio, Qt.SmoothTransformation
-                    )
-                    img_container.setPixmap(pixmap)
-                else:
-                    self.mostrar_iniciales(img_container, avatar.get("nombre", "AV"))
-            except:
-                self.mostrar_iniciales(img_container, avatar.get("nombre", "AV"))
-        else:
-            self.mostrar_iniciales(img_container, avatar.get("nombre", "AV"))
+            self.api_client.images.load(
+                avatar["url"],
+                90,
+                img_container.setPixmap,
+                token=self._imagenes_scope.token,
+            )
 
         layout.addWidget(img_container)
 
@@ -314,6 +311,8 @@ class UserDialog(QDialog):
         self.api_client = api_client
         self.user_data = user_data
         self.selected_avatar = None
+        # Solo cuenta la imagen del último avatar elegido
+        self._avatar_scope = CancellationScope(self)
         self.setWindowTitle("Editar Usuario" if user_data else "Nuevo Usuario")
         self.setFixedSize(550, 700)
         self.setup_ui()
@@ -609,23 +608,16 @@ class UserDialog(QDialog):
 
     def actualizar_avatar(self):
         """Actualizar la vista del avatar"""
-        if self.selected_avatar:
-            if self.selected_avatar.get("url"):
-                try:
-                    response = requests.get(self.selected_avatar["url"], timeout=5)
-                    if response.status_code == 200:
-                        pixmap = QPixmap()
-                        pixmap.loadFromData(response.content)
-                        pixmap = pixmap.scaled(
-                            80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation
-                        )
-                        self.avatar_label.setPixmap(pixmap)
-                        return
-                except:
-                    pass
-
-        # Si no se puede cargar, mostrar iniciales
+        # Iniciales mientras carga o si no se puede cargar
         self.set_default_avatar()
+        token = self._avatar_scope.renew()
+        if self.selected_avatar and self.selected_avatar.get("url"):
+            self.api_client.images.load(
+                self.selected_avatar["url"],
+                80,
+                self.avatar_label.setPixmap,
+                token=token,
+            )
 
     def on_text_changed(self):
         """Manejar cambios en tiempo real"""
@@ -881,18 +873,51 @@ class UsersView(QWidget):
         self.usuarios = []
         self.usuarios_filtrados = []
 
-        # Variables de paginación
-        self.pagina_actual = 1
-        self.items_por_pagina = 10
-        self.total_paginas = 1
+        # Sin filtros la tabla pide páginas al desplazarse; una recarga
+        # deja obsoletas las páginas pedidas antes
+        self._carga_scope = CancellationScope(self)
+        self._sync_scope = CancellationScope(self)
+        self._forzar_recarga = False
+        self._total_usuarios = None
+        # La lista completa solo se descarga (en segundo plano) al ordenar.
+        # Con ella en memoria se filtra en local; si no, la búsqueda va al
+        # servidor (con debounce y cancelando la anterior) y sus resultados
+        # se paginan en la tabla como el listado
+        self._lista_scope = CancellationScope(self)
+        self._usuarios_entrantes = []
+        self._cargando_lista = False
+        self._lista_completa = False
+        # Índice de búsqueda sobre la lista completa, construido en un
+        # worker; los cambios que llegan mientras se construye se aplican
+        # al recibirlo
+        self._indice = None
+        self._indice_scope = CancellationScope(self)
+        self._cambios_indice = []
+        self._filtro_timer = QTimer(self)
+        self._filtro_timer.setSingleShot(True)
+        self._filtro_timer.timeout.connect(self.filtrar_usuarios)
+        # Ordenación activa: [(campo, descendente)], el primero manda
+        self._orden = []
+        self._busqueda_scope = CancellationScope(self)
+        # (búsqueda, rol) cuyas coincidencias pagina la tabla, o None
+        self._consulta = None
+        self._busqueda_timer = QTimer(self)
+        self._busqueda_timer.setSingleShot(True)
+        self._busqueda_timer.timeout.connect(self._ejecutar_busqueda)
+        # Mutaciones optimistas en curso: id de usuario -> peticiones pendientes
+        self._mutaciones = {}
+        self._masiva_scope = CancellationScope(self)
+        self._masiva_progreso = None
 
         self.setup_ui()
 
         # Conectar señal de actualización automática
         self.api_client.usuarios_changed.connect(self.on_usuarios_changed)
+        self.api_client.store.entities_changed.connect(self._on_usuarios_editados)
+        self.api_client.store.entities_removed.connect(self._on_usuarios_eliminados)
 
         # Cargar datos iniciales
-        self.cargar_usuarios(force_refresh=True)
+        self.cargar_usuarios()
 
     def setup_ui(self):
         self.setStyleSheet(
@@ -900,13 +925,13 @@ class UsersView(QWidget):
             QWidget {
                 background-color: #f8f9fa;
             }
-            QTableWidget {
+            QTableView {
                 border: 1px solid #ddd;
                 border-radius: 8px;
                 background-color: white;
                 gridline-color: #f0f0f0;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px 8px;
                 vertical-align: middle;
             }
@@ -1010,7 +1035,7 @@ class UsersView(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Buscar por nombre o email...")
         self.search_input.setFixedHeight(45)
-        self.search_input.textChanged.connect(self.filtrar_usuarios)
+        self.search_input.textChanged.connect(self._on_filtros_cambiados)
         search_layout.addWidget(self.search_input)
 
         # Filtro rol
@@ -1018,144 +1043,87 @@ class UsersView(QWidget):
         self.rol_filter.setFixedHeight(45)
         self.rol_filter.setMinimumWidth(150)
         self.rol_filter.addItems(["Todos los roles", "administrador", "aprendiz"])
-        self.rol_filter.currentTextChanged.connect(self.filtrar_usuarios)
+        self.rol_filter.currentTextChanged.connect(self._on_filtros_cambiados)
+
+        # Acciones masivas sobre la selección (o sobre todo lo filtrado)
+        self.bulk_combo = QComboBox()
+        self.bulk_combo.setFixedHeight(45)
+        self.bulk_combo.addItems(
+            ["Acción masiva...", "Activar", "Inactivar", "Eliminar"]
+        )
+        self.bulk_btn = QPushButton("Aplicar")
+        self.bulk_btn.setFixedHeight(45)
+        self.bulk_btn.setCursor(Qt.PointingHandCursor)
+        self.bulk_btn.setToolTip(
+            "Aplica la acción a los usuarios seleccionados o, si no hay "
+            "selección, a todos los del filtro actual"
+        )
+        self.bulk_btn.clicked.connect(self.aplicar_accion_masiva)
 
         filters_layout.addWidget(search_container, 2)
         filters_layout.addWidget(self.rol_filter, 1)
+        filters_layout.addWidget(self.bulk_combo)
+        filters_layout.addWidget(self.bulk_btn)
 
         layout.addLayout(filters_layout)
 
         # Tabla
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(
-            ["ID", "Nombre", "Email", "Rol", "Acciones"]
+        # Modelo + delegado: nada de widgets por celda ni por fila
+        self.table = QTableView()
+        self.table_model = UsersTableModel(self.table)
+        self.table.setModel(self.table_model)
+        self.acciones_delegate = UserActionsDelegate(self.table)
+        self.acciones_delegate.edit_clicked.connect(self.editar_usuario)
+        self.acciones_delegate.toggle_clicked.connect(self.toggle_estado)
+        self.acciones_delegate.delete_clicked.connect(self.eliminar_usuario)
+        self.table.setItemDelegateForColumn(
+            UsersTableModel.ACTIONS_COLUMN, self.acciones_delegate
         )
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionsClickable(True)
+        self.table.horizontalHeader().sectionClicked.connect(self._on_cabecera_clic)
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.ExtendedSelection)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         self.table.verticalHeader().setVisible(False)
-
-        layout.addWidget(self.table)
-
-        # Controles de paginación
-        pagination_layout = QHBoxLayout()
-        pagination_layout.setSpacing(10)
-
-        # Botones de paginación
-        self.first_btn = QPushButton("◀◀")
-        self.first_btn.setFixedSize(40, 35)
-        self.first_btn.setCursor(Qt.PointingHandCursor)
-        self.first_btn.setStyleSheet(
-            """
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-            }
-        """
-        )
-        self.first_btn.clicked.connect(self.ir_primera_pagina)
-
-        self.prev_btn = QPushButton("◀")
-        self.prev_btn.setFixedSize(40, 35)
-        self.prev_btn.setCursor(Qt.PointingHandCursor)
-        self.prev_btn.setStyleSheet(
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(60)
+        self.table_model.total_changed.connect(self._on_total_usuarios)
+        self.table_model.loading_failed.connect(self._on_error_pagina)
+        # Un listado nuevo olvida el fallo anterior
+        self.table_model.modelReset.connect(lambda: self.error_bar.setVisible(False))
+
+        # Aviso de páginas que no se pudieron cargar (uno, no un diálogo por página)
+        self.error_bar = QFrame()
+        self.error_bar.setStyleSheet(
             """
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-            }
-        """
-        )
-        self.prev_btn.clicked.connect(self.pagina_anterior)
-
-        self.page_label = QLabel("Página 1 de 1")
-        self.page_label.setAlignment(Qt.AlignCenter)
-        self.page_label.setStyleSheet(
-            "font-size: 13px; color: #2c3e50; font-weight: bold;"
-        )
-
-        self.next_btn = QPushButton("▶")
-        self.next_btn.setFixedSize(40, 35)
-        self.next_btn.setCursor(Qt.PointingHandCursor)
-        self.next_btn.setStyleSheet(
-            """
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-            }
-        """
-        )
-        self.next_btn.clicked.connect(self.pagina_siguiente)
-
-        self.last_btn = QPushButton("▶▶")
-        self.last_btn.setFixedSize(40, 35)
-        self.last_btn.setCursor(Qt.PointingHandCursor)
-        self.last_btn.setStyleSheet(
-            """
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
+            QFrame {
+                background-color: #fdecea;
+                border: 1px solid #f5c6cb;
+                border-radius: 6px;
             }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
+            QLabel {
+                color: #c0392b;
+                border: none;
             }
         """
         )
-        self.last_btn.clicked.connect(self.ir_ultima_pagina)
-
-        # Selector de items por página
-        items_label = QLabel("Mostrar:")
-        items_label.setStyleSheet("color: #2c3e50;")
-
-        self.items_per_page = QComboBox()
-        self.items_per_page.setFixedHeight(35)
-        self.items_per_page.setFixedWidth(80)
-        self.items_per_page.addItems(["10", "20", "50", "100"])
-        self.items_per_page.setCurrentText(str(self.items_por_pagina))
-        self.items_per_page.currentTextChanged.connect(self.cambiar_items_por_pagina)
-
-        pagination_layout.addStretch()
-        pagination_layout.addWidget(self.first_btn)
-        pagination_layout.addWidget(self.prev_btn)
-        pagination_layout.addWidget(self.page_label)
-        pagination_layout.addWidget(self.next_btn)
-        pagination_layout.addWidget(self.last_btn)
-        pagination_layout.addSpacing(20)
-        pagination_layout.addWidget(items_label)
-        pagination_layout.addWidget(self.items_per_page)
-        pagination_layout.addStretch()
-
-        layout.addLayout(pagination_layout)
+        error_layout = QHBoxLayout(self.error_bar)
+        error_layout.setContentsMargins(12, 6, 12, 6)
+        self.error_label = QLabel()
+        self.error_label.setWordWrap(True)
+        retry_btn = QPushButton("Reintentar")
+        retry_btn.setCursor(Qt.PointingHandCursor)
+        retry_btn.clicked.connect(self._reintentar_paginas)
+        error_layout.addWidget(self.error_label, 1)
+        error_layout.addWidget(retry_btn)
+        self.error_bar.setVisible(False)
+        # Al recuperar la conexión se reintenta solo
+        self.api_client.connectivity_changed.connect(self._on_conectividad)
+
+        layout.addWidget(self.error_bar)
+        layout.addWidget(self.table)
 
         # Estadísticas
         stats_container = QWidget()
@@ -1174,261 +1142,399 @@ class UsersView(QWidget):
 
     def on_usuarios_changed(self):
         """Este método se ejecuta automáticamente cuando hay cambios en usuarios"""
+        if self._mutaciones:
+            # Cambios propios: la tabla ya los muestra y se confirman fila a fila
+            return
         logger.debug("Usuarios cambiaron - actualizando vista...")
         self.stats_label.setText("Actualizando...")
-        QTimer.singleShot(100, lambda: self.cargar_usuarios(force_refresh=True))
+        QTimer.singleShot(100, self._sincronizar_usuarios)
+
+    def _sincronizar_usuarios(self):
+        """Traer solo los usuarios cambiados desde la última carga"""
+        if not self._lista_completa:
+            # Sin lista completa no hay delta: volver a pedir lo que se ve
+            # (del listado o de la búsqueda) sin mover la vista
+            if self._cargando_lista:
+                self._cargar_lista_completa()
+            self._invalidar_paginas()
+            self.actualizar_stats_normal()
+            return
+        self.api_client.submit_async(
+            self.api_client.sync_usuarios,
+            callback=self._on_usuarios_sincronizados,
+            token=self._sync_scope.renew(),
+        )
+
+    def _on_usuarios_sincronizados(self, result):
+        if not result["success"]:
+            logger.error(f"Error sincronizando usuarios: {result.get('error')}")
+            self.cargar_usuarios()
+            return
+        changes = result.get("changes", {})
+        logger.debug(
+            f"Sync usuarios ({changes.get('mode')}): "
+            f"{len(changes.get('updated', []))} cambiados, "
+            f"{len(changes.get('deleted', []))} eliminados"
+        )
+        self.usuarios = result["data"]
+        store = self.api_client.store
+        for usuario_id in changes.get("updated", []):
+            usuario = store.get("usuario", usuario_id)
+            if usuario is not None:
+                self._indexar(usuario)
+        for usuario_id in changes.get("deleted", []):
+            self._desindexar(usuario_id)
+        self._refiltrar_conservando_posicion()
+        self.actualizar_stats_normal()
 
     def cargar_usuarios(self, force_refresh=False):
-        """Cargar usuarios desde la API"""
+        """
+        Mostrar el listado del servidor. Sin filtros las páginas se piden
+        al desplazarse; la lista completa solo se descarga si hace falta
+        filtrar en local.
+        """
         self.stats_label.setText("Cargando usuarios...")
         logger.debug(f"Cargando usuarios desde API... (force_refresh={force_refresh})")
 
-        result = self.api_client.get_usuarios(force_refresh=force_refresh)
-        logger.debug(f"Resultado API: {result}")
+        self._carga_scope.renew()
+        self._lista_scope.cancel()
+        self._cargando_lista = False
+        self._lista_completa = False
+        self._indice_scope.cancel()
+        self._indice = None
+        self._cambios_indice = []
+        self._forzar_recarga = force_refresh
+        self._total_usuarios = None
+        self.usuarios = []
+        self.usuarios_filtrados = []
 
-        if result["success"]:
-            data = result.get("data", [])
-            logger.debug(
-                f"Datos recibidos: {len(data) if isinstance(data, list) else 'dict'} usuarios"
-            )
+        if self._hay_filtros():
+            self._on_filtros_cambiados()
+        else:
+            self._mostrar_listado()
+            if self._orden:
+                self.filtrar_usuarios()
+
+    def _mostrar_listado(self, keep_position=False):
+        """Tabla sin filtros: lista en memoria si ya está, si no paginada"""
+        self._consulta = None
+        if self._lista_completa:
+            self.usuarios_filtrados = list(self.usuarios)
+            self.table_model.set_rows(self.usuarios_filtrados, keep_position)
+        else:
+            self.usuarios_filtrados = []
+            self._total_usuarios = None
+            self.table_model.set_remote(self._cargar_pagina, per_page=100)
+        self.actualizar_stats_normal()
 
-            if isinstance(data, list):
-                self.usuarios = data
-            elif isinstance(data, dict) and "data" in data:
-                self.usuarios = data["data"]
-            else:
-                self.usuarios = []
+    def _cargar_pagina(self, page, per_page, done):
+        """Cargador de páginas del modelo en modo remoto"""
+        self.api_client.submit_async(
+            self.api_client.get_usuarios,
+            page,
+            per_page,
+            force_refresh=self._forzar_recarga,
+            callback=done,
+            token=self._carga_scope.token,
+        )
+
+    def _on_total_usuarios(self, total):
+        self._total_usuarios = total
+        self.actualizar_stats_normal()
+
+    def _on_error_pagina(self, error):
+        """El modelo deja de pedir páginas hasta que se reintente"""
+        logger.error(f"Error cargando página de usuarios: {error}")
+        self.error_label.setText(f"No se pudieron cargar más usuarios: {error}")
+        self.error_bar.setVisible(True)
+        self.actualizar_stats_normal()
 
+    def _invalidar_paginas(self):
+        """Volver a pedir las páginas visibles (también tras un fallo)"""
+        self.error_bar.setVisible(False)
+        self.table_model.invalidate_pages()
+
+    def _reintentar_paginas(self):
+        self.error_bar.setVisible(False)
+        self.table_model.retry()
+
+    def _on_conectividad(self, online):
+        if online and self.error_bar.isVisible():
+            self._reintentar_paginas()
+
+    def _cargar_lista_completa(self):
+        """Descargar todos los usuarios en segundo plano para filtrar en local"""
+        self._cargando_lista = True
+        self._usuarios_entrantes = []
+        self.api_client.stream_usuarios(
+            self._on_pagina_usuarios,
+            self._on_usuarios_cargados,
+            force_refresh=self._forzar_recarga,
+            token=self._lista_scope.renew(),
+        )
+
+    def _on_pagina_usuarios(self, page):
+        """Acumular páginas; mientras tanto filtra el servidor"""
+        self._usuarios_entrantes.extend(page.get("data", []))
+        total = (page.get("meta") or {}).get("total")
+        logger.debug(
+            f"Página {page['meta'].get('current_page')}: "
+            f"{len(self._usuarios_entrantes)} de {total or '?'} usuarios"
+        )
+
+    def _on_usuarios_cargados(self, result):
+        """Cierre de la descarga de todas las páginas"""
+        self._cargando_lista = False
+        if not result["success"]:
+            # Se sigue con la búsqueda en servidor
+            logger.error(f"Error cargando la lista completa: {result.get('error')}")
+            return
+        self.usuarios = self._usuarios_entrantes
+        self._usuarios_entrantes = []
+        self._lista_completa = True
+        self._total_usuarios = len(self.usuarios)
+        self._construir_indice()
+        if self._vista_local():
+            # Ya se puede filtrar en local: descartar la consulta pendiente
+            self._busqueda_timer.stop()
+            self._busqueda_scope.cancel()
             self.filtrar_usuarios()
-            self.stats_label.setText(f"{len(self.usuarios)} usuarios cargados")
-            QTimer.singleShot(2000, self.actualizar_stats_normal)
         else:
-            logger.error(f"Error: {result.get('error')}")
-            QMessageBox.warning(
-                self, "Error", f"Error al cargar usuarios: {result.get('error')}"
+            self.actualizar_stats_normal()
+
+    # ============= ÍNDICE DE BÚSQUEDA =============
+    def _construir_indice(self):
+        """Indexar la lista completa en un worker sin bloquear la GUI"""
+        self._indice = None
+        self._cambios_indice = []
+        self.api_client.submit_async(
+            self._crear_indice,
+            list(self.usuarios),
+            callback=self._on_indice_construido,
+            priority=Priority.BACKGROUND,
+            token=self._indice_scope.renew(),
+        )
+
+    @staticmethod
+    def _crear_indice(usuarios):
+        return {"success": True, "data": UserSearchIndex.build(usuarios)}
+
+    def _on_indice_construido(self, result):
+        if not result["success"]:
+            # Se sigue filtrando con el recorrido lineal
+            logger.error(
+                f"Error construyendo el índice de usuarios: {result.get('error')}"
             )
-            self.usuarios = []
-            self.usuarios_filtrados = []
-            self.actualizar_tabla()
+            if self._orden:
+                self.usuarios_filtrados = sort_usuarios(
+                    self._filtrar_lista(self.usuarios), self._orden
+                )
+                self.table_model.set_rows(self.usuarios_filtrados)
+                self.actualizar_stats_normal()
+            return
+        indice = result["data"]
+        for usuario_id, usuario in self._cambios_indice:
+            if usuario is None:
+                indice.remove(usuario_id)
+            else:
+                indice.update(usuario)
+        self._cambios_indice = []
+        self._indice = indice
+        logger.debug(f"Índice de búsqueda listo: {len(indice)} usuarios")
+        if self._orden:
+            # La ordenación esperaba a las claves del índice
+            self._refiltrar_conservando_posicion()
+
+    def _indexar(self, usuario):
+        if self._indice is not None:
+            self._indice.update(usuario)
+        elif self._lista_completa:
+            self._cambios_indice.append((usuario.get("id"), usuario))
+
+    def _desindexar(self, usuario_id):
+        if self._indice is not None:
+            self._indice.remove(usuario_id)
+        elif self._lista_completa:
+            self._cambios_indice.append((usuario_id, None))
 
     def actualizar_stats_normal(self):
         """Restaurar estadísticas normales"""
+        if self.table_model.is_remote():
+            total = self._total_usuarios
+            cargados = self.table_model.rowCount()
+            if total == 0 or (total is None and cargados == 0):
+                self.stats_label.setText("No se encontraron usuarios")
+            else:
+                que = "coincidencias" if self._consulta is not None else "usuarios"
+                self.stats_label.setText(
+                    f"{total if total is not None else cargados} {que} "
+                    f"(se cargan al desplazarse)"
+                )
+            return
         total_filtrados = len(self.usuarios_filtrados)
         if total_filtrados > 0:
-            inicio = (self.pagina_actual - 1) * self.items_por_pagina + 1
-            fin = min(inicio + self.items_por_pagina - 1, total_filtrados)
+            total = self._total_usuarios
             self.stats_label.setText(
-                f"Mostrando {inicio}-{fin} de {total_filtrados} usuarios (Total: {len(self.usuarios)})"
+                f"Mostrando {total_filtrados} usuarios"
+                + (f" (Total: {total})" if total is not None else "")
             )
         else:
             self.stats_label.setText("No se encontraron usuarios")
 
-    def filtrar_usuarios(self):
-        search = self.search_input.text().lower()
-        rol = self.rol_filter.currentText()
+    def _hay_filtros(self):
+        return bool(self.search_input.text().strip()) or (
+            self.rol_filter.currentText() != "Todos los roles"
+        )
 
-        self.usuarios_filtrados = []
-        for u in self.usuarios:
-            if search:
-                nombre = u.get("nombre", "").lower()
-                email = u.get("email", "").lower()
-                if search not in nombre and search not in email:
-                    continue
+    def _vista_local(self):
+        """La tabla muestra una lista en memoria: filtrada u ordenada"""
+        return self._hay_filtros() or bool(self._orden)
 
-            if rol != "Todos los roles" and u.get("rol") != rol:
-                continue
+    def _on_filtros_cambiados(self, *args):
+        """
+        Filtrar en local si la lista completa ya está en memoria; si no,
+        consultar al servidor. Escribir nunca descarga la lista completa.
+        """
+        if not self._hay_filtros():
+            self._filtro_timer.stop()
+            self._busqueda_timer.stop()
+            self._busqueda_scope.cancel()
+            self.filtrar_usuarios()
+            return
+        if self._lista_completa:
+            # Con debounce para no filtrar en cada tecla
+            self._busqueda_timer.stop()
+            self._busqueda_scope.cancel()
+            self._filtro_timer.start(120)
+            return
+        self._busqueda_timer.start(250)
 
-            self.usuarios_filtrados.append(u)
+    def _ejecutar_busqueda(self):
+        """
+        Paginar en la tabla las coincidencias del servidor, como el listado.
 
-        self.pagina_actual = 1
-        self.calcular_total_paginas()
-        self.actualizar_tabla()
-        self.actualizar_controles_paginacion()
+        Renovar el scope descarta las páginas de la consulta anterior que
+        aún no hayan llegado.
+        """
+        self.stats_label.setText("Buscando...")
+        self._consulta = (self.search_input.text(), self._rol_filtrado())
+        self._busqueda_scope.renew()
+        self.usuarios_filtrados = []
+        self._total_usuarios = None
+        self.table_model.set_remote(self._cargar_pagina_busqueda, per_page=100)
+        self.actualizar_stats_normal()
 
-    def calcular_total_paginas(self):
-        total_items = len(self.usuarios_filtrados)
-        self.total_paginas = max(
-            1, (total_items + self.items_por_pagina - 1) // self.items_por_pagina
+    def _cargar_pagina_busqueda(self, page, per_page, done):
+        """Cargador de páginas del modelo para la consulta actual"""
+        search, rol = self._consulta
+        self.api_client.submit_async(
+            self.api_client.search_usuarios,
+            search,
+            rol,
+            page,
+            per_page,
+            force_refresh=self._forzar_recarga,
+            callback=done,
+            priority=Priority.INTERACTIVE,
+            token=self._busqueda_scope.token,
         )
-        if self.pagina_actual > self.total_paginas:
-            self.pagina_actual = self.total_paginas
 
-    def obtener_pagina_actual(self):
-        inicio = (self.pagina_actual - 1) * self.items_por_pagina
-        fin = inicio + self.items_por_pagina
-        return self.usuarios_filtrados[inicio:fin]
+    def _rol_filtrado(self):
+        rol = self.rol_filter.currentText()
+        return None if rol == "Todos los roles" else rol
 
-    def actualizar_tabla(self):
-        usuarios_pagina = self.obtener_pagina_actual()
-        self.table.setRowCount(len(usuarios_pagina))
+    def _filtrar_lista(self, usuarios):
+        """Recorrido lineal, con la misma normalización que el índice"""
+        search = fold_text(self.search_input.text()).strip()
+        rol = self._rol_filtrado()
 
-        for row, usuario in enumerate(usuarios_pagina):
-            # ID
-            id_item = QTableWidgetItem(str(usuario.get("id", "")))
-            id_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 0, id_item)
+        filtrados = []
+        for u in usuarios:
+            if search:
+                nombre = fold_text(u.get("nombre", ""))
+                email = fold_text(u.get("email", ""))
+                if search not in nombre and search not in email:
+                    continue
 
-            # Nombre
-            nombre_item = QTableWidgetItem(usuario.get("nombre", ""))
-            nombre_item.setFont(QFont("Segoe UI", 11))
-            self.table.setItem(row, 1, nombre_item)
-
-            # Email
-            email_item = QTableWidgetItem(usuario.get("email", ""))
-            email_item.setFont(QFont("Segoe UI", 11))
-            self.table.setItem(row, 2, email_item)
-
-            # Rol
-            rol_item = QTableWidgetItem(usuario.get("rol", ""))
-            rol_item.setTextAlignment(Qt.AlignCenter)
-            rol_item.setFont(QFont("Segoe UI", 11))
-            if usuario.get("rol") == "administrador":
-                rol_item.setForeground(QColor("#e74c3c"))
-                rol_item.setFont(QFont("Segoe UI", 11, QFont.Bold))
-            else:
-                rol_item.setForeground(QColor("#3498db"))
-            self.table.setItem(row, 3, rol_item)
-
-            # Acciones
-            acciones = QWidget()
-            acciones.setFixedHeight(50)
-            acciones_layout = QHBoxLayout(acciones)
-            acciones_layout.setContentsMargins(5, 0, 5, 0)
-            acciones_layout.setSpacing(8)
-            acciones_layout.setAlignment(Qt.AlignCenter)
-
-            # Botón editar
-            edit_btn = QPushButton("Editar")
-            edit_btn.setFixedSize(70, 32)
-            edit_btn.setCursor(Qt.PointingHandCursor)
-            edit_btn.setToolTip("Editar usuario")
-            edit_btn.setStyleSheet(
-                """
-                QPushButton {
-                    background-color: #3498db;
-                    color: white;
-                    border-radius: 4px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background-color: #2980b9;
-                }
-            """
-            )
-            edit_btn.clicked.connect(lambda checked, u=usuario: self.editar_usuario(u))
-
-            # Botón estado
-            estado_btn = QPushButton()
-            estado_btn.setFixedSize(32, 32)
-            estado_btn.setCursor(Qt.PointingHandCursor)
-
-            if usuario.get("estado") == "activo":
-                estado_btn.setText("●")
-                estado_btn.setToolTip("Activo - Click para inactivar")
-                estado_btn.setStyleSheet(
-                    """
-                    QPushButton {
-                        background-color: #2ecc71;
-                        color: white;
-                        border-radius: 16px;
-                        font-size: 18px;
-                        font-weight: bold;
-                    }
-                    QPushButton:hover {
-                        background-color: #27ae60;
-                    }
-                """
-                )
-            else:
-                estado_btn.setText("●")
-                estado_btn.setToolTip("Inactivo - Click para activar")
-                estado_btn.setStyleSheet(
-                    """
-                    QPushButton {
-                        background-color: #e74c3c;
-                        color: white;
-                        border-radius: 16px;
-                        font-size: 18px;
-                        font-weight: bold;
-                    }
-                    QPushButton:hover {
-                        background-color: #c0392b;
-                    }
-                """
-                )
+            if rol is not None and u.get("rol") != rol:
+                continue
 
-            estado_btn.clicked.connect(lambda checked, u=usuario: self.toggle_estado(u))
-
-            # Botón eliminar
-            delete_btn = QPushButton("✕")
-            delete_btn.setFixedSize(32, 32)
-            delete_btn.setCursor(Qt.PointingHandCursor)
-            delete_btn.setToolTip("Eliminar usuario")
-            delete_btn.setStyleSheet(
-                """
-                QPushButton {
-                    background-color: #e74c3c;
-                    color: white;
-                    border-radius: 4px;
-                    font-size: 14px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #c0392b;
-                }
-            """
-            )
-            delete_btn.clicked.connect(
-                lambda checked, u=usuario: self.eliminar_usuario(u)
+            filtrados.append(u)
+        return filtrados
+
+    def filtrar_usuarios(self, keep_position=False):
+        if not self._vista_local():
+            if not self.table_model.is_remote() or self._consulta is not None:
+                self._mostrar_listado(keep_position)
+            elif keep_position:
+                # Seguir paginando, pero con los datos actualizados
+                self._invalidar_paginas()
+                self.actualizar_stats_normal()
+            return
+        if not self._lista_completa:
+            # Ordenar todo el listado necesita la lista completa: solo se
+            # descarga al pedir una ordenación (clic en la cabecera)
+            if self._orden and not self._cargando_lista:
+                self._cargar_lista_completa()
+            consulta = (self.search_input.text(), self._rol_filtrado())
+            if self._hay_filtros() and self._consulta != consulta:
+                # Mientras tanto, las coincidencias del servidor sin ordenar
+                self._busqueda_timer.stop()
+                self._ejecutar_busqueda()
+            if self._orden:
+                self.stats_label.setText("Cargando todos los usuarios para ordenar...")
+            return
+        if self._indice is not None:
+            self.usuarios_filtrados = self._indice.usuarios(
+                self.search_input.text(), self._rol_filtrado(), self._orden
             )
+        elif self._orden and self.table_model.is_remote():
+            # Seguir paginando hasta que el índice traiga las claves
+            self.stats_label.setText("Ordenando usuarios...")
+            return
+        else:
+            # Sin índice todavía: se ordena en cuanto llegue
+            self.usuarios_filtrados = self._filtrar_lista(self.usuarios)
+        self.table_model.set_rows(self.usuarios_filtrados, keep_position)
+        self.actualizar_stats_normal()
+
+    def _on_cabecera_clic(self, column):
+        """
+        Clic: ordenar por la columna (ascendente, descendente, sin orden).
+        Mayús+clic: añadirla como criterio secundario o cambiar su sentido.
+        """
+        if column >= len(UsersTableModel.SORT_FIELDS):
+            return
+        field = UsersTableModel.SORT_FIELDS[column]
+        orden = list(self._orden)
+        actual = next((i for i, (f, _) in enumerate(orden) if f == field), None)
+        if QApplication.keyboardModifiers() & Qt.ShiftModifier:
+            if actual is None:
+                orden.append((field, False))
+            elif orden[actual][1]:
+                del orden[actual]
+            else:
+                orden[actual] = (field, True)
+        elif orden == [(field, False)]:
+            orden = [(field, True)]
+        elif orden == [(field, True)]:
+            orden = []
+        else:
+            orden = [(field, False)]
 
-            acciones_layout.addWidget(edit_btn)
-            acciones_layout.addWidget(estado_btn)
-            acciones_layout.addWidget(delete_btn)
+        self._orden = orden
+        self.table_model.set_sort_indicator(
+            [(UsersTableModel.SORT_FIELDS.index(f), d) for f, d in orden]
+        )
+        self.filtrar_usuarios()
 
-            self.table.setCellWidget(row, 4, acciones)
-            self.table.setRowHeight(row, 60)
+    def _refiltrar_conservando_posicion(self):
+        """Aplicar los filtros a la lista actualizada sin volver al inicio"""
+        self.filtrar_usuarios(keep_position=True)
 
-        self.actualizar_stats_normal()
-        self.page_label.setText(f"Página {self.pagina_actual} de {self.total_paginas}")
-
-    def actualizar_controles_paginacion(self):
-        self.first_btn.setEnabled(self.pagina_actual > 1)
-        self.prev_btn.setEnabled(self.pagina_actual > 1)
-        self.next_btn.setEnabled(self.pagina_actual < self.total_paginas)
-        self.last_btn.setEnabled(self.pagina_actual < self.total_paginas)
-
-    def ir_primera_pagina(self):
-        if self.pagina_actual > 1:
-            self.pagina_actual = 1
-            self.actualizar_tabla()
-            self.actualizar_controles_paginacion()
-
-    def ir_ultima_pagina(self):
-        if self.pagina_actual < self.total_paginas:
-            self.pagina_actual = self.total_paginas
-            self.actualizar_tabla()
-            self.actualizar_controles_paginacion()
-
-    def pagina_anterior(self):
-        if self.pagina_actual > 1:
-            self.pagina_actual -= 1
-            self.actualizar_tabla()
-            self.actualizar_controles_paginacion()
-
-    def pagina_siguiente(self):
-        if self.pagina_actual < self.total_paginas:
-            self.pagina_actual += 1
-            self.actualizar_tabla()
-            self.actualizar_controles_paginacion()
-
-    def cambiar_items_por_pagina(self, value):
-        self.items_por_pagina = int(value)
-        self.pagina_actual = 1
-        self.calcular_total_paginas()
-        self.actualizar_tabla()
-        self.actualizar_controles_paginacion()
+    def _pintar_fila(self, usuario):
+        """Repintar la fila de un usuario si está cargada en la tabla"""
+        self.table_model.replace_usuario(usuario)
 
     def nuevo_usuario(self):
         dialog = UserDialog(self.api_client)
@@ -1443,113 +1549,91 @@ class UsersView(QWidget):
             msg = ProcessingMessage("Creando usuario...", self)
             msg.show()
 
-            # Forzar actualización de eventos
-            QApplication.processEvents()
-
-            # Procesar directamente sin QTimer
-            self._procesar_nuevo_usuario(data, msg)
-
-    def _procesar_nuevo_usuario(self, data, msg):
-        """Procesar creación de usuario"""
-        try:
-            result = self.api_client.create_usuario(data)
-
-            # Cerrar mensaje de procesamiento
-            msg.close()
-            QApplication.processEvents()
-
-            if result["success"]:
-                email_verified = result.get("email_verified", False)
-
-                if not email_verified:
-                    QMessageBox.information(
-                        self,
-                        "Éxito",
-                        "Usuario creado correctamente\n\n"
-                        "Se ha enviado un email de verificación a:\n"
-                        f"{data['email']}\n\n"
-                        "El usuario debe verificar su email para poder acceder.",
-                    )
-                else:
-                    QMessageBox.information(
-                        self, "Éxito", "Usuario creado correctamente"
-                    )
+            self.api_client.submit_async(
+                self.api_client.create_usuario,
+                data,
+                callback=lambda result: self._procesar_nuevo_usuario(
+                    result, data, msg
+                ),
+                priority=Priority.INTERACTIVE,
+            )
+
+    def _procesar_nuevo_usuario(self, result, data, msg):
+        """Mostrar el resultado de la creación (en el hilo de la GUI)"""
+        # Cerrar mensaje de procesamiento
+        msg.close()
+
+        if result["success"]:
+            email_verified = result.get("email_verified", False)
+
+            if not email_verified:
+                QMessageBox.information(
+                    self,
+                    "Éxito",
+                    "Usuario creado correctamente\n\n"
+                    "Se ha enviado un email de verificación a:\n"
+                    f"{data['email']}\n\n"
+                    "El usuario debe verificar su email para poder acceder.",
+                )
             else:
-                error_msg = result.get("error", "Error desconocido")
-
-                if result.get("validation_errors"):
-                    error_msg = "\n".join(result["validation_errors"])
-                elif "email" in error_msg.lower():
-                    if (
-                        "already" in error_msg.lower()
-                        or "registrado" in error_msg.lower()
-                    ):
-                        error_msg = "El email ya está registrado en el sistema"
-
-                QMessageBox.critical(
-                    self, "Error", f"Error al crear usuario:\n{error_msg}"
+                QMessageBox.information(
+                    self, "Éxito", "Usuario creado correctamente"
                 )
-        except Exception as e:
-            msg.close()
-            QApplication.processEvents()
-            QMessageBox.critical(self, "Error", f"Error inesperado: {str(e)}")
+        else:
+            error_msg = result.get("error", "Error desconocido")
+
+            if result.get("validation_errors"):
+                error_msg = "\n".join(result["validation_errors"])
+            elif "email" in error_msg.lower():
+                if (
+                    "already" in error_msg.lower()
+                    or "registrado" in error_msg.lower()
+                ):
+                    error_msg = "El email ya está registrado en el sistema"
+
+            QMessageBox.critical(
+                self, "Error", f"Error al crear usuario:\n{error_msg}"
+            )
 
     def editar_usuario(self, usuario):
         dialog = UserDialog(self.api_client, usuario)
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.get_data()
+            email_original = usuario.get("email")
+            # La contraseña no forma parte de la fila que se muestra
+            cambios = {k: v for k, v in data.items() if not k.startswith("password")}
+
+            self._mutar_usuario(
+                usuario["id"],
+                self.api_client.update_usuario,
+                usuario["id"],
+                data,
+                fields=cambios,
+                callback=lambda result: self._on_usuario_editado(
+                    result, data, email_original
+                ),
+            )
 
-            # Crear y mostrar mensaje de procesamiento
-            msg = ProcessingMessage("Actualizando usuario...", self)
-            msg.show()
-
-            # Forzar actualización de eventos
-            QApplication.processEvents()
-
-            # Procesar directamente sin QTimer
-            self._procesar_editar_usuario(usuario["id"], data, msg)
-
-    def _procesar_editar_usuario(self, usuario_id, data, msg):
-        """Procesar edición de usuario"""
-        try:
-            result = self.api_client.update_usuario(usuario_id, data)
-
-            # Cerrar mensaje de procesamiento
-            msg.close()
-            QApplication.processEvents()
-
-            if result["success"]:
-                if "email" in data and data["email"] != self._get_original_email(
-                    usuario_id
-                ):
-                    QMessageBox.information(
-                        self,
-                        "Éxito",
-                        "Usuario actualizado correctamente\n\n"
-                        "Se ha enviado un nuevo email de verificación porque el email cambió.",
-                    )
-                else:
-                    QMessageBox.information(
-                        self, "Éxito", "Usuario actualizado correctamente"
-                    )
-            else:
-                error_msg = result.get("error", "Error desconocido")
-                if result.get("validation_errors"):
-                    error_msg = "\n".join(result["validation_errors"])
-                QMessageBox.critical(
-                    self, "Error", f"Error al actualizar:\n{error_msg}"
+    def _on_usuario_editado(self, result, data, email_original):
+        """Confirmación de la edición (la fila ya muestra los cambios)"""
+        if result["success"]:
+            if "email" in data and data["email"] != email_original:
+                QMessageBox.information(
+                    self,
+                    "Éxito",
+                    "Usuario actualizado correctamente\n\n"
+                    "Se ha enviado un nuevo email de verificación porque el email cambió.",
                 )
-        except Exception as e:
-            msg.close()
-            QApplication.processEvents()
-            QMessageBox.critical(self, "Error", f"Error inesperado: {str(e)}")
-
-    def _get_original_email(self, usuario_id):
-        """Obtener email original del usuario"""
-        for usuario in self.usuarios:
-            if usuario.get("id") == usuario_id:
-                return usuario.get("email")
-        return None
+            else:
+                self.stats_label.setText("Usuario actualizado correctamente")
+                QTimer.singleShot(2000, self.actualizar_stats_normal)
+        else:
+            error_msg = result.get("error", "Error desconocido")
+            if result.get("validation_errors"):
+                error_msg = "\n".join(result["validation_errors"])
+            QMessageBox.critical(
+                self, "Error", f"Error al actualizar (cambios deshechos):\n{error_msg}"
+            )
 
     def toggle_estado(self, usuario):
         nuevo = "inactivar" if usuario["estado"] == "activo" else "activar"
@@ -1561,38 +1645,24 @@ class UsersView(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            # Crear y mostrar mensaje de procesamiento
-            msg = ProcessingMessage("Cambiando estado...", self)
-            msg.show()
-
-            # Forzar actualización de eventos
-            QApplication.processEvents()
-
-            # Procesar directamente sin QTimer
-            self._procesar_cambio_estado(usuario, msg)
-
-    def _procesar_cambio_estado(self, usuario, msg):
-        """Procesar cambio de estado"""
-        try:
-            result = self.api_client.toggle_usuario_status(usuario["id"])
-
-            # Cerrar mensaje de procesamiento
-            msg.close()
-            QApplication.processEvents()
+            estado = "inactivo" if usuario["estado"] == "activo" else "activo"
+            self._mutar_usuario(
+                usuario["id"],
+                self.api_client.toggle_usuario_status,
+                usuario["id"],
+                fields={"estado": estado},
+                callback=lambda result: self._on_estado_cambiado(result, estado),
+            )
 
-            if result["success"]:
-                estado_text = (
-                    "inactivado" if usuario["estado"] == "activo" else "activado"
-                )
-                QMessageBox.information(
-                    self, "Éxito", f"Usuario {estado_text} correctamente"
-                )
-            else:
-                QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
-        except Exception as e:
-            msg.close()
-            QApplication.processEvents()
-            QMessageBox.critical(self, "Error", f"Error inesperado: {str(e)}")
+    def _on_estado_cambiado(self, result, estado):
+        if result["success"]:
+            estado_text = "activado" if estado == "activo" else "inactivado"
+            self.stats_label.setText(f"Usuario {estado_text} correctamente")
+            QTimer.singleShot(2000, self.actualizar_stats_normal)
+        else:
+            QMessageBox.critical(
+                self, "Error", f"Error (estado restaurado): {result.get('error')}"
+            )
 
     def eliminar_usuario(self, usuario):
         if usuario["email"] == self.api_client.user.get("email"):
@@ -1607,32 +1677,209 @@ class UsersView(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            # Crear y mostrar mensaje de procesamiento
-            msg = ProcessingMessage("Eliminando usuario...", self)
-            msg.show()
+            posicion = next(
+                (i for i, u in enumerate(self.usuarios) if u.get("id") == usuario["id"]),
+                len(self.usuarios),
+            )
+            self._mutar_usuario(
+                usuario["id"],
+                self.api_client.delete_usuario,
+                usuario["id"],
+                remove=True,
+                callback=lambda result: self._on_usuario_eliminado(
+                    result, usuario, posicion
+                ),
+            )
 
-            # Forzar actualización de eventos
-            QApplication.processEvents()
+    def _on_usuario_eliminado(self, result, usuario, posicion):
+        if result["success"]:
+            self.stats_label.setText("Usuario eliminado correctamente")
+            QTimer.singleShot(2000, self.actualizar_stats_normal)
+        else:
+            # Devolver la fila a su sitio
+            restaurado = self.api_client.store.get("usuario", usuario["id"]) or usuario
+            if self.table_model.is_remote():
+                self._invalidar_paginas()
+            if self._lista_completa:
+                self.usuarios.insert(min(posicion, len(self.usuarios)), restaurado)
+                self._indexar(restaurado)
+                self._refiltrar_conservando_posicion()
+            QMessageBox.critical(
+                self, "Error", f"Error (usuario restaurado): {result.get('error')}"
+            )
 
-            # Procesar directamente sin QTimer
-            self._procesar_eliminar_usuario(usuario["id"], msg)
+    # ============= MUTACIONES OPTIMISTAS =============
+    def _mutar_usuario(self, usuario_id, func, *args, callback, **kwargs):
+        """Aplicar el cambio en la tabla al instante y enviarlo al servidor"""
+        self._mutaciones[usuario_id] = self._mutaciones.get(usuario_id, 0) + 1
 
-    def _procesar_eliminar_usuario(self, usuario_id, msg):
-        """Procesar eliminación de usuario"""
-        try:
-            result = self.api_client.delete_usuario(usuario_id)
+        def terminar(result):
+            restantes = self._mutaciones.pop(usuario_id, 1) - 1
+            if restantes:
+                self._mutaciones[usuario_id] = restantes
+            callback(result)
 
-            # Cerrar mensaje de procesamiento
-            msg.close()
-            QApplication.processEvents()
+        self.api_client.mutate_optimistic(
+            "usuario", usuario_id, func, *args, callback=terminar, **kwargs
+        )
 
-            if result["success"]:
-                QMessageBox.information(
-                    self, "Éxito", "Usuario eliminado correctamente"
+    def _on_usuarios_editados(self, kind, ids):
+        """Repintar solo las filas de los usuarios con mutaciones en curso"""
+        if kind != "usuario":
+            return
+        store = self.api_client.store
+        nuevos = {i: store.get("usuario", i) for i in ids if i in self._mutaciones}
+        nuevos = {i: u for i, u in nuevos.items() if u is not None}
+        if not nuevos:
+            return
+
+        for lista in (self.usuarios, self.usuarios_filtrados):
+            for pos, usuario in enumerate(lista):
+                if usuario.get("id") in nuevos:
+                    lista[pos] = nuevos[usuario["id"]]
+        for usuario in nuevos.values():
+            self._indexar(usuario)
+
+        if not self.table_model.is_remote():
+            visibles = [u for u in self.usuarios_filtrados if u.get("id") in nuevos]
+            if len(self._filtrar_lista(visibles)) != len(visibles):
+                # El cambio saca la fila del filtro activo
+                self._quitar_filas(
+                    [u["id"] for u in visibles if not self._filtrar_lista([u])]
                 )
-            else:
-                QMessageBox.critical(self, "Error", f"Error: {result.get('error')}")
-        except Exception as e:
-            msg.close()
-            QApplication.processEvents()
-            QMessageBox.critical(self, "Error", f"Error inesperado: {str(e)}")
+        for usuario in nuevos.values():
+            self._pintar_fila(usuario)
+
+    def _on_usuarios_eliminados(self, kind, ids):
+        if kind != "usuario" or not any(i in self._mutaciones for i in ids):
+            return
+        self.usuarios = [u for u in self.usuarios if u.get("id") not in ids]
+        for usuario_id in ids:
+            self._desindexar(usuario_id)
+        self._quitar_filas(ids)
+        if self._total_usuarios:
+            self._total_usuarios -= len(ids)
+        self.actualizar_stats_normal()
+
+    def _quitar_filas(self, ids):
+        """Quitar filas de la tabla sin recargar ni mover la vista"""
+        self.usuarios_filtrados = [
+            u for u in self.usuarios_filtrados if u.get("id") not in ids
+        ]
+        for usuario_id in ids:
+            self.table_model.remove_usuario(usuario_id)
+
+    # ============= ACCIONES MASIVAS =============
+    def _usuarios_objetivo(self):
+        """Filas seleccionadas o, sin selección, todo lo filtrado"""
+        filas = sorted(
+            index.row() for index in self.table.selectionModel().selectedRows()
+        )
+        if filas:
+            usuarios = (self.table_model.usuario_at(fila) for fila in filas)
+            return [u for u in usuarios if u is not None]
+        if self.table_model.is_remote():
+            # El listado no está entero en memoria
+            return None
+        return list(self.usuarios_filtrados)
+
+    def aplicar_accion_masiva(self):
+        accion = self.bulk_combo.currentText()
+        if self.bulk_combo.currentIndex() == 0:
+            return
+
+        usuarios = self._usuarios_objetivo()
+        if usuarios is None:
+            QMessageBox.information(
+                self,
+                "Acción masiva",
+                "Selecciona los usuarios a los que aplicar la acción",
+            )
+            return
+        propio = self.api_client.user.get("email")
+        if accion == "Activar":
+            usuarios = [u for u in usuarios if u.get("estado") != "activo"]
+        elif accion == "Inactivar":
+            usuarios = [u for u in usuarios if u.get("estado") == "activo"]
+        usuarios = [u for u in usuarios if u.get("email") != propio]
+        if not usuarios:
+            QMessageBox.information(
+                self, "Acción masiva", "Ningún usuario necesita este cambio"
+            )
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Confirmar",
+            f"¿{accion} {len(usuarios)} usuario(s)?",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        ids = [u["id"] for u in usuarios]
+        self._masiva_progreso = QProgressDialog(
+            f"{accion}: 0 de {len(ids)}", "Cancelar", 0, len(ids), self
+        )
+        self._masiva_progreso.setWindowTitle("Acción masiva")
+        self._masiva_progreso.setWindowModality(Qt.WindowModal)
+        self._masiva_progreso.setMinimumDuration(300)
+        self._masiva_progreso.canceled.connect(self._cancelar_accion_masiva)
+        self.bulk_btn.setEnabled(False)
+
+        lanzar = (
+            self.api_client.bulk_delete_usuarios
+            if accion == "Eliminar"
+            else self.api_client.bulk_toggle_usuarios
+        )
+        lanzar(
+            ids,
+            on_progress=lambda p: self._on_progreso_masivo(accion, p),
+            on_done=self._on_accion_masiva_terminada,
+            token=self._masiva_scope.renew(),
+        )
+
+    def _on_progreso_masivo(self, accion, progreso):
+        if self._masiva_progreso is None:
+            return
+        self._masiva_progreso.setValue(progreso["done"])
+        texto = f"{accion}: {progreso['done']} de {progreso['total']}"
+        if progreso["failed"]:
+            texto += f" ({progreso['failed']} con error)"
+        self._masiva_progreso.setLabelText(texto)
+
+    def _cancelar_accion_masiva(self):
+        """Las peticiones ya enviadas terminan; el resto no se envía"""
+        self._masiva_scope.cancel()
+        self._cerrar_progreso_masivo()
+        self.stats_label.setText("Acción masiva cancelada")
+        QTimer.singleShot(2000, self.actualizar_stats_normal)
+
+    def _cerrar_progreso_masivo(self):
+        if self._masiva_progreso is not None:
+            self._masiva_progreso.canceled.disconnect(self._cancelar_accion_masiva)
+            self._masiva_progreso.close()
+            self._masiva_progreso = None
+        self.bulk_btn.setEnabled(True)
+
+    def _on_accion_masiva_terminada(self, result):
+        self._cerrar_progreso_masivo()
+        hechos = len(result.get("succeeded", []))
+        if result["success"]:
+            self.stats_label.setText(f"{hechos} usuario(s) actualizados")
+            QTimer.singleShot(2000, self.actualizar_stats_normal)
+            return
+
+        fallos = result.get("failed", {})
+        detalle = "\n".join(
+            f"Usuario {usuario_id}: {error}"
+            for usuario_id, error in list(fallos.items())[:10]
+        )
+        if len(fallos) > 10:
+            detalle += f"\n... y {len(fallos) - 10} más"
+        QMessageBox.warning(
+            self,
+            "Acción masiva incompleta",
+            f"{hechos} de {result.get('total', 0)} operaciones completadas.\n\n"
+            f"{detalle or result.get('error', '')}",
+        )